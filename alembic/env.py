@@ -11,7 +11,7 @@ from alembic import context
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 # Import all models here so that Base has them registered
-from app.models import chromosome, gene, statistic, centromere
+from app.models import chromosome, gene, statistic, centromere, exon, utr, transcript, tandem_repeat, feature_density, composition_index, profile_track, table_load
 from app.db.session import Base
 
 # this is the Alembic Config object, which provides
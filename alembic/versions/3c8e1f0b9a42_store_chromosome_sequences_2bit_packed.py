@@ -0,0 +1,69 @@
+"""Store chromosome sequences 2-bit packed
+
+Revision ID: 3c8e1f0b9a42
+Revises: a79e5f6d975d
+Create Date: 2026-10-17 13:20:11.482913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.twobit import PackedSequence, pack_sequence, unpack_sequence
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c8e1f0b9a42'
+down_revision: Union[str, Sequence[str], None] = 'a79e5f6d975d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('chromosomes') as batch_op:
+        batch_op.add_column(sa.Column('packed_sequence', sa.LargeBinary(), nullable=True))
+        batch_op.add_column(sa.Column('n_blocks', sa.LargeBinary(), nullable=True))
+        batch_op.add_column(sa.Column('mask_blocks', sa.LargeBinary(), nullable=True))
+
+    # Pack the stored sequences one chromosome at a time
+    connection = op.get_bind()
+    ids = connection.execute(sa.text("SELECT id FROM chromosomes WHERE sequence IS NOT NULL")).scalars().all()
+    for chromosome_id in ids:
+        sequence = connection.execute(
+            sa.text("SELECT sequence FROM chromosomes WHERE id = :id"), {"id": chromosome_id}
+        ).scalar()
+        packed = pack_sequence(sequence)
+        connection.execute(
+            sa.text("UPDATE chromosomes SET packed_sequence = :data, n_blocks = :n_blocks, "
+                    "mask_blocks = :mask_blocks, sequence = NULL WHERE id = :id"),
+            {"data": packed.data, "n_blocks": packed.n_blocks, "mask_blocks": packed.mask_blocks, "id": chromosome_id},
+        )
+
+    with op.batch_alter_table('chromosomes') as batch_op:
+        batch_op.drop_column('sequence')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('chromosomes') as batch_op:
+        batch_op.add_column(sa.Column('sequence', sa.Text(), nullable=True))
+
+    connection = op.get_bind()
+    ids = connection.execute(sa.text("SELECT id FROM chromosomes WHERE packed_sequence IS NOT NULL")).scalars().all()
+    for chromosome_id in ids:
+        row = connection.execute(
+            sa.text("SELECT length, packed_sequence, n_blocks, mask_blocks FROM chromosomes WHERE id = :id"),
+            {"id": chromosome_id},
+        ).one()
+        sequence = unpack_sequence(PackedSequence(row.length, row.packed_sequence, row.n_blocks or b"", row.mask_blocks or b""))
+        connection.execute(
+            sa.text("UPDATE chromosomes SET sequence = :sequence WHERE id = :id"),
+            {"sequence": sequence, "id": chromosome_id},
+        )
+
+    with op.batch_alter_table('chromosomes') as batch_op:
+        batch_op.drop_column('mask_blocks')
+        batch_op.drop_column('n_blocks')
+        batch_op.drop_column('packed_sequence')
@@ -0,0 +1,65 @@
+"""Add Transcript model
+
+Revision ID: 5d2b7c4e8f16
+Revises: 3c8e1f0b9a42
+Create Date: 2026-10-17 15:02:37.519204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2b7c4e8f16'
+down_revision: Union[str, Sequence[str], None] = '3c8e1f0b9a42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('transcripts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('transcript_id', sa.String(), nullable=False),
+    sa.Column('transcript_name', sa.String(), nullable=True),
+    sa.Column('transcript_biotype', sa.String(), nullable=True),
+    sa.Column('gene_id', sa.Integer(), nullable=False),
+    sa.Column('start_pos', sa.Integer(), nullable=False),
+    sa.Column('end_pos', sa.Integer(), nullable=False),
+    sa.Column('strand', sa.String(length=1), nullable=False),
+    sa.Column('spliced_length', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['gene_id'], ['genes.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_transcript_coords', 'transcripts', ['gene_id', 'start_pos', 'end_pos'], unique=False)
+    op.create_index(op.f('ix_transcripts_gene_id'), 'transcripts', ['gene_id'], unique=False)
+    op.create_index(op.f('ix_transcripts_id'), 'transcripts', ['id'], unique=False)
+    op.create_index(op.f('ix_transcripts_transcript_id'), 'transcripts', ['transcript_id'], unique=True)
+
+    # exons and utrs are created by scripts/init_db.py rather than by a migration
+    inspector = sa.inspect(op.get_bind())
+    for table in ('exons', 'utrs'):
+        if inspector.has_table(table):
+            with op.batch_alter_table(table) as batch_op:
+                batch_op.add_column(sa.Column('transcript_id', sa.Integer(), nullable=True))
+                batch_op.create_index(batch_op.f(f'ix_{table}_transcript_id'), ['transcript_id'], unique=False)
+                batch_op.create_foreign_key(f'fk_{table}_transcript_id', 'transcripts', ['transcript_id'], ['id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    for table in ('utrs', 'exons'):
+        if inspector.has_table(table):
+            with op.batch_alter_table(table) as batch_op:
+                batch_op.drop_constraint(f'fk_{table}_transcript_id', type_='foreignkey')
+                batch_op.drop_index(batch_op.f(f'ix_{table}_transcript_id'))
+                batch_op.drop_column('transcript_id')
+
+    op.drop_index(op.f('ix_transcripts_transcript_id'), table_name='transcripts')
+    op.drop_index(op.f('ix_transcripts_id'), table_name='transcripts')
+    op.drop_index(op.f('ix_transcripts_gene_id'), table_name='transcripts')
+    op.drop_index('idx_transcript_coords', table_name='transcripts')
+    op.drop_table('transcripts')
@@ -0,0 +1,53 @@
+"""Move chromosome sequences to their own table
+
+Revision ID: 8a1f6e3d2c57
+Revises: 5d2b7c4e8f16
+Create Date: 2026-10-17 15:41:09.228716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a1f6e3d2c57'
+down_revision: Union[str, Sequence[str], None] = '5d2b7c4e8f16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('chromosome_sequences',
+    sa.Column('chromosome_id', sa.Integer(), nullable=False),
+    sa.Column('packed_sequence', sa.LargeBinary(), nullable=False),
+    sa.Column('n_blocks', sa.LargeBinary(), nullable=True),
+    sa.Column('mask_blocks', sa.LargeBinary(), nullable=True),
+    sa.ForeignKeyConstraint(['chromosome_id'], ['chromosomes.id'], ),
+    sa.PrimaryKeyConstraint('chromosome_id')
+    )
+    op.execute(
+        "INSERT INTO chromosome_sequences (chromosome_id, packed_sequence, n_blocks, mask_blocks) "
+        "SELECT id, packed_sequence, n_blocks, mask_blocks FROM chromosomes WHERE packed_sequence IS NOT NULL"
+    )
+    with op.batch_alter_table('chromosomes') as batch_op:
+        batch_op.drop_column('mask_blocks')
+        batch_op.drop_column('n_blocks')
+        batch_op.drop_column('packed_sequence')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('chromosomes') as batch_op:
+        batch_op.add_column(sa.Column('packed_sequence', sa.LargeBinary(), nullable=True))
+        batch_op.add_column(sa.Column('n_blocks', sa.LargeBinary(), nullable=True))
+        batch_op.add_column(sa.Column('mask_blocks', sa.LargeBinary(), nullable=True))
+    op.execute(
+        "UPDATE chromosomes SET "
+        "packed_sequence = (SELECT packed_sequence FROM chromosome_sequences WHERE chromosome_id = chromosomes.id), "
+        "n_blocks = (SELECT n_blocks FROM chromosome_sequences WHERE chromosome_id = chromosomes.id), "
+        "mask_blocks = (SELECT mask_blocks FROM chromosome_sequences WHERE chromosome_id = chromosomes.id)"
+    )
+    op.drop_table('chromosome_sequences')
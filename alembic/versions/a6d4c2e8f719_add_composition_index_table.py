@@ -0,0 +1,34 @@
+"""Add composition_index table
+
+Revision ID: a6d4c2e8f719
+Revises: f3b7d2c8e591
+Create Date: 2026-10-17 22:14:05.318262
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6d4c2e8f719'
+down_revision: Union[str, Sequence[str], None] = 'f3b7d2c8e591'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('composition_index',
+    sa.Column('chromosome_id', sa.Integer(), nullable=False),
+    sa.Column('sample_interval', sa.Integer(), nullable=False),
+    sa.Column('cumulative', sa.LargeBinary(), nullable=False),
+    sa.ForeignKeyConstraint(['chromosome_id'], ['chromosomes.id'], ),
+    sa.PrimaryKeyConstraint('chromosome_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('composition_index')
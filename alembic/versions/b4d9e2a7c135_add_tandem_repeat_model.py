@@ -0,0 +1,49 @@
+"""Add tandem repeat model
+
+Revision ID: b4d9e2a7c135
+Revises: 8a1f6e3d2c57
+Create Date: 2026-10-17 17:02:44.518230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4d9e2a7c135'
+down_revision: Union[str, Sequence[str], None] = '8a1f6e3d2c57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('tandem_repeats',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('chromosome_id', sa.Integer(), nullable=False),
+    sa.Column('start_pos', sa.Integer(), nullable=False),
+    sa.Column('end_pos', sa.Integer(), nullable=False),
+    sa.Column('period', sa.Integer(), nullable=False),
+    sa.Column('motif', sa.String(), nullable=False),
+    sa.Column('copy_number', sa.Integer(), nullable=False),
+    sa.Column('length', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['chromosome_id'], ['chromosomes.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_tandem_repeat_coords', 'tandem_repeats', ['chromosome_id', 'start_pos', 'end_pos'], unique=False)
+    op.create_index(op.f('ix_tandem_repeats_id'), 'tandem_repeats', ['id'], unique=False)
+    op.create_index(op.f('ix_tandem_repeats_motif'), 'tandem_repeats', ['motif'], unique=False)
+    op.create_index(op.f('ix_tandem_repeats_period'), 'tandem_repeats', ['period'], unique=False)
+    # The old statistic held a capped list of regex matches; the scanner rewrites it as a summary
+    op.execute("DELETE FROM genome_stats WHERE stat_name = 'simple_sequence_repeats'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_tandem_repeats_period'), table_name='tandem_repeats')
+    op.drop_index(op.f('ix_tandem_repeats_motif'), table_name='tandem_repeats')
+    op.drop_index(op.f('ix_tandem_repeats_id'), table_name='tandem_repeats')
+    op.drop_index('idx_tandem_repeat_coords', table_name='tandem_repeats')
+    op.drop_table('tandem_repeats')
@@ -0,0 +1,41 @@
+"""Add profile_tracks table
+
+Revision ID: b8e3f5a1c627
+Revises: a6d4c2e8f719
+Create Date: 2026-10-17 23:05:41.902713
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e3f5a1c627'
+down_revision: Union[str, Sequence[str], None] = 'a6d4c2e8f719'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('profile_tracks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('track', sa.String(), nullable=False),
+    sa.Column('chromosome_id', sa.Integer(), nullable=False),
+    sa.Column('window_size', sa.Integer(), nullable=False),
+    sa.Column('bin_count', sa.Integer(), nullable=False),
+    sa.Column('data', sa.LargeBinary(), nullable=False),
+    sa.ForeignKeyConstraint(['chromosome_id'], ['chromosomes.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_profile_track_lookup', 'profile_tracks', ['track', 'chromosome_id', 'window_size'], unique=True)
+    op.create_index(op.f('ix_profile_tracks_id'), 'profile_tracks', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_profile_tracks_id'), table_name='profile_tracks')
+    op.drop_index('idx_profile_track_lookup', table_name='profile_tracks')
+    op.drop_table('profile_tracks')
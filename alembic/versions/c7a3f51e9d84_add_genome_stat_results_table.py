@@ -0,0 +1,47 @@
+"""Add genome_stat_results table
+
+Revision ID: c7a3f51e9d84
+Revises: b4d9e2a7c135
+Create Date: 2026-10-17 17:48:12.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7a3f51e9d84'
+down_revision: Union[str, Sequence[str], None] = 'b4d9e2a7c135'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('genome_stat_results',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('stat_name', sa.String(), nullable=False),
+    sa.Column('chromosome_id', sa.Integer(), nullable=True),
+    sa.Column('start_pos', sa.Integer(), nullable=True),
+    sa.Column('end_pos', sa.Integer(), nullable=True),
+    sa.Column('feature_type', sa.String(), nullable=True),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('value', sa.JSON(), nullable=True),
+    sa.ForeignKeyConstraint(['chromosome_id'], ['chromosomes.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_stat_result_coords', 'genome_stat_results', ['stat_name', 'chromosome_id', 'start_pos'], unique=False)
+    op.create_index('idx_stat_result_type', 'genome_stat_results', ['stat_name', 'feature_type'], unique=False)
+    op.create_index(op.f('ix_genome_stat_results_id'), 'genome_stat_results', ['id'], unique=False)
+    # The nested gene pairs used to be inlined in the statistic; rerun identify_nested_genes.py to fill the table
+    op.execute("DELETE FROM genome_stats WHERE stat_name = 'nested_genes_statistics'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_genome_stat_results_id'), table_name='genome_stat_results')
+    op.drop_index('idx_stat_result_type', table_name='genome_stat_results')
+    op.drop_index('idx_stat_result_coords', table_name='genome_stat_results')
+    op.drop_table('genome_stat_results')
@@ -0,0 +1,73 @@
+"""Redesign feature table indexes around query shapes
+
+Revision ID: c9f2e7a4b136
+Revises: b8e3f5a1c627
+Create Date: 2026-10-18 00:12:08.415372
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9f2e7a4b136'
+down_revision: Union[str, Sequence[str], None] = 'b8e3f5a1c627'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Single-column indexes that no query uses: primary keys (already the rowid),
+# start_pos/end_pos (regions go through the R*Tree) and prefixes of the
+# composite indexes below
+OBSOLETE_INDEXES = {
+    'genes': ['id', 'start_pos', 'end_pos'],
+    'transcripts': ['id', 'gene_id'],
+    'exons': ['id', 'transcript_id', 'start_pos', 'end_pos'],
+    'utrs': ['id', 'transcript_id', 'start_pos', 'end_pos'],
+    'cpg_islands': ['id', 'start_pos', 'end_pos'],
+    'non_coding_rnas': ['id', 'chromosome_id', 'start_pos', 'end_pos'],
+}
+
+# Covering indexes for the joins and GROUP BYs on the feature tables
+COVERING_INDEXES = {
+    'exons': {
+        'idx_exon_gene': ['gene_id', 'start_pos', 'end_pos'],
+        'idx_exon_transcript': ['transcript_id', 'start_pos', 'end_pos'],
+    },
+    'utrs': {
+        'idx_utr_gene': ['gene_id', 'start_pos', 'end_pos'],
+        'idx_utr_transcript': ['transcript_id', 'start_pos', 'end_pos'],
+    },
+    'cpg_islands': {
+        'idx_cpg_island_coords': ['chromosome_id', 'start_pos', 'end_pos'],
+    },
+    'non_coding_rnas': {
+        'idx_ncrna_coords': ['chromosome_id', 'start_pos', 'end_pos'],
+    },
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # exons, utrs, cpg_islands and non_coding_rnas may have been created by
+    # scripts/init_db.py rather than by a migration
+    inspector = sa.inspect(op.get_bind())
+    for table, columns in OBSOLETE_INDEXES.items():
+        if inspector.has_table(table):
+            for column in columns:
+                op.execute(f"DROP INDEX IF EXISTS ix_{table}_{column}")
+            for name, index_columns in COVERING_INDEXES.get(table, {}).items():
+                op.create_index(name, table, index_columns, unique=False, if_not_exists=True)
+            op.execute(f"ANALYZE {table}")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    for table, columns in OBSOLETE_INDEXES.items():
+        if inspector.has_table(table):
+            for name in COVERING_INDEXES.get(table, {}):
+                op.drop_index(name, table_name=table, if_exists=True)
+            for column in columns:
+                op.create_index(f'ix_{table}_{column}', table, [column], unique=False, if_not_exists=True)
@@ -0,0 +1,47 @@
+"""Add R*Tree indexes for genes, exons, CpG islands and ncRNAs
+
+Revision ID: d2e8b6f4a913
+Revises: c7a3f51e9d84
+Create Date: 2026-10-17 19:05:37.611842
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.rtree import rtree_ddl, rtree_name
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2e8b6f4a913'
+down_revision: Union[str, Sequence[str], None] = 'c7a3f51e9d84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Table -> SQL giving a row's chromosome id (see app/db/rtree.py)
+RTREE_TABLES = {
+    'genes': '{row}.chromosome_id',
+    'exons': '(SELECT chromosome_id FROM genes WHERE genes.id = {row}.gene_id)',
+    'cpg_islands': '{row}.chromosome_id',
+    'non_coding_rnas': '{row}.chromosome_id',
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    for table, chromosome_sql in RTREE_TABLES.items():
+        if inspector.has_table(table):
+            # Creates the R*Tree, fills it from the existing rows and adds the sync triggers
+            for statement in rtree_ddl(table, chromosome_sql):
+                op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in RTREE_TABLES:
+        rtree = rtree_name(table)
+        for trigger in ('insert', 'update', 'delete'):
+            op.execute(f"DROP TRIGGER IF EXISTS {rtree}_{trigger}")
+        op.execute(f"DROP TABLE IF EXISTS {rtree}")
@@ -0,0 +1,32 @@
+"""Add table_loads table
+
+Revision ID: d7b2f9e4a618
+Revises: c9f2e7a4b136
+Create Date: 2026-10-17 14:12:08.337251
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7b2f9e4a618'
+down_revision: Union[str, Sequence[str], None] = 'c9f2e7a4b136'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('table_loads',
+    sa.Column('table_name', sa.String(), nullable=False),
+    sa.Column('generation', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('table_name')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('table_loads')
@@ -0,0 +1,37 @@
+"""Add gene search indexes
+
+Revision ID: e5c1a9d7b248
+Revises: d2e8b6f4a913
+Create Date: 2026-10-17 20:11:52.306118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.gene_search import gene_search_ddl, drop_gene_search_ddl
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5c1a9d7b248'
+down_revision: Union[str, Sequence[str], None] = 'd2e8b6f4a913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('idx_gene_name_nocase', 'genes', [sa.text('gene_name COLLATE "NOCASE"')], unique=False)
+    op.create_index('idx_gene_id_nocase', 'genes', [sa.text('gene_id COLLATE "NOCASE"')], unique=False)
+    # Creates the trigram index and builds it from the existing genes
+    for statement in gene_search_ddl():
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for statement in drop_gene_search_ddl():
+        op.execute(statement)
+    op.drop_index('idx_gene_id_nocase', table_name='genes')
+    op.drop_index('idx_gene_name_nocase', table_name='genes')
@@ -0,0 +1,42 @@
+"""Add feature_density table
+
+Revision ID: f3b7d2c8e591
+Revises: e5c1a9d7b248
+Create Date: 2026-10-17 21:02:18.774590
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b7d2c8e591'
+down_revision: Union[str, Sequence[str], None] = 'e5c1a9d7b248'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('feature_density',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('feature', sa.String(), nullable=False),
+    sa.Column('chromosome_id', sa.Integer(), nullable=False),
+    sa.Column('resolution', sa.Integer(), nullable=False),
+    sa.Column('bin_count', sa.Integer(), nullable=False),
+    sa.Column('counts', sa.LargeBinary(), nullable=False),
+    sa.Column('coverage', sa.LargeBinary(), nullable=False),
+    sa.ForeignKeyConstraint(['chromosome_id'], ['chromosomes.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_feature_density_lookup', 'feature_density', ['feature', 'chromosome_id', 'resolution'], unique=True)
+    op.create_index(op.f('ix_feature_density_id'), 'feature_density', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_feature_density_id'), table_name='feature_density')
+    op.drop_index('idx_feature_density_lookup', table_name='feature_density')
+    op.drop_table('feature_density')
@@ -0,0 +1,402 @@
+"""
+    Pluggable statistic accumulators for the single-pass sequence scanner.
+
+    The scanner (analysis/sequence_scanner.py) creates one instance of each
+    accumulator per chromosome, possibly in a worker process, and feeds it the
+    chromosome's base codes (A=0, C=1, G=2, T=3, N=4; see app/utils/twobit.py)
+    as consecutive fixed-size windows. Accumulators whose statistics span
+    neighbouring bases carry the few boundary bases they need over to the
+    next window. result() returns a small picklable partial for that chromosome, and
+    finalize() combines the partials of every chromosome into the genome_stats
+    rows the accumulator owns. Accumulators with a table of their own write a
+    chromosome's rows in store_results() as soon as its partial reaches the
+    parent, and keep only a summary of it for finalize().
+    """
+import sys
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Dict
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.config import get_settings
+from app.models.chromosome import Chromosome
+from app.models.tandem_repeat import TandemRepeat
+from app.models.composition_index import CompositionIndex
+from app.services import composition
+from app.utils import twobit
+from analysis import kmers
+
+MAIN_CHROMOSOMES = [f"chr{i}" for i in range(1, 23)] + ["chrX", "chrY"]
+
+TANDEM_REPEAT_INSERT = (
+    "INSERT INTO tandem_repeats (chromosome_id, start_pos, end_pos, period, motif, copy_number, length) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+COMPOSITION_INDEX_INSERT = (
+    "INSERT INTO composition_index (chromosome_id, sample_interval, cumulative) VALUES (?, ?, ?)"
+)
+
+
+def _base_counts(codes: np.ndarray) -> np.ndarray:
+    return np.bincount(codes, minlength=5)[:5]
+
+
+class SequenceAccumulator(ABC):
+    """Base class: collects one family of statistics over the chromosomes it includes."""
+
+    def __init__(self, chromosome_name: str):
+        self.chromosome_name = chromosome_name
+
+    @staticmethod
+    def include(chromosome_name: str) -> bool:
+        return True
+
+    @abstractmethod
+    def update(self, codes: np.ndarray):
+        """Consumes the next window of the chromosome."""
+
+    @abstractmethod
+    def result(self) -> Any:
+        """Returns the chromosome's picklable partial."""
+
+    @classmethod
+    @abstractmethod
+    def finalize(cls, partials: Dict[str, Any]) -> Dict[str, Any]:
+        """Maps {chromosome_name: partial} (in chromosome order) to {stat_name: value}."""
+
+    @classmethod
+    def clear_results(cls, db_session):
+        """Empties the accumulator's own table before a scan, if it has one."""
+        pass
+
+    @classmethod
+    def store_results(cls, db_session, chromosome_name: str, partial: Any) -> Any:
+        """
+        Stores a chromosome's per-feature results in the accumulator's own
+        table, if it has one, and returns the part of its partial finalize() needs.
+        """
+        return partial
+
+
+class BaseCompositionAccumulator(SequenceAccumulator):
+    """Nuclear and mitochondrial base counts."""
+
+    def __init__(self, chromosome_name: str):
+        super().__init__(chromosome_name)
+        self.counts = np.zeros(5, dtype=np.int64)
+
+    @staticmethod
+    def include(chromosome_name: str) -> bool:
+        # Skip random contigs
+        return "_" not in chromosome_name or chromosome_name == "chrM"
+
+    def update(self, codes: np.ndarray):
+        self.counts += _base_counts(codes)
+
+    def result(self):
+        return {base: int(count) for base, count in zip("ACGTN", self.counts) if count}
+
+    @classmethod
+    def finalize(cls, partials):
+        nuclear, mitochondrial = {}, {}
+        for name, counts in partials.items():
+            target = mitochondrial if name == "chrM" else nuclear
+            for base, count in counts.items():
+                target[base] = target.get(base, 0) + count
+        return {
+            "nuclear_base_composition": nuclear,
+            "mitochondrial_base_composition": mitochondrial,
+        }
+
+
+class PerChromosomeCompositionAccumulator(BaseCompositionAccumulator):
+    """A/C/G/T counts of each chromosome."""
+
+    @staticmethod
+    def include(chromosome_name: str) -> bool:
+        return "_" not in chromosome_name
+
+    def result(self):
+        return {base: int(count) for base, count in zip("ACGT", self.counts)}
+
+    @classmethod
+    def finalize(cls, partials):
+        return {"per_chromosome_composition": dict(partials)}
+
+
+class GcContentAccumulator(PerChromosomeCompositionAccumulator):
+    """GC percentage of each chromosome, Ns excluded."""
+
+    @classmethod
+    def finalize(cls, partials):
+        gc_content = {}
+        for name, counts in partials.items():
+            gc_count = counts["G"] + counts["C"]
+            total_bases = gc_count + counts["A"] + counts["T"]
+            if total_bases > 0:
+                gc_content[name] = round(gc_count / total_bases * 100, 2)
+        return {"gc_content_per_chromosome": gc_content}
+
+
+class CpgFrequencyAccumulator(SequenceAccumulator):
+    """Percentage of CpG among the dinucleotides of each chromosome."""
+
+    def __init__(self, chromosome_name: str):
+        super().__init__(chromosome_name)
+        self.cpg_count = 0
+        self.valid_bases = 0
+        self._carry = np.empty(0, dtype=np.uint8)
+
+    def update(self, codes: np.ndarray):
+        self.valid_bases += int(np.count_nonzero(codes != twobit.N_CODE))
+        # Prepend the last base of the previous window to catch a CpG across the boundary
+        codes = np.concatenate((self._carry, codes))
+        self.cpg_count += int(np.count_nonzero((codes[:-1] == 1) & (codes[1:] == 2)))
+        self._carry = codes[-1:]
+
+    def result(self):
+        return (self.cpg_count, self.valid_bases)
+
+    @classmethod
+    def finalize(cls, partials):
+        cpg_frequency = {}
+        for name, (cpg_count, valid_bases) in partials.items():
+            total_dinucleotides = max(0, valid_bases - 1)
+            if total_dinucleotides > 0:
+                cpg_frequency[name] = round(cpg_count / total_dinucleotides * 100, 4)
+        return {"cpg_frequency_per_chromosome": cpg_frequency}
+
+
+class KmerAccumulator(SequenceAccumulator):
+    """Genome-wide overlapping k-mer counts (mitochondrial DNA excluded); subclasses set K and STAT_NAME."""
+    K: int
+    STAT_NAME: str
+
+    def __init__(self, chromosome_name: str):
+        super().__init__(chromosome_name)
+        self.counts = np.zeros(4 ** self.K, dtype=np.int64)
+        self._carry = np.empty(0, dtype=np.uint8)
+
+    @staticmethod
+    def include(chromosome_name: str) -> bool:
+        return chromosome_name != "chrM"
+
+    def update(self, codes: np.ndarray):
+        # The last K - 1 bases of the previous window start the k-mers spanning the boundary
+        codes = np.concatenate((self._carry, codes))
+        self.counts += kmers.count_kmers(codes, self.K)
+        self._carry = codes[max(0, len(codes) - (self.K - 1)):] if self.K > 1 else codes[:0]
+
+    def result(self):
+        return self.counts
+
+    @classmethod
+    def finalize(cls, partials):
+        total = np.zeros(4 ** cls.K, dtype=np.int64)
+        for counts in partials.values():
+            total += counts
+        return {cls.STAT_NAME: kmers.kmer_frequencies(total, cls.K)}
+
+
+class DinucleotideAccumulator(KmerAccumulator):
+    K = 2
+    STAT_NAME = "dinucleotide_frequency"
+
+
+class TrinucleotideAccumulator(KmerAccumulator):
+    K = 3
+    STAT_NAME = "trinucleotide_frequency"
+
+
+class HexamerAccumulator(KmerAccumulator):
+    K = 6
+    STAT_NAME = "hexamer_frequency"
+
+
+class SsrAccumulator(SequenceAccumulator):
+    """
+    Perfect tandem repeats (microsatellites) of periods 1-6 on the main chromosomes.
+
+    For each period p a single vectorized pass marks the positions i where
+    base i equals base i + p; every run of such positions is a perfect
+    repeat of period p. Runs are kept when they reach the minimum copy number
+    of Settings.SSR_MIN_COPIES and their motif is primitive (so "ATAT" is
+    reported once with period 2, not again with period 4). A run reaching the
+    end of a window is carried over and completed by the next one.
+
+    Hits are returned as compact arrays and written to the tandem_repeats
+    table by store_results() one chromosome at a time; only their counts are
+    kept for the genome_stats summary.
+    """
+    MAX_PERIOD = 6
+    STAT_NAME = "simple_sequence_repeats"
+
+    def __init__(self, chromosome_name: str):
+        super().__init__(chromosome_name)
+        min_copies = get_settings().SSR_MIN_COPIES
+        self.min_copies = {p: min_copies[p] for p in range(1, self.MAX_PERIOD + 1) if p in min_copies}
+        self._codes = np.empty(0, dtype=np.uint8)
+        self._offset = 0  # Chromosome position of self._codes[0]
+        # Per period, the chromosome position from which runs have not been reported yet
+        self._resume = {p: 0 for p in self.min_copies}
+        self._hits = []
+
+    @staticmethod
+    def include(chromosome_name: str) -> bool:
+        return chromosome_name in MAIN_CHROMOSOMES
+
+    def _scan(self, final: bool):
+        codes = self._codes
+        n = len(codes)
+        for p, min_copies in self.min_copies.items():
+            resume = self._resume[p] - self._offset
+            same = (codes[:-p] == codes[p:]) & (codes[:-p] != twobit.N_CODE) if n > p else np.zeros(0, dtype=bool)
+            edges = np.diff(same.view(np.int8), prepend=0, append=0)
+            starts = np.flatnonzero(edges == 1)
+            ends = np.flatnonzero(edges == -1)
+
+            next_resume = max(0, n - p)
+            if not final and len(ends) and ends[-1] == len(same):
+                # The repeat may continue into the next window
+                next_resume = int(starts[-1])
+                starts, ends = starts[:-1], ends[:-1]
+            self._resume[p] = self._offset + next_resume
+
+            keep = (starts >= resume) & (ends - starts >= (min_copies - 1) * p)
+            starts, ends = starts[keep], ends[keep]
+            if not len(starts):
+                continue
+
+            motifs = codes[starts[:, None] + np.arange(p)]
+            primitive = np.ones(len(starts), dtype=bool)
+            for d in range(1, p):
+                if p % d == 0:
+                    primitive &= ~np.all(motifs[:, :p - d] == motifs[:, d:], axis=1)
+            starts, ends, motifs = starts[primitive], ends[primitive], motifs[primitive]
+
+            motif_codes = np.zeros(len(starts), dtype=np.uint16)
+            for j in range(p):
+                motif_codes = motif_codes * 4 + motifs[:, j]
+            self._hits.append((
+                (starts + self._offset).astype(np.int64),
+                np.full(len(starts), p, dtype=np.uint8),
+                (ends - starts + p).astype(np.int32),
+                motif_codes,
+            ))
+
+        carry_start = min([n - self.MAX_PERIOD] + [r - self._offset for r in self._resume.values()])
+        carry_start = max(0, carry_start)
+        self._codes = codes[carry_start:]
+        self._offset += carry_start
+
+    def update(self, codes: np.ndarray):
+        self._codes = np.concatenate((self._codes, codes))
+        self._scan(final=False)
+
+    def result(self):
+        """Returns (starts, periods, lengths, motif codes): 0-based starts, motifs as base-4 k-mer indices."""
+        self._scan(final=True)
+        if not self._hits:
+            return tuple(np.empty(0, dtype=dtype) for dtype in (np.int64, np.uint8, np.int32, np.uint16))
+        return tuple(np.concatenate(column) for column in zip(*self._hits))
+
+    @classmethod
+    def finalize(cls, partials):
+        """Combines the per-chromosome ({period: count}, bp) summaries of store_results()."""
+        by_period = {}
+        total_bp = 0
+        for counts, length_bp in partials.values():
+            total_bp += length_bp
+            for period, count in counts.items():
+                by_period[period] = by_period.get(period, 0) + count
+        return {cls.STAT_NAME: {
+            "total_repeats": sum(by_period.values()),
+            "repeats_by_period": by_period,
+            "total_length_bp": total_bp,
+        }}
+
+    @classmethod
+    def clear_results(cls, db_session):
+        db_session.query(TandemRepeat).delete()
+
+    @classmethod
+    def store_results(cls, db_session, chromosome_name, partial):
+        starts, periods, lengths, motif_codes = partial
+        chromosome_id = db_session.query(Chromosome.id).filter(Chromosome.name == chromosome_name).scalar()
+        labels = {p: kmers.kmer_labels(p) for p in range(1, cls.MAX_PERIOD + 1)}
+        order = np.argsort(starts, kind="stable")
+        rows = [
+            (chromosome_id, start + 1, start + length, period,
+             labels[period][motif], length // period, length)
+            for start, period, length, motif in zip(
+                starts[order].tolist(), periods[order].tolist(),
+                lengths[order].tolist(), motif_codes[order].tolist())
+        ]
+        if rows:
+            db_session.connection().exec_driver_sql(TANDEM_REPEAT_INSERT, rows)
+        print(f"  Stored {len(rows)} tandem repeats for {chromosome_name}")
+        counts = {int(period): int(count) for period, count in zip(*np.unique(periods, return_counts=True))}
+        return counts, int(lengths.sum())
+
+
+class CompositionIndexAccumulator(SequenceAccumulator):
+    """Cumulative A/C/G/T/N/CpG counts every COMPOSITION_SAMPLE_INTERVAL bases, stored in composition_index."""
+    INTERVAL = composition.COMPOSITION_SAMPLE_INTERVAL
+
+    def __init__(self, chromosome_name: str):
+        super().__init__(chromosome_name)
+        self.position = 0
+        self._blocks = []
+        self._carry = np.empty(0, dtype=np.uint8)
+
+    def update(self, codes: np.ndarray):
+        if not len(codes):
+            return
+        counts = composition.block_counts(codes, self.position, self._carry, self.INTERVAL)
+        if len(self._carry):
+            # The first block continues the last block of the previous window
+            self._blocks[-1][-1] += counts[0]
+            counts = counts[1:]
+        if len(counts):
+            self._blocks.append(counts)
+        self.position += len(codes)
+        self._carry = codes[-1:]
+
+    def result(self):
+        """Returns the (n_blocks + 1, 6) cumulative counts; row k covers [0, k * INTERVAL)."""
+        blocks = np.concatenate(self._blocks) if self._blocks else np.empty((0, 6), dtype=np.int64)
+        cumulative = np.zeros((len(blocks) + 1, blocks.shape[1]), dtype=np.int64)
+        np.cumsum(blocks, axis=0, out=cumulative[1:])
+        return cumulative.astype(composition.INDEX_DTYPE)
+
+    @classmethod
+    def finalize(cls, partials):
+        return {}
+
+    @classmethod
+    def clear_results(cls, db_session):
+        db_session.query(CompositionIndex).delete()
+
+    @classmethod
+    def store_results(cls, db_session, chromosome_name, partial):
+        chromosome_id = db_session.query(Chromosome.id).filter(Chromosome.name == chromosome_name).scalar()
+        db_session.connection().exec_driver_sql(
+            COMPOSITION_INDEX_INSERT, (chromosome_id, cls.INTERVAL, partial.tobytes()))
+        print(f"  Stored composition index for {chromosome_name}")
+        return None
+
+
+DEFAULT_ACCUMULATORS = [
+    BaseCompositionAccumulator,
+    PerChromosomeCompositionAccumulator,
+    GcContentAccumulator,
+    CpgFrequencyAccumulator,
+    DinucleotideAccumulator,
+    TrinucleotideAccumulator,
+    HexamerAccumulator,
+    SsrAccumulator,
+    CompositionIndexAccumulator,
+]
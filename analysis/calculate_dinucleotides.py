@@ -1,35 +1,17 @@
-import sys
-import os
+import sys, os
 import multiprocessing
-from collections import Counter
-from sqlalchemy.orm import Session
-
-# Add the backend directory to sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from sqlalchemy.orm import Session
 import utils.analysis_helpers as analysis_helpers
-from app.models.chromosome import Chromosome
-from analysis.parallel_utils import dinucleotide_worker
+from analysis.accumulators import DinucleotideAccumulator
+from analysis.sequence_scanner import run_scan
 
 def calculate_dinucleotide_frequency(db: Session = None):
-    def _calculate(db_session: Session):
-        print("Calculating dinucleotide frequency (Parallel Optimized)...")
-        
-        # Fetch IDs (Filtering out 'chrM' if needed, though worker handles logic)
-        chrom_ids = [c.id for c in db_session.query(Chromosome.id).filter(Chromosome.name != "chrM").all()]
-        
-        pool_size = min(len(chrom_ids), multiprocessing.cpu_count())
-        final_counts = Counter()
-        
-        print(f"  Spawning {pool_size} worker processes...")
-        with multiprocessing.Pool(pool_size) as pool:
-            results = pool.map(dinucleotide_worker, chrom_ids)
-            
-            for res in results:
-                if res:
-                    final_counts.update(res)
 
-        analysis_helpers.upsert_statistic(db_session, "dinucleotide_frequency", dict(final_counts))
+    def _calculate(db_session: Session):
+        print("Calculating dinucleotide frequency with the sequence scanner...")
+        run_scan(db_session, [DinucleotideAccumulator])
         print("Successfully calculated and stored dinucleotide frequencies.")
 
     if db:
@@ -39,5 +21,6 @@ def calculate_dinucleotide_frequency(db: Session = None):
             _calculate(session)
 
 if __name__ == "__main__":
+    # Multiprocessing needs this on Windows/MacOS
     multiprocessing.set_start_method("spawn", force=True)
-    calculate_dinucleotide_frequency()
\ No newline at end of file
+    calculate_dinucleotide_frequency()
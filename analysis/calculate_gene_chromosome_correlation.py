@@ -7,36 +7,31 @@ from scipy.stats import pearsonr
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.models.chromosome import Chromosome
-from app.models.gene import Gene
 import utils.analysis_helpers as analysis_helpers
+from utils.analytics import get_analytics_engine
 
 def calculate_gene_chromosome_correlation(db: Session = None):
     def _calculate(db_session: Session):
-        print("Calculating correlation between gene density and average gene length...")
-        
-        chromosomes = db_session.query(Chromosome).filter(Chromosome.name != "chrM").all()
-        
+        with get_analytics_engine(db_session) as engine:
+            print(f"Calculating correlation between gene density and average gene length ({engine.name})...")
+            # Gene count and average gene length (end_pos - start_pos + 1) of every chromosome in one GROUP BY
+            per_chromosome = engine.query(
+                "SELECT c.name AS name, c.length AS length, COUNT(g.id) AS gene_count, "
+                "AVG(g.end_pos - g.start_pos + 1) AS average_length "
+                "FROM chromosomes c LEFT JOIN genes g ON g.chromosome_id = c.id "
+                "WHERE c.name != 'chrM' GROUP BY c.id, c.name, c.length ORDER BY c.id"
+            )
+
         chromosome_stats = []
         densities = []
         avg_lengths = []
 
-        for chrom in chromosomes:
-            # Get gene count and average length for this chromosome
-            # gene_length = end_pos - start_pos + 1
-            stats = db_session.query(
-                func.count(Gene.id),
-                func.avg(Gene.end_pos - Gene.start_pos + 1)
-            ).filter(Gene.chromosome_id == chrom.id).first()
-            
-            gene_count = stats[0] or 0
-            avg_length = stats[1] or 0.0
-            
+        for name, length, gene_count, avg_length in zip(
+                *(per_chromosome[c].tolist() for c in ("name", "length", "gene_count", "average_length"))):
             if gene_count > 0:
-                density = gene_count / chrom.length
+                density = gene_count / length
                 chromosome_stats.append({
-                    "chromosome": chrom.name,
+                    "chromosome": name,
                     "gene_count": gene_count,
                     "density": density,
                     "average_gene_length": avg_length
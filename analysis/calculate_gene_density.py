@@ -2,45 +2,101 @@ import sys
 import os
 import math
 
+import numpy as np
+
 # Add the backend directory to sys.path to resolve imports
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from sqlalchemy.orm import Session
 from app.models.chromosome import Chromosome
-from app.models.gene import Gene
+from app.models.feature_density import FeatureDensity, DENSITY_FEATURES, DENSITY_RESOLUTIONS, DENSITY_DTYPE
+from app.utils import intervals
 import utils.analysis_helpers as analysis_helpers
+from utils.feature_snapshots import load_features
+
+BIN_SIZE = 1_000_000  # 1 Mb window of the gene_density_1mb statistic
+
+DENSITY_INSERT = (
+    "INSERT INTO feature_density (feature, chromosome_id, resolution, bin_count, counts, coverage) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+def density_pyramid(starts: np.ndarray, ends: np.ndarray, length: int):
+    """
+    Per-bin feature counts (by start) and covered bases of 1-based, inclusive
+    intervals on a chromosome of `length` bases, at every DENSITY_RESOLUTIONS
+    level. Returns {resolution: (counts, coverage)}.
+    """
+    finest = DENSITY_RESOLUTIONS[0]
+    coarsest = DENSITY_RESOLUTIONS[-1]
+    # Bins past the end are padded so every level is a whole number of finer bins
+    padded_bins = max(1, math.ceil(length / coarsest)) * (coarsest // finest)
+
+    starts = np.asarray(starts, dtype=np.int64) - 1  # 0-based, half-open from here on
+    ends = np.asarray(ends, dtype=np.int64)
+    last_bin = max(1, math.ceil(length / finest)) - 1
+    counts = np.bincount(np.clip(starts // finest, 0, last_bin), minlength=padded_bins)
 
-BIN_SIZE = 1_000_000  # 1 Mb window
+    # Merge the overlapping intervals (clipped to the chromosome) into disjoint blocks
+    ends = np.minimum(ends, length)
+    keep = ends > starts
+    order = np.argsort(starts[keep], kind="stable")
+    starts, ends = starts[keep][order], ends[keep][order]
+    running_end = np.maximum.accumulate(ends)
+    new_block = np.ones(len(starts), dtype=bool)
+    new_block[1:] = starts[1:] > running_end[:-1]
+    block_starts = starts[new_block]
+    block_ends = running_end[np.append(new_block[1:], True)[:len(starts)]]
+    covered_before = np.concatenate(([0], np.cumsum(block_ends - block_starts)))
+
+    # Covered bases before each bin edge, differenced into per-bin coverage
+    edges = np.arange(padded_bins + 1, dtype=np.int64) * finest
+    block = np.searchsorted(block_starts, edges, side="right") - 1
+    has_block = block >= 0
+    block = block[has_block]
+    covered = np.zeros(len(edges), dtype=np.int64)
+    covered[has_block] = covered_before[block] + np.minimum(
+        edges[has_block] - block_starts[block], block_ends[block] - block_starts[block])
+    coverage = np.diff(covered)
+
+    pyramid = {}
+    for resolution in DENSITY_RESOLUTIONS:
+        group = resolution // finest
+        bin_count = max(1, math.ceil(length / resolution))
+        level_counts = counts.reshape(-1, group).sum(axis=1)[:bin_count]
+        level_coverage = coverage.reshape(-1, group).sum(axis=1)[:bin_count]
+        pyramid[resolution] = (level_counts, level_coverage)
+    return pyramid
 
 def calculate_gene_density(db: Session = None):
     def _calculate(db_session: Session):
-        print(f"Calculating gene density (Window Size: {BIN_SIZE/1_000_000} Mb)...")
-        
-        chromosomes = db_session.query(Chromosome).filter(Chromosome.name != "chrM").all()
-        density_data = {
-            "bin_size": BIN_SIZE,
-            "data": {}
-        }
-
-        for chrom in chromosomes:
-            # Create bins
-            num_bins = math.ceil(chrom.length / BIN_SIZE)
-            bins = [0] * num_bins
-            
-            # Fetch all gene start positions for this chromosome
-            # Optimization: We only need the start position to determine the bin
-            gene_starts = db_session.query(Gene.start_pos).filter(Gene.chromosome_id == chrom.id).all()
-            
-            for (start_pos,) in gene_starts:
-                if start_pos is not None:
-                    bin_index = min(int(start_pos // BIN_SIZE), num_bins - 1)
-                    bins[bin_index] += 1
-            
-            density_data["data"][chrom.name] = bins
-            print(f"  {chrom.name}: {len(gene_starts)} genes processed into {num_bins} bins.")
-
-        analysis_helpers.upsert_statistic(db_session, "gene_density_1mb", density_data)
-        print("Successfully calculated and stored gene density.")
+        resolutions = ", ".join(f"{r // 1000} kb" for r in DENSITY_RESOLUTIONS)
+        print(f"Calculating feature density pyramids ({resolutions})...")
+
+        chromosomes = db_session.query(Chromosome.id, Chromosome.name, Chromosome.length).filter(Chromosome.name != "chrM").all()
+        db_session.query(FeatureDensity).delete()
+        connection = db_session.connection()
+        gene_density = {"bin_size": BIN_SIZE, "data": {}}
+
+        for feature in DENSITY_FEATURES:
+            features = load_features(db_session, feature, ["chromosome_id", "start_pos", "end_pos"])
+            by_chromosome = intervals.split_by_chromosome(features["chromosome_id"])
+            records = []
+            for chrom_id, name, length in chromosomes:
+                chrom_rows = by_chromosome.get(chrom_id, np.empty(0, dtype=np.int64))
+                pyramid = density_pyramid(features["start_pos"][chrom_rows], features["end_pos"][chrom_rows], length)
+                for resolution, (counts, coverage) in pyramid.items():
+                    records.append((
+                        feature, chrom_id, resolution, len(counts),
+                        counts.astype(DENSITY_DTYPE).tobytes(), coverage.astype(DENSITY_DTYPE).tobytes(),
+                    ))
+                if feature == "genes":
+                    gene_density["data"][name] = pyramid[BIN_SIZE][0].tolist()
+            connection.exec_driver_sql(DENSITY_INSERT, records)
+            print(f"  {feature}: {len(features['chromosome_id'])} features binned on {len(chromosomes)} chromosomes.")
+
+        analysis_helpers.upsert_statistic(db_session, "gene_density_1mb", gene_density)
+        print("Successfully calculated and stored feature density.")
 
     if db:
         _calculate(db)
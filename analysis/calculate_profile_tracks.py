@@ -0,0 +1,107 @@
+"""
+    Windowed sequence profile tracks (GC%, GC skew, cumulative GC skew,
+    CpG observed/expected, Shannon entropy) at every PROFILE_WINDOWS size.
+
+    The tracks are derived from the prefix-sum composition index built by the
+    sequence scan (app/services/composition.py) rather than from the sequence
+    itself: the base and CpG counts of every window are differences of index
+    rows, so each track is a handful of array operations over
+    length / window values per chromosome. Chromosomes are processed in
+    parallel worker processes and every track is stored as a float32 blob in
+    profile_tracks.
+    """
+import sys
+import os
+import multiprocessing
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy.orm import Session
+from app.models.chromosome import Chromosome
+from app.models.composition_index import CompositionIndex
+from app.models.profile_track import ProfileTrack, PROFILE_WINDOWS, PROFILE_TRACKS, PROFILE_DTYPE
+from app.services import composition
+import utils.analysis_helpers as analysis_helpers
+
+PROFILE_TRACK_INSERT = (
+    "INSERT INTO profile_tracks (track, chromosome_id, window_size, bin_count, data) VALUES (?, ?, ?, ?, ?)"
+)
+
+def window_counts(cumulative: np.ndarray, interval: int, window: int) -> np.ndarray:
+    """
+    A/C/G/T/N/CpG counts of consecutive windows from the cumulative index rows
+    of one chromosome (sampled every `interval` bases, last row = whole chromosome).
+    """
+    if window % interval:
+        raise ValueError(f"Window {window} is not a multiple of the index interval {interval}")
+    last_row = len(cumulative) - 1
+    rows = np.append(np.arange(0, last_row, window // interval), last_row)
+    return np.diff(cumulative[rows].astype(np.int64), axis=0)
+
+def profile_tracks(counts: np.ndarray) -> dict:
+    """Maps per-window counts to {track: values}; NaN where a window has no called bases."""
+    a, c, g, t, _, cpg = (counts[:, i].astype(np.float64) for i in range(6))
+    called = a + c + g + t
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gc_skew = (g - c) / (g + c)
+        frequencies = counts[:, :4] / called[:, None]
+        log_frequencies = np.log2(np.where(frequencies > 0, frequencies, 1))
+        entropy = -(frequencies * log_frequencies).sum(axis=1)
+        return {
+            "gc_content": (c + g) / called * 100,
+            "gc_skew": gc_skew,
+            "cumulative_gc_skew": np.cumsum(np.nan_to_num(gc_skew)),
+            "cpg_oe": np.where(c * g > 0, cpg * called / (c * g), np.nan),
+            "entropy": np.where(called > 0, entropy, np.nan),
+        }
+
+def chromosome_tracks(task):
+    """
+    Worker function computing every track of one chromosome at every window size.
+    Returns (chromosome_id, [(track, window, values)]).
+    """
+    chromosome_id, interval, cumulative = task
+    cumulative = np.frombuffer(cumulative, dtype=composition.INDEX_DTYPE).reshape(-1, len(composition.COMPOSITION_COLUMNS))
+    tracks = []
+    for window in PROFILE_WINDOWS:
+        values = profile_tracks(window_counts(cumulative, interval, window))
+        tracks.extend((track, window, values[track]) for track in PROFILE_TRACKS)
+    return chromosome_id, tracks
+
+def calculate_profile_tracks(db: Session = None, processes: int = None):
+    def _calculate(db_session: Session):
+        windows = ", ".join(f"{w // 1000} kb" for w in PROFILE_WINDOWS)
+        print(f"Calculating sequence profile tracks ({windows})...")
+
+        tasks = db_session.query(CompositionIndex.chromosome_id, CompositionIndex.sample_interval, CompositionIndex.cumulative)\
+            .join(Chromosome, CompositionIndex.chromosome_id == Chromosome.id).order_by(Chromosome.id).all()
+        db_session.query(ProfileTrack).delete()
+        connection = db_session.connection()
+
+        pool_size = min(len(tasks), processes or multiprocessing.cpu_count())
+        if pool_size > 1:
+            with multiprocessing.Pool(pool_size) as pool:
+                results = list(pool.imap_unordered(chromosome_tracks, tasks))
+        else:
+            results = [chromosome_tracks(task) for task in tasks]
+
+        for chromosome_id, tracks in results:
+            records = [
+                (track, chromosome_id, window, len(values), values.astype(PROFILE_DTYPE).tobytes())
+                for track, window, values in tracks
+            ]
+            connection.exec_driver_sql(PROFILE_TRACK_INSERT, records)
+        print(f"Successfully calculated and stored profile tracks for {len(results)} chromosomes.")
+
+    if db:
+        _calculate(db)
+    else:
+        with analysis_helpers.get_db_session() as session:
+            _calculate(session)
+
+if __name__ == "__main__":
+    # Multiprocessing needs this on Windows/MacOS
+    multiprocessing.set_start_method("spawn", force=True)
+    calculate_profile_tracks()
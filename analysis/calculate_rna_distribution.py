@@ -1,50 +1,45 @@
 import sys
 import os
-from sqlalchemy import func
 
 # Add the backend directory to sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from sqlalchemy.orm import Session
-from app.models.non_coding_rna import NonCodingRNA
-from app.models.chromosome import Chromosome
 import utils.analysis_helpers as analysis_helpers
+from utils.analytics import get_analytics_engine
+
+def _group_counts(engine, column: str) -> dict:
+    counts = engine.query(
+        f"SELECT {column} AS key, COUNT(*) AS n FROM non_coding_rnas GROUP BY {column} ORDER BY {column} NULLS FIRST"
+    )
+    return {key: int(n) for key, n in zip(counts["key"].tolist(), counts["n"].tolist())}
 
 def calculate_rna_distribution(db: Session = None):
     def _calculate(db_session: Session):
-        print("Calculating RNA distribution statistics...")
-        
-        # 1. Counts by Type/Class
-        print("  Aggregating counts by RNA class...")
-        class_counts = db_session.query(
-            NonCodingRNA.rna_class, 
-            func.count(NonCodingRNA.id)
-        ).group_by(NonCodingRNA.rna_class).all()
-        
-        class_stats = {cls: count for cls, count in class_counts}
-        
-        # 2. Counts by Type (detailed)
-        print("  Aggregating counts by RNA type...")
-        type_counts = db_session.query(
-            NonCodingRNA.rna_type, 
-            func.count(NonCodingRNA.id)
-        ).group_by(NonCodingRNA.rna_type).all()
-        
-        type_stats = {typ: count for typ, count in type_counts}
+        with get_analytics_engine(db_session) as engine:
+            print(f"Calculating RNA distribution statistics ({engine.name})...")
+
+            # 1. Counts by Type/Class
+            print("  Aggregating counts by RNA class...")
+            class_stats = _group_counts(engine, "rna_class")
+
+            # 2. Counts by Type (detailed)
+            print("  Aggregating counts by RNA type...")
+            type_stats = _group_counts(engine, "rna_type")
+
+            # 3. Density per Chromosome, one GROUP BY for all chromosomes
+            print("  Calculating density per chromosome...")
+            per_chromosome = engine.query(
+                "SELECT c.name AS name, c.length AS length, COUNT(r.id) AS n "
+                "FROM chromosomes c LEFT JOIN non_coding_rnas r ON r.chromosome_id = c.id "
+                "WHERE c.name != 'chrM' GROUP BY c.id, c.name, c.length ORDER BY c.id"
+            )
 
-        # 3. Density per Chromosome
-        print("  Calculating density per chromosome...")
-        chromosomes = db_session.query(Chromosome).filter(Chromosome.name != "chrM").all()
         chrom_stats = []
-        
-        for chrom in chromosomes:
-            count = db_session.query(func.count(NonCodingRNA.id)).filter(
-                NonCodingRNA.chromosome_id == chrom.id
-            ).scalar() or 0
-            
-            density = count / chrom.length if chrom.length > 0 else 0
+        for name, length, count in zip(*(per_chromosome[c].tolist() for c in ("name", "length", "n"))):
+            density = count / length if length > 0 else 0
             chrom_stats.append({
-                "chromosome": chrom.name,
+                "chromosome": name,
                 "count": count,
                 "density_per_bp": density,
                 "density_per_mb": density * 1_000_000
@@ -67,4 +62,4 @@ def calculate_rna_distribution(db: Session = None):
             _calculate(session)
 
 if __name__ == "__main__":
-    calculate_rna_distribution()
\ No newline at end of file
+    calculate_rna_distribution()
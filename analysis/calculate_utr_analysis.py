@@ -7,60 +7,41 @@ from scipy.stats import pearsonr
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.models.gene import Gene
-from app.models.exon import Exon
-from app.models.utr import Utr
-from app.models.chromosome import Chromosome
 import utils.analysis_helpers as analysis_helpers
+from utils.analytics import get_analytics_engine
 
 def calculate_utr_analysis(db: Session = None):
     def _calculate(db_session: Session):
-        print("Calculating correlation between transcript length and UTR length (optimized)...")
-        
-        # We need to import Chromosome to avoid mapper errors in some environments
-        # but we don't need to query it.
-        
-        # 1. Calculate Total Exon Length per Gene using SQL aggregation
-        print("  Querying exon lengths...")
-        exon_lengths = db_session.query(
-            Exon.gene_id,
-            func.sum(Exon.end_pos - Exon.start_pos + 1).label("total_exon_len")
-        ).group_by(Exon.gene_id).all()
-        exon_map = {gid: length for gid, length in exon_lengths}
-
-        # 2. Calculate Total UTR Length per Gene using SQL aggregation
-        print("  Querying UTR lengths...")
-        utr_lengths_raw = db_session.query(
-            Utr.gene_id,
-            func.sum(Utr.end_pos - Utr.start_pos + 1).label("total_utr_len")
-        ).group_by(Utr.gene_id).all()
-        utr_map = {gid: length for gid, length in utr_lengths_raw}
-
-        # 3. Combine Data
-        print("  Combining results...")
-        transcript_lengths = []
-        utr_lengths = []
-        
-        # We iterate over genes that have exons (transcripts)
-        for gene_id, exon_len in exon_map.items():
-            u_len = utr_map.get(gene_id, 0)
-            transcript_lengths.append(exon_len)
-            utr_lengths.append(u_len)
+        with get_analytics_engine(db_session) as engine:
+            print(f"Calculating correlation between transcript length and UTR length ({engine.name})...")
+            # Spliced length (precomputed at GTF ingest) and total UTR length of
+            # every transcript; transcripts without UTRs count as 0
+            transcripts = engine.query(
+                "SELECT t.gene_id AS gene_id, t.spliced_length AS spliced_length, "
+                "COALESCE(u.utr_length, 0) AS utr_length "
+                "FROM transcripts t LEFT JOIN ("
+                "  SELECT transcript_id, CAST(SUM(end_pos - start_pos + 1) AS BIGINT) AS utr_length FROM utrs "
+                "  WHERE transcript_id IS NOT NULL GROUP BY transcript_id"
+                ") u ON u.transcript_id = t.id "
+                "WHERE t.spliced_length IS NOT NULL"
+            )
+        transcript_lengths = transcripts["spliced_length"]
+        utr_lengths = transcripts["utr_length"]
 
         correlation = 0.0
         p_value = 1.0
         if len(transcript_lengths) > 1:
             # Check for variance to avoid pearsonr errors
-            if len(set(transcript_lengths)) > 1 and len(set(utr_lengths)) > 1:
+            if np.ptp(transcript_lengths) > 0 and np.ptp(utr_lengths) > 0:
                 correlation, p_value = pearsonr(transcript_lengths, utr_lengths)
 
         result = {
             "correlation_coefficient": float(correlation),
             "p_value": float(p_value),
-            "total_genes_analyzed": len(transcript_lengths),
-            "average_transcript_length": float(np.mean(transcript_lengths)) if transcript_lengths else 0,
-            "average_utr_length": float(np.mean(utr_lengths)) if utr_lengths else 0
+            "total_genes_analyzed": len(np.unique(transcripts["gene_id"])),
+            "total_transcripts_analyzed": len(transcript_lengths),
+            "average_transcript_length": float(np.mean(transcript_lengths)) if len(transcript_lengths) else 0,
+            "average_utr_length": float(np.mean(utr_lengths)) if len(utr_lengths) else 0
         }
 
         analysis_helpers.upsert_statistic(db_session, "utr_transcript_correlation", result)
@@ -4,72 +4,49 @@ import os
 # Add the backend directory to sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+import numpy as np
 from sqlalchemy.orm import Session
-from app.models.gene import Gene
-from app.models.chromosome import Chromosome
+from app.utils import intervals
 import utils.analysis_helpers as analysis_helpers
+from utils.feature_snapshots import load_features
 
 def identify_nested_genes(db: Session = None):
     def _calculate(db_session: Session):
-        print("Identifying nested genes (optimized: tuple fetch)...")
+        print("Identifying nested genes (interval index)...")
         
-        # Optimization: Query only necessary columns (tuples) instead of full ORM objects
-        # 0:id, 1:chromosome_id, 2:start_pos, 3:end_pos, 4:gene_name, 5:gene_id
-        genes_data = db_session.query(
-            Gene.id, 
-            Gene.chromosome_id, 
-            Gene.start_pos, 
-            Gene.end_pos, 
-            Gene.gene_name, 
-            Gene.gene_id
-        ).all()
-        
-        nested_pairs = []
-
-        # Group genes by chromosome
-        genes_by_chrom = {}
-        for g in genes_data:
-            chrom_id = g[1]
-            if chrom_id not in genes_by_chrom:
-                genes_by_chrom[chrom_id] = []
-            genes_by_chrom[chrom_id].append(g)
-
-        for chrom_id, chrom_genes in genes_by_chrom.items():
-            # Sort genes by start position for optimized spatial search
-            # x[2] is start_pos
-            chrom_genes.sort(key=lambda x: x[2])
-            
-            n = len(chrom_genes)
-            for i in range(n):
-                g_outer = chrom_genes[i]
-                outer_end = g_outer[3]
-                
-                # Check subsequent genes
-                for j in range(i + 1, n):
-                    g_inner = chrom_genes[j]
-                    inner_start = g_inner[2]
-                    inner_end = g_inner[3]
-                    
-                    # If the next gene starts after the current gene ends, 
-                    # it cannot be nested inside the current gene.
-                    if inner_start > outer_end:
-                        break
-                    
-                    # Check if g_inner is entirely within g_outer
-                    if inner_end <= outer_end:
-                        nested_pairs.append({
-                            "inner_gene": g_inner[4] or g_inner[5], # gene_name or gene_id
-                            "outer_gene": g_outer[4] or g_outer[5], # gene_name or gene_id
-                            "chromosome_id": chrom_id
-                        })
-
-        result = {
-            "total_nested_pairs": len(nested_pairs),
-            "nested_pairs": nested_pairs
-        }
-
-        analysis_helpers.upsert_statistic(db_session, "nested_genes_statistics", result)
-        print(f"Successfully identified {len(nested_pairs)} nested gene pairs.")
+        genes = load_features(db_session, "genes", ["chromosome_id", "start_pos", "end_pos", "gene_name", "gene_id"])
+        chromosome_ids, starts, ends = genes["chromosome_id"], genes["start_pos"], genes["end_pos"]
+        # gene_name or gene_id
+        labels = [name or gene_id for name, gene_id in zip(genes["gene_name"].tolist(), genes["gene_id"].tolist())]
+
+        def _nested_pairs():
+            for chrom_id, rows in intervals.split_by_chromosome(chromosome_ids).items():
+                chrom_starts, chrom_ends = starts[rows], ends[rows]
+                inner, outer = intervals.IntervalIndex(chrom_starts, chrom_ends).containing(chrom_starts, chrom_ends)
+                # Every gene contains itself; genes with identical coordinates
+                # are paired once, the earlier one as the outer gene
+                keep = (chrom_starts[outer] < chrom_starts[inner]) | (chrom_ends[outer] > chrom_ends[inner]) | (outer < inner)
+                inner, outer = inner[keep], outer[keep]
+                order = np.lexsort((chrom_starts[inner], chrom_starts[outer]))
+                for i, o in zip(rows[inner[order]].tolist(), rows[outer[order]].tolist()):
+                    yield {
+                        "chromosome_id": chrom_id,
+                        "start_pos": int(starts[i]),
+                        "end_pos": int(ends[i]),
+                        "feature_type": "nested_gene",
+                        "name": labels[i],
+                        "value": {
+                            "inner_gene": labels[i],
+                            "outer_gene": labels[o],
+                            "outer_start": int(starts[o]),
+                            "outer_end": int(ends[o]),
+                        },
+                    }
+
+        # The pairs go to genome_stat_results; genome_stats only keeps the count
+        total = analysis_helpers.write_statistic_results(db_session, "nested_genes_statistics", _nested_pairs())
+        analysis_helpers.upsert_statistic(db_session, "nested_genes_statistics", {"total_nested_pairs": total})
+        print(f"Successfully identified {total} nested gene pairs.")
 
     if db:
         _calculate(db)
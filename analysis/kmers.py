@@ -0,0 +1,59 @@
+"""
+    Vectorized k-mer counting over base code arrays.
+
+    Sequences are handled as uint8 base codes (A=0, C=1, G=2, T=3, N=4; see
+    app/utils/twobit.py). Every k-mer is mapped to its rolling index
+    sum(code[i + j] * 4 ** (k - 1 - j)), and all 4^k counts are obtained with a
+    single np.bincount over those indices. k-mers overlapping an N are skipped,
+    so counts never span an N-break.
+    """
+import sys
+import os
+from itertools import product
+from typing import Dict
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.utils import twobit
+
+MAX_K = 8
+
+# Codes are counted in slices of this many positions to bound the temporary
+# index arrays; consecutive slices overlap by k - 1 bases.
+KMER_CHUNK_SIZE = 16 * 1024 * 1024
+
+
+def kmer_labels(k: int):
+    """Returns the 4^k k-mer strings in rolling index order (AA..A first, TT..T last)."""
+    return ["".join(kmer) for kmer in product(twobit.BASES, repeat=k)]
+
+
+def _count_chunk(codes: np.ndarray, k: int) -> np.ndarray:
+    windows = len(codes) - k + 1
+    index = np.zeros(windows, dtype=np.uint32)
+    valid = np.ones(windows, dtype=bool)
+    for j in range(k):
+        window_codes = codes[j:j + windows]
+        index <<= 2
+        index |= window_codes & 3
+        valid &= window_codes != twobit.N_CODE
+    return np.bincount(index[valid], minlength=4 ** k)
+
+
+def count_kmers(codes: np.ndarray, k: int) -> np.ndarray:
+    """
+    Counts the overlapping k-mers of a base code array.
+    Returns an int64 array of length 4^k indexed by rolling k-mer index.
+    """
+    if not 1 <= k <= MAX_K:
+        raise ValueError(f"k must be between 1 and {MAX_K}, got {k}")
+    counts = np.zeros(4 ** k, dtype=np.int64)
+    for offset in range(0, max(0, len(codes) - k + 1), KMER_CHUNK_SIZE):
+        counts += _count_chunk(codes[offset:offset + KMER_CHUNK_SIZE + k - 1], k)
+    return counts
+
+
+def kmer_frequencies(counts: np.ndarray, k: int) -> Dict[str, int]:
+    """Maps a count array from count_kmers to {k-mer: count}, omitting k-mers never seen."""
+    return {label: int(count) for label, count in zip(kmer_labels(k), counts) if count}
@@ -0,0 +1,189 @@
+"""
+    Single-pass multi-statistic sequence scanner.
+
+    Every chromosome is read once through the configured sequence store, in
+    windows of Settings.SEQUENCE_SCAN_WINDOW bases, and each window of base
+    codes is fed to all the accumulators (analysis/accumulators.py) that
+    include it, so a worker's memory does not grow with chromosome length.
+    Chromosomes are scanned in parallel worker processes; the per-chromosome
+    partials are then combined and every resulting statistic is written to
+    genome_stats in one go.
+
+    Running this module directly computes all the default sequence statistics.
+    """
+import sys
+import os
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Type
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy.orm import Session
+import utils.analysis_helpers as analysis_helpers
+from app.config import get_settings
+from app.models.chromosome import Chromosome
+from app.services.sequence_store import (
+    DatabaseSequenceStore, SequenceHandle, SharedChromosomeSequence, get_sequence_store
+)
+from analysis.accumulators import DEFAULT_ACCUMULATORS, SequenceAccumulator
+
+
+def scan_sequence(handle: SequenceHandle, accumulator_types: List[Type[SequenceAccumulator]],
+                  window: Optional[int] = None) -> Dict[str, object]:
+    """
+    Streams an open sequence, window by window, through the given accumulators.
+    Returns {accumulator class name: partial}.
+    """
+    window = window or get_settings().SEQUENCE_SCAN_WINDOW
+    accumulators = [acc_type(handle.name) for acc_type in accumulator_types]
+    for start in range(0, handle.length, window):
+        codes = handle.read_codes(start, start + window)
+        for accumulator in accumulators:
+            accumulator.update(codes)
+    return {type(acc).__name__: acc.result() for acc in accumulators}
+
+
+def scan_chromosome(db: Session, chromosome_name: str,
+                    accumulator_types: List[Type[SequenceAccumulator]],
+                    window: Optional[int] = None) -> Optional[Dict[str, object]]:
+    """
+    Scans one chromosome read through the configured sequence store.
+    Returns {accumulator class name: partial}, or None if the chromosome has no sequence.
+    """
+    handle = get_sequence_store(db).open(chromosome_name)
+    if handle is None:
+        return None
+    with handle:
+        return scan_sequence(handle, accumulator_types, window)
+
+
+def _scan_in_pool(db_session: Session, tasks, pool_size: int):
+    """
+    Runs the scan tasks in a worker pool, yielding (chromosome_name, partials) as they finish.
+
+    With the database backend the parent reads each packed chromosome once
+    into shared memory and workers attach to it, so they neither open their
+    own connections nor contend on the SQLite file. At most two chromosomes
+    per worker are held in shared memory at a time. With the FASTA backend
+    workers map the file themselves; its pages are already shared by the OS.
+    """
+    from analysis.parallel_utils import scan_worker
+
+    store = get_sequence_store(db_session)
+    share = isinstance(store, DatabaseSequenceStore)
+    pending = list(reversed(tasks))
+    in_flight = {}
+    futures = {}
+
+    def submit(executor):
+        name, included = pending.pop()
+        shared = None
+        if share:
+            handle = store.open(name)
+            if handle is not None:
+                with handle:
+                    shared = SharedChromosomeSequence.create(handle)
+        in_flight[name] = shared
+        futures[executor.submit(scan_worker, (name, included, shared))] = name
+
+    executor = ProcessPoolExecutor(pool_size, mp_context=multiprocessing.get_context())
+    try:
+        for _ in range(min(len(pending), 2 * pool_size)):
+            submit(executor)
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                futures.pop(future)
+                try:
+                    name, partials = future.result()
+                except BrokenProcessPool as e:
+                    # A worker died (e.g. OOM-killed); every pending task is lost
+                    raise RuntimeError(
+                        "A sequence scan worker exited unexpectedly (killed, or out of memory?) "
+                        f"while scanning {', '.join(sorted(in_flight))}"
+                    ) from e
+                shared = in_flight.pop(name)
+                if shared is not None:
+                    shared.close()
+                yield name, partials
+                if pending:
+                    submit(executor)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        for shared in in_flight.values():
+            if shared is not None:
+                shared.close()
+
+
+def run_scan(db_session: Session, accumulator_types: List[Type[SequenceAccumulator]],
+             processes: Optional[int] = None) -> Dict[str, object]:
+    """
+    Scans every chromosome included by at least one accumulator, then upserts
+    all the statistics the accumulators produce. Returns {stat_name: value}.
+    """
+    chromosomes = db_session.query(Chromosome.id, Chromosome.name).order_by(Chromosome.id).all()
+    tasks = []
+    for _, name in chromosomes:
+        included = [acc_type for acc_type in accumulator_types if acc_type.include(name)]
+        if included:
+            tasks.append((name, included))
+
+    for acc_type in accumulator_types:
+        acc_type.clear_results(db_session)
+
+    def store(name, partials):
+        # Rows go to the accumulators' tables as each chromosome arrives; only
+        # what finalize() needs of its partials is kept
+        if partials is not None:
+            partials_by_chrom[name] = {
+                acc_name: accumulator_types_by_name[acc_name].store_results(db_session, name, partial)
+                for acc_name, partial in partials.items()
+            }
+        print(f"  Processed {name}")
+
+    accumulator_types_by_name = {acc_type.__name__: acc_type for acc_type in accumulator_types}
+    partials_by_chrom = {}
+    if tasks:
+        pool_size = min(len(tasks), processes or multiprocessing.cpu_count())
+        print(f"  Scanning {len(tasks)} chromosomes with {pool_size} worker processes...")
+        if pool_size > 1:
+            for name, partials in _scan_in_pool(db_session, tasks, pool_size):
+                store(name, partials)
+        else:
+            for name, included in tasks:
+                store(name, scan_chromosome(db_session, name, included))
+
+    stats = {}
+    for acc_type in accumulator_types:
+        # Partials in chromosome order, skipping chromosomes without a sequence
+        partials = {
+            name: partials_by_chrom[name][acc_type.__name__]
+            for name, included in tasks
+            if acc_type in included and name in partials_by_chrom
+        }
+        stats.update(acc_type.finalize(partials))
+
+    for stat_name, value in stats.items():
+        analysis_helpers.upsert_statistic(db_session, stat_name, value)
+    return stats
+
+
+def run_sequence_scan(db: Session = None):
+    def _calculate(db_session: Session):
+        print("Calculating all sequence statistics in a single pass...")
+        stats = run_scan(db_session, DEFAULT_ACCUMULATORS)
+        print(f"Successfully calculated and stored {len(stats)} sequence statistics.")
+
+    if db:
+        _calculate(db)
+    else:
+        with analysis_helpers.get_db_session() as session:
+            _calculate(session)
+
+
+if __name__ == "__main__":
+    # Multiprocessing needs this on Windows/MacOS
+    multiprocessing.set_start_method("spawn", force=True)
+    run_sequence_scan()
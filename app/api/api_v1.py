@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from .endpoints import chromosomes, genes, statistics, genomes, variants, centromeres, telomeres # Added telomeres
+from .endpoints import chromosomes, genes, statistics, genomes, variants, centromeres, telomeres, tandem_repeats, regions, density, composition, tracks, sequences # Added telomeres
 
 api_router = APIRouter()
 api_router.include_router(chromosomes.router, prefix="/chromosomes", tags=["chromosomes"])
@@ -8,4 +8,10 @@ api_router.include_router(statistics.router, prefix="/statistics", tags=["statis
 api_router.include_router(genomes.router, prefix="/genomes", tags=["genomes"])
 api_router.include_router(variants.router, prefix="/variants", tags=["variants"])
 api_router.include_router(centromeres.router, prefix="/centromeres", tags=["centromeres"])
-api_router.include_router(telomeres.router, prefix="/telomeres", tags=["telomeres"]) # Added telomeres router
\ No newline at end of file
+api_router.include_router(telomeres.router, prefix="/telomeres", tags=["telomeres"]) # Added telomeres router
+api_router.include_router(tandem_repeats.router, prefix="/tandem-repeats", tags=["tandem-repeats"])
+api_router.include_router(regions.router, prefix="/regions", tags=["regions"])
+api_router.include_router(density.router, prefix="/density", tags=["density"])
+api_router.include_router(composition.router, prefix="/composition", tags=["composition"])
+api_router.include_router(tracks.router, prefix="/tracks", tags=["tracks"])
+api_router.include_router(sequences.router, prefix="/sequences", tags=["sequences"])
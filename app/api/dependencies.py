@@ -3,7 +3,7 @@ from __future__ import annotations
 from contextlib import contextmanager
 from typing import Iterator
 
-from ..db.session import get_session_local
+from ..db.session import get_read_session_local, get_session_local
 
 @contextmanager
 def session_scope() -> Iterator:
@@ -26,4 +26,13 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def get_read_db():
+    """Session on the read-only engine, for endpoints that only read."""
+    SessionLocal = get_read_session_local()
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -4,12 +4,12 @@ from typing import Optional
 
 from ...schemas.centromere import CentromereSequenceResponse
 from ...crud import crud_centromere
-from ..dependencies import get_db
+from ..dependencies import get_read_db
 
 router = APIRouter()
 
 @router.get("/{chromosome_name}/sequence", response_model=CentromereSequenceResponse)
-def get_centromere_sequence_endpoint(chromosome_name: str, db: Session = Depends(get_db)):
+def get_centromere_sequence_endpoint(chromosome_name: str, db: Session = Depends(get_read_db)):
     """
     Retrieve the sequence of the centromere for a given chromosome.
     """
@@ -1,15 +1,22 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+import zlib
+from typing import Iterator, List, Literal, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from ...schemas import chromosome as chromosome_schemas # Updated import
 from ...crud import crud_chromosome
-from ..dependencies import get_db
+from ...db.session import get_read_session_local
+from ...services.sequence_store import get_sequence_store
+from ..dependencies import get_read_db
 
 router = APIRouter()
 
+# Number of bases read from the sequence store per streamed chunk
+SEQUENCE_STREAM_CHUNK_SIZE = 1 << 20
+
 @router.get("/", response_model=List[chromosome_schemas.Chromosome]) # Updated response_model
-def read_chromosomes(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def read_chromosomes(skip: int = 0, limit: int = 100, db: Session = Depends(get_read_db)):
     """
     Retrieve all chromosomes from the database.
     """
@@ -17,7 +24,7 @@ def read_chromosomes(skip: int = 0, limit: int = 100, db: Session = Depends(get_
     return chromosomes
 
 @router.get("/lengths", response_model=List[chromosome_schemas.ChromosomeBase])
-def read_chromosome_lengths(db: Session = Depends(get_db)):
+def read_chromosome_lengths(db: Session = Depends(get_read_db)):
     """
     Retrieve the name and length of all chromosomes.
     """
@@ -25,3 +32,88 @@ def read_chromosome_lengths(db: Session = Depends(get_db)):
     # The CRUD function returns a list of tuples (name, length).
     # We need to convert these into ChromosomeBase objects for the response model.
     return [{"name": name, "length": length} for name, length in chromosome_lengths]
+
+def _stream_region(chromosome_name: str, start: int, end: int, format: str, line_width: int,
+                   soft_mask: bool) -> Iterator[bytes]:
+    # The request session may already be closed while the body streams, so
+    # the stream reads through a session of its own.
+    db = get_read_session_local()()
+    try:
+        handle = get_sequence_store(db).open(chromosome_name)
+        if handle is None:
+            # Gone since the request was checked (e.g. a new release was
+            # published in between); the response has started, so end it
+            return
+        with handle:
+            if format == "fasta":
+                yield f">{chromosome_name}:{start}-{end}\n".encode("ascii")
+                # Keep chunks a multiple of the line width so lines never straddle chunks
+                chunk_size = max(line_width, SEQUENCE_STREAM_CHUNK_SIZE - SEQUENCE_STREAM_CHUNK_SIZE % line_width)
+                for chunk in handle.iter_chunks(start, end, chunk_size, soft_mask=soft_mask):
+                    lines = [chunk[i:i + line_width] for i in range(0, len(chunk), line_width)]
+                    yield ("\n".join(lines) + "\n").encode("ascii")
+            else:
+                for chunk in handle.iter_chunks(start, end, SEQUENCE_STREAM_CHUNK_SIZE, soft_mask=soft_mask):
+                    yield chunk.encode("ascii")
+    finally:
+        db.close()
+
+def _accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """
+    Whether an Accept-Encoding header allows a gzip response: an explicit
+    gzip entry decides, otherwise a "*" entry does; q=0 refuses.
+    """
+    qualities = {}
+    for coding in (accept_encoding or "").split(","):
+        name, *params = [part.strip() for part in coding.split(";")]
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qualities[name.lower()] = q
+    q = qualities.get("gzip", qualities.get("*", 0.0))
+    return q > 0
+
+def _gzip_stream(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+@router.get("/{chromosome_name}/sequence")
+def stream_chromosome_sequence(
+    chromosome_name: str,
+    start: int = Query(0, ge=0, description="0-based start of the region"),
+    end: Optional[int] = Query(None, ge=1, description="0-based exclusive end; defaults to the chromosome end"),
+    format: Literal["raw", "fasta"] = Query("raw", description="Plain sequence or line-wrapped FASTA"),
+    line_width: int = Query(60, ge=1, description="FASTA line width"),
+    soft_mask: bool = Query(True, description="Return soft-masked bases in lowercase"),
+    accept_encoding: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Stream the sequence of a chromosome region in fixed-size chunks, gzipped
+    when the client accepts it.
+    """
+    handle = get_sequence_store(db).open(chromosome_name)
+    if handle is None:
+        raise HTTPException(status_code=404, detail=f"Sequence not available for chromosome {chromosome_name}")
+    handle.close()
+
+    end = handle.length if end is None else min(end, handle.length)
+    if start >= end:
+        raise HTTPException(status_code=400, detail=f"Invalid region {start}-{end} for chromosome {chromosome_name} (length {handle.length})")
+
+    body = _stream_region(chromosome_name, start, end, format, line_width, soft_mask)
+    headers = {"Vary": "Accept-Encoding"}
+    if _accepts_gzip(accept_encoding):
+        body = _gzip_stream(body)
+        headers["Content-Encoding"] = "gzip"
+    media_type = "text/x-fasta" if format == "fasta" else "text/plain"
+    return StreamingResponse(body, media_type=media_type, headers=headers)
@@ -0,0 +1,35 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from ...schemas.composition import CompositionBatchRequest, RegionComposition
+from ...services.composition import region_composition
+from ...utils.regions import parse_region
+from ..dependencies import get_read_db
+
+router = APIRouter()
+
+def _composition(db: Session, region: str) -> dict:
+    try:
+        chromosome, start, end = parse_region(region)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    result = region_composition(db, chromosome, start - 1, end)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"No composition index for chromosome {chromosome}")
+    return result
+
+@router.get("/{region}", response_model=RegionComposition)
+def read_composition(region: str, db: Session = Depends(get_read_db)):
+    """
+    Retrieve the base counts, CpG count and GC content of a region such as
+    chr3:10,000,001-12,000,000, from the precomputed composition index.
+    """
+    return _composition(db, region)
+
+@router.post("/", response_model=List[RegionComposition])
+def read_compositions(request: CompositionBatchRequest, db: Session = Depends(get_read_db)):
+    """
+    Retrieve the composition of many regions at once, in request order.
+    """
+    return [_composition(db, region) for region in request.regions]
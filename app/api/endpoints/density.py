@@ -0,0 +1,38 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from ...schemas.density import DensitySlice
+from ...crud import crud_density
+from ...models.feature_density import DENSITY_FEATURES, DENSITY_RESOLUTIONS
+from ..dependencies import get_read_db
+
+router = APIRouter()
+
+@router.get("/{feature}/{chromosome_name}", response_model=DensitySlice)
+def read_density(
+    feature: str,
+    chromosome_name: str,
+    resolution: int = Query(1_000_000, description=f"Bin size, one of {', '.join(map(str, DENSITY_RESOLUTIONS))}"),
+    start: Optional[int] = Query(None, ge=1, description="First position (1-based) of the slice"),
+    end: Optional[int] = Query(None, ge=1, description="Last position (1-based) of the slice"),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Retrieve precomputed density bins of a feature class (genes, exons,
+    cpg_islands or non_coding_rnas), optionally only those covering start..end.
+    """
+    if feature not in DENSITY_FEATURES:
+        raise HTTPException(status_code=404, detail="Feature not found")
+    if resolution not in DENSITY_RESOLUTIONS:
+        raise HTTPException(status_code=400, detail=f"Resolution must be one of {', '.join(map(str, DENSITY_RESOLUTIONS))}")
+    first_bin = (start - 1) // resolution if start is not None else 0
+    last_bin = (end - 1) // resolution if end is not None else None
+    density = crud_density.get_density_slice(db, feature, chromosome_name, resolution, first_bin, last_bin)
+    if density is None:
+        raise HTTPException(status_code=404, detail="Density not found")
+    total_bins, first_bin, counts, coverage = density
+    return DensitySlice(
+        feature=feature, chromosome=chromosome_name, resolution=resolution,
+        total_bins=total_bins, first_bin=first_bin, counts=counts, coverage=coverage,
+    )
@@ -1,25 +1,36 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from ...schemas import gene as gene_schemas # Updated import
 from ...crud import crud_gene
-from ..dependencies import get_db
+from ..dependencies import get_read_db
 
 router = APIRouter()
 
 @router.get("/search/{query}", response_model=List[gene_schemas.Gene]) # Updated response_model
-def search_for_genes(query: str, db: Session = Depends(get_db)):
+def search_for_genes(query: str, limit: int = Query(10, ge=1, le=100), db: Session = Depends(get_read_db)):
     """
-    Search for genes by name (case-insensitive).
+    Search for genes by name or Ensembl id (case-insensitive): exact matches
+    first, then prefix matches, then substring matches.
     """
-    genes = crud_gene.search_genes_by_name(db=db, query=query)
+    genes = crud_gene.search_genes_by_name(db=db, query=query, limit=limit)
     if not genes:
         raise HTTPException(status_code=404, detail="No genes found matching the query")
     return genes
 
+@router.get("/autocomplete", response_model=List[gene_schemas.GeneSuggestion])
+def autocomplete_genes(q: str = Query(..., min_length=1), limit: int = Query(10, ge=1, le=50), db: Session = Depends(get_read_db)):
+    """
+    Typeahead suggestions: genes whose name or Ensembl id equals or starts with q.
+    """
+    return [
+        gene_schemas.GeneSuggestion(gene_id=gene_id, gene_name=gene_name, locus=f"{chromosome}:{start}-{end}")
+        for gene_id, gene_name, chromosome, start, end in crud_gene.autocomplete_genes(db=db, query=q, limit=limit)
+    ]
+
 @router.get("/{gene_name}", response_model=gene_schemas.Gene) # Updated response_model
-def read_gene_by_name(gene_name: str, db: Session = Depends(get_db)):
+def read_gene_by_name(gene_name: str, db: Session = Depends(get_read_db)):
     """
     Retrieve a single gene by its exact name.
     """
@@ -0,0 +1,35 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from ...schemas.region import RegionResponse
+from ...crud import crud_region
+from ...utils.regions import parse_region
+from ..dependencies import get_read_db
+
+router = APIRouter()
+
+@router.get("/{region}", response_model=RegionResponse)
+def read_region(
+    region: str,
+    types: Optional[List[str]] = Query(None, description="Feature types to return; all when omitted"),
+    limit: int = Query(1000, ge=1, le=100000, description="Maximum features per type"),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Retrieve the features overlapping a region such as chr7:55,000,000-55,200,000.
+    """
+    try:
+        chromosome, start, end = parse_region(region)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    feature_types = types or list(crud_region.REGION_FEATURE_TYPES)
+    unknown = [t for t in feature_types if t not in crud_region.REGION_FEATURE_TYPES]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown feature types: {', '.join(unknown)}")
+
+    chromosome_id = crud_region.get_chromosome_id(db, chromosome)
+    if chromosome_id is None:
+        raise HTTPException(status_code=404, detail="Chromosome not found")
+    features = crud_region.get_features_in_region(db, chromosome_id, start, end, feature_types, limit=limit)
+    return RegionResponse(chromosome=chromosome, start=start, end=end, features=features)
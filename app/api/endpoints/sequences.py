@@ -0,0 +1,45 @@
+from typing import Iterator, List
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from ...schemas.sequence import SequenceBatchRequest
+from ...db.session import get_read_session_local
+from ...services.sequence_store import get_sequence_store
+from ...services.sequence_extraction import SequenceInterval, extract_sequences, format_fasta
+from ..dependencies import get_read_db
+
+router = APIRouter()
+
+def _stream_fasta(intervals: List[SequenceInterval], line_width: int, soft_mask: bool) -> Iterator[bytes]:
+    # As for /chromosomes/{name}/sequence, the stream reads through a session of its own
+    db = get_read_session_local()()
+    try:
+        records = extract_sequences(get_sequence_store(db), intervals, soft_mask=soft_mask)
+        for interval, sequence in records:
+            yield format_fasta(interval, sequence, line_width).encode("ascii")
+    finally:
+        db.close()
+
+@router.post("/batch")
+def extract_sequence_batch(request: SequenceBatchRequest, db: Session = Depends(get_read_db)):
+    """
+    Stream the sequences of many BED-like intervals as FASTA, reverse
+    complemented on the minus strand. Records come chromosome by chromosome
+    and sorted by start; each header names its interval.
+    """
+    intervals = [SequenceInterval(i.chromosome, i.start, i.end, i.name, i.strand) for i in request.intervals]
+    store = get_sequence_store(db)
+    lengths = {}
+    for chromosome_name in dict.fromkeys(i.chromosome for i in intervals):
+        handle = store.open(chromosome_name)
+        if handle is None:
+            raise HTTPException(status_code=404, detail=f"Sequence not available for chromosome {chromosome_name}")
+        handle.close()
+        lengths[chromosome_name] = handle.length
+    for i in intervals:
+        if i.start >= i.end or i.end > lengths[i.chromosome]:
+            raise HTTPException(status_code=400, detail=f"Invalid interval {i.chromosome}:{i.start}-{i.end} (length {lengths[i.chromosome]})")
+
+    body = _stream_fasta(intervals, request.line_width, request.soft_mask)
+    return StreamingResponse(body, media_type="text/x-fasta")
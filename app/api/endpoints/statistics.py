@@ -1,13 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from ...schemas.statistic import Statistic
-from ..dependencies import get_db
+from ...schemas.statistic import Statistic, StatisticResult
+from ..dependencies import get_read_db
 from ...crud import crud_statistic # Import the new crud_statistic
 
 router = APIRouter()
 
 @router.get("/{stat_name}", response_model=Statistic)
-def get_statistic(stat_name: str, db: Session = Depends(get_db)):
+def get_statistic(stat_name: str, db: Session = Depends(get_read_db)):
     """
     Retrieve a specific genome statistic by name.
     """
@@ -15,4 +16,26 @@ def get_statistic(stat_name: str, db: Session = Depends(get_db)):
     stat = crud_statistic.get_statistic_by_name(db=db, stat_name=stat_name)
     if stat is None:
         raise HTTPException(status_code=404, detail="Statistic not found")
-    return stat
\ No newline at end of file
+    return stat
+
+@router.get("/{stat_name}/results", response_model=List[StatisticResult])
+def get_statistic_results(
+    stat_name: str,
+    chromosome: Optional[str] = None,
+    type: Optional[str] = None,
+    start: Optional[int] = Query(None, ge=1),
+    end: Optional[int] = Query(None, ge=1),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=10000),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Page through the rows of a list-shaped statistic (e.g. nested gene pairs),
+    optionally filtered by chromosome, feature type and an overlapping range.
+    """
+    if crud_statistic.get_statistic_by_name(db=db, stat_name=stat_name) is None:
+        raise HTTPException(status_code=404, detail="Statistic not found")
+    return crud_statistic.get_statistic_results(
+        db, stat_name, chromosome_name=chromosome, feature_type=type,
+        start=start, end=end, skip=skip, limit=limit,
+    )
@@ -0,0 +1,27 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from ...schemas import ssr as ssr_schemas
+from ...crud import crud_tandem_repeat
+from ..dependencies import get_read_db
+
+router = APIRouter()
+
+@router.get("/", response_model=List[ssr_schemas.TandemRepeat])
+def read_tandem_repeats(
+    chromosome: Optional[str] = None,
+    period: Optional[int] = Query(None, ge=1, le=6),
+    motif: Optional[str] = None,
+    min_copies: Optional[int] = Query(None, ge=1),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=10000),
+    db: Session = Depends(get_read_db),
+):
+    """
+    List perfect microsatellites (periods 1-6) found by the sequence scanner.
+    """
+    return crud_tandem_repeat.get_tandem_repeats(
+        db, chromosome_name=chromosome, period=period, motif=motif,
+        min_copies=min_copies, skip=skip, limit=limit,
+    )
@@ -4,12 +4,12 @@ from typing import List
 
 from ...schemas.telomere import TelomeresResponse, TelomereSequenceResponse
 from ...crud import crud_telomere
-from ..dependencies import get_db
+from ..dependencies import get_read_db
 
 router = APIRouter()
 
 @router.get("/{chromosome_name}/sequence", response_model=TelomeresResponse)
-def get_telomere_sequences_endpoint(chromosome_name: str, db: Session = Depends(get_db)):
+def get_telomere_sequences_endpoint(chromosome_name: str, db: Session = Depends(get_read_db)):
     """
     Retrieve the sequences of all telomeres for a given chromosome.
     """
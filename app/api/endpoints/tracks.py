@@ -0,0 +1,38 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from ...schemas.profile_track import TrackSlice
+from ...crud import crud_profile_track
+from ...models.profile_track import PROFILE_TRACKS, PROFILE_WINDOWS
+from ..dependencies import get_read_db
+
+router = APIRouter()
+
+@router.get("/{track}/{chromosome_name}", response_model=TrackSlice)
+def read_track(
+    track: str,
+    chromosome_name: str,
+    window: int = Query(100_000, description=f"Window size, one of {', '.join(map(str, PROFILE_WINDOWS))}"),
+    start: Optional[int] = Query(None, ge=1, description="First position (1-based) of the slice"),
+    end: Optional[int] = Query(None, ge=1, description="Last position (1-based) of the slice"),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Retrieve a precomputed sequence profile track (gc_content, gc_skew,
+    cumulative_gc_skew, cpg_oe or entropy), optionally only the windows covering start..end.
+    """
+    if track not in PROFILE_TRACKS:
+        raise HTTPException(status_code=404, detail="Track not found")
+    if window not in PROFILE_WINDOWS:
+        raise HTTPException(status_code=400, detail=f"Window must be one of {', '.join(map(str, PROFILE_WINDOWS))}")
+    first_bin = (start - 1) // window if start is not None else 0
+    last_bin = (end - 1) // window if end is not None else None
+    result = crud_profile_track.get_track_slice(db, track, chromosome_name, window, first_bin, last_bin)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Track not found")
+    total_bins, first_bin, values = result
+    return TrackSlice(
+        track=track, chromosome=chromosome_name, window=window,
+        total_bins=total_bins, first_bin=first_bin, values=values,
+    )
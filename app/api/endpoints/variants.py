@@ -8,6 +8,10 @@ from ..dependencies import get_db
 
 router = APIRouter()
 
+# Variants are written by users rather than built by the pipeline, so they
+# live in the writable database (SQLALCHEMY_DATABASE_URL), never in a release:
+# every variant endpoint, reads included, goes through get_db.
+
 @router.post("/", response_model=variant_schemas.VariantOut, status_code=status.HTTP_201_CREATED)
 def create_variant(variant: variant_schemas.VariantCreate, db: Session = Depends(get_db)):
     db_variant = crud_variant.get_variant_by_rsid(db, rsid=variant.rsid)
@@ -1,10 +1,46 @@
 import os
+from typing import Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     SQLALCHEMY_DATABASE_URL: str = "sqlite:///genome_guides.db"
     CORS_ORIGINS: list[str] = ["http://localhost:3000", "http://127.0.0.1:3000"]
 
+    # Pragma profile of the read-write SQLite engine (see app/db/session.py):
+    # "default", or "bulk_load" for the pipeline's loaders (no fsync per commit)
+    SQLITE_PROFILE: Literal["default", "bulk_load"] = "default"
+    # Memory-mapped I/O, page cache and lock wait of every SQLite connection
+    SQLITE_MMAP_SIZE: int = 1024 ** 3
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024
+    SQLITE_BUSY_TIMEOUT_MS: int = 30_000
+
+    # Versioned release bundles (see app/db/releases.py). When RELEASES_DIR
+    # holds a published release, the API reads from <RELEASES_DIR>/current;
+    # publishing keeps the RELEASES_KEEP most recent releases
+    RELEASES_DIR: str = "releases"
+    RELEASES_KEEP: int = 3
+
+    # Where chromosome sequences are served from: the packed blobs in the
+    # database, or a memory-mapped (plain or bgzip) FASTA file with a .fai index
+    SEQUENCE_BACKEND: Literal["database", "fasta"] = "database"
+    FASTA_PATH: str = "uploads/hg38.fa"
+
+    # Number of bases the sequence scanner reads and feeds to the analysis
+    # accumulators at a time; bounds the memory of each scan worker
+    SEQUENCE_SCAN_WINDOW: int = 1024 * 1024
+
+    # Minimum number of complete motif copies for a perfect tandem repeat of
+    # each period (1-6) to be reported; periods left out are not scanned
+    SSR_MIN_COPIES: dict[int, int] = {1: 10, 2: 4, 3: 3, 4: 3, 5: 3, 6: 3}
+
+    # Parquet snapshots of the feature tables that the analyses read their
+    # inputs from (see utils/feature_snapshots.py)
+    FEATURE_SNAPSHOT_DIR: str = "analysis/snapshots"
+
+    # Engine of the aggregation-heavy statistics: DuckDB over the feature
+    # snapshots (when duckdb is installed), or SQLite itself
+    ANALYTICS_ENGINE: Literal["duckdb", "sqlite"] = "duckdb"
+
     model_config = SettingsConfigDict(env_file=os.getenv("ENV_FILE", ".env"))
 
 _settings = None
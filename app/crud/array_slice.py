@@ -0,0 +1,23 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+def read_array_slice(db: Session, id_column, row_id: int, columns, dtype, total_bins: int,
+                     first_bin: int = 0, last_bin: Optional[int] = None) -> Tuple[int, List[np.ndarray]]:
+    """
+    Read bins first_bin..last_bin (inclusive, clamped to total_bins) of the
+    arrays stored as blobs in `columns` of one row, without loading the rest
+    of them. Returns (first_bin, [array per column]).
+    """
+    item_size = np.dtype(dtype).itemsize
+    first_bin = min(max(first_bin, 0), total_bins)
+    last_bin = total_bins - 1 if last_bin is None else min(last_bin, total_bins - 1)
+    count = max(0, last_bin - first_bin + 1)
+
+    # SQLite substr() on a blob works in bytes, 1-based
+    offset, size = first_bin * item_size + 1, count * item_size
+    blobs = db.query(*(func.substr(column, offset, size) for column in columns))\
+        .filter(id_column == row_id).one()
+    return first_bin, [np.frombuffer(blob or b"", dtype=dtype) for blob in blobs]
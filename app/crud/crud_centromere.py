@@ -1,6 +1,6 @@
 from sqlalchemy.orm import Session
 from ..models.centromere import Centromere
-from ..models.chromosome import Chromosome
+from .crud_chromosome import get_subsequence
 from typing import Optional
 
 def get_centromere_by_chromosome_name(db: Session, chromosome_name: str) -> Optional[Centromere]:
@@ -17,14 +17,10 @@ def get_centromere_sequence(db: Session, chromosome_name: str) -> Optional[str]:
     if not centromere:
         return None
     
-    chromosome = db.query(Chromosome).filter(Chromosome.name == chromosome_name).first()
-    if not chromosome or not chromosome.sequence:
-        return None
-    
     # Extract the centromere sequence based on its start and end positions
     # Adjust for 0-based indexing if necessary (database typically stores 1-based)
     # Assuming start_position and end_position are 1-based inclusive
     start_idx = centromere.start_position - 1
     end_idx = centromere.end_position # end_position is inclusive in 1-based, slicing is exclusive for end.
     
-    return chromosome.sequence[start_idx:end_idx]
\ No newline at end of file
+    return get_subsequence(db, chromosome_name, start_idx, end_idx)
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from ..models import chromosome as model
-from typing import List, Tuple
+from ..services.sequence_store import get_sequence_store
+from typing import List, Optional, Tuple
 
 def get_chromosomes(db: Session, skip: int = 0, limit: int = 100):
     """
@@ -12,4 +13,11 @@ def get_chromosome_lengths(db: Session) -> List[Tuple[str, int]]:
     """
     Retrieve all chromosome names and their lengths from the database.
     """
-    return db.query(model.Chromosome.name, model.Chromosome.length).all()
\ No newline at end of file
+    return db.query(model.Chromosome.name, model.Chromosome.length).all()
+
+def get_subsequence(db: Session, chromosome_name: str, start: int, end: int, soft_mask: bool = True) -> Optional[str]:
+    """
+    Retrieve the 0-based, half-open region [start, end) of a chromosome.
+    Only the stored bytes covering the region are read, never the whole sequence.
+    """
+    return get_sequence_store(db).fetch(chromosome_name, start, end, soft_mask=soft_mask)
@@ -0,0 +1,25 @@
+from typing import Optional
+
+from sqlalchemy.orm import Session
+from ..models.chromosome import Chromosome
+from ..models.feature_density import FeatureDensity, DENSITY_DTYPE
+from .array_slice import read_array_slice
+
+def get_density_slice(db: Session, feature: str, chromosome_name: str, resolution: int,
+                      first_bin: int = 0, last_bin: Optional[int] = None):
+    """
+    Retrieve bins first_bin..last_bin (inclusive, clamped to the chromosome) of
+    a density level as (total_bins, first_bin, counts, coverage). Only the
+    requested slice of the stored arrays is read. Returns None if the level is missing.
+    """
+    row = db.query(FeatureDensity.id, FeatureDensity.bin_count)\
+        .join(Chromosome, FeatureDensity.chromosome_id == Chromosome.id)\
+        .filter(FeatureDensity.feature == feature, Chromosome.name == chromosome_name,
+                FeatureDensity.resolution == resolution).first()
+    if row is None:
+        return None
+    density_id, total_bins = row
+    first_bin, (counts, coverage) = read_array_slice(
+        db, FeatureDensity.id, density_id, (FeatureDensity.counts, FeatureDensity.coverage),
+        DENSITY_DTYPE, total_bins, first_bin, last_bin)
+    return total_bins, first_bin, counts.tolist(), coverage.tolist()
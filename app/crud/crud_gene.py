@@ -1,5 +1,13 @@
+from typing import List
+
+from sqlalchemy import collate, text
 from sqlalchemy.orm import Session, joinedload
+from ..db.gene_search import GENE_SEARCH_TABLE, MIN_SUBSTRING_LENGTH, fts_phrase
 from ..models import gene as model_gene
+from ..models.chromosome import Chromosome
+
+# Appended to a prefix, sorts after every string starting with it
+_PREFIX_END = "\U0010ffff"
 
 def get_gene_by_name(db: Session, gene_name: str):
     """
@@ -7,8 +15,57 @@ def get_gene_by_name(db: Session, gene_name: str):
     """
     return db.query(model_gene.Gene).options(joinedload(model_gene.Gene.chromosome)).filter(model_gene.Gene.gene_name == gene_name).first()
 
+def _ranked_gene_ids(db: Session, query: str, limit: int, substring: bool) -> List[int]:
+    """
+    Ids of up to `limit` genes whose name or Ensembl id matches `query`
+    case-insensitively: exact matches first, then prefix matches in name order,
+    then (if `substring`) other substring matches. Every tier is an index lookup.
+    """
+    Gene = model_gene.Gene
+    ranked = []
+
+    def _add(ids):
+        for gene_id in ids:
+            if len(ranked) == limit:
+                return
+            if gene_id not in ranked:
+                ranked.append(gene_id)
+
+    for column in (Gene.gene_name, Gene.gene_id):
+        _add(gene_id for gene_id, in db.query(Gene.id).filter(collate(column, "NOCASE") == query).limit(limit))
+    for column in (Gene.gene_name, Gene.gene_id):
+        nocase = collate(column, "NOCASE")
+        _add(gene_id for gene_id, in db.query(Gene.id)
+             .filter(nocase >= query, nocase < query + _PREFIX_END)
+             .order_by(nocase).limit(limit))
+    if substring and len(query) >= MIN_SUBSTRING_LENGTH and len(ranked) < limit:
+        _add(gene_id for gene_id, in db.execute(
+            text(f"SELECT rowid FROM {GENE_SEARCH_TABLE} WHERE {GENE_SEARCH_TABLE} MATCH :phrase LIMIT :limit"),
+            {"phrase": fts_phrase(query), "limit": limit + len(ranked)},
+        ))
+    return ranked
+
 def search_genes_by_name(db: Session, query: str, limit: int = 10):
     """
-    Search for genes and also load their related chromosome data.
+    Search for genes by name or Ensembl id, ranked exact, then prefix, then
+    substring matches, and also load their related chromosome data.
+    """
+    ids = _ranked_gene_ids(db, query, limit, substring=True)
+    if not ids:
+        return []
+    genes = db.query(model_gene.Gene).options(joinedload(model_gene.Gene.chromosome)).filter(model_gene.Gene.id.in_(ids)).all()
+    rank = {gene_id: i for i, gene_id in enumerate(ids)}
+    return sorted(genes, key=lambda gene: rank[gene.id])
+
+def autocomplete_genes(db: Session, query: str, limit: int = 10):
+    """
+    Exact and prefix matches for typeahead, as (gene_id, gene_name, chromosome, start, end) rows.
     """
-    return db.query(model_gene.Gene).options(joinedload(model_gene.Gene.chromosome)).filter(model_gene.Gene.gene_name.ilike(f"%{query}%")).limit(limit).all()
\ No newline at end of file
+    ids = _ranked_gene_ids(db, query, limit, substring=False)
+    if not ids:
+        return []
+    Gene = model_gene.Gene
+    rows = db.query(Gene.id, Gene.gene_id, Gene.gene_name, Chromosome.name, Gene.start_pos, Gene.end_pos)\
+        .join(Chromosome, Gene.chromosome_id == Chromosome.id).filter(Gene.id.in_(ids)).all()
+    rank = {gene_id: i for i, gene_id in enumerate(ids)}
+    return [row[1:] for row in sorted(rows, key=lambda row: rank[row[0]])]
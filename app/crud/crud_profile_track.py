@@ -0,0 +1,27 @@
+from typing import Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+from ..models.chromosome import Chromosome
+from ..models.profile_track import ProfileTrack, PROFILE_DTYPE
+from .array_slice import read_array_slice
+
+def get_track_slice(db: Session, track: str, chromosome_name: str, window: int,
+                    first_bin: int = 0, last_bin: Optional[int] = None):
+    """
+    Retrieve windows first_bin..last_bin (inclusive, clamped to the chromosome)
+    of a profile track as (total_bins, first_bin, values), with None for
+    undefined values. Only the requested slice of the stored array is read.
+    Returns None if the track is missing.
+    """
+    row = db.query(ProfileTrack.id, ProfileTrack.bin_count)\
+        .join(Chromosome, ProfileTrack.chromosome_id == Chromosome.id)\
+        .filter(ProfileTrack.track == track, Chromosome.name == chromosome_name,
+                ProfileTrack.window_size == window).first()
+    if row is None:
+        return None
+    track_id, total_bins = row
+    first_bin, (values,) = read_array_slice(
+        db, ProfileTrack.id, track_id, (ProfileTrack.data,), PROFILE_DTYPE, total_bins, first_bin, last_bin)
+    values = values.astype(np.float64)
+    return total_bins, first_bin, [None if np.isnan(v) else round(v, 6) for v in values.tolist()]
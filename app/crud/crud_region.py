@@ -0,0 +1,44 @@
+from typing import Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from ..db.rtree import rtree_name
+from ..models.chromosome import Chromosome
+
+# Per feature type: indexed table and the columns returned as
+# (id, start_pos, end_pos, name, strand); "f" is the feature table
+REGION_FEATURE_TYPES = {
+    "genes": ("genes", "f.id, f.start_pos, f.end_pos, COALESCE(f.gene_name, f.gene_id), f.strand", ""),
+    "exons": (
+        "exons",
+        "f.id, f.start_pos, f.end_pos, t.transcript_id, NULL",
+        "LEFT JOIN transcripts t ON t.id = f.transcript_id",
+    ),
+    "cpg_islands": ("cpg_islands", "f.id, f.start_pos, f.end_pos, f.name, NULL", ""),
+    "non_coding_rnas": ("non_coding_rnas", "f.id, f.start_pos, f.end_pos, f.rna_name, f.strand", ""),
+}
+
+def get_chromosome_id(db: Session, chromosome_name: str):
+    return db.query(Chromosome.id).filter(Chromosome.name == chromosome_name).scalar()
+
+def get_features_in_region(db: Session, chromosome_id: int, start: int, end: int,
+                           feature_types: List[str], limit: int = 1000) -> Dict[str, List[dict]]:
+    """
+    Retrieve up to `limit` features of each type overlapping [start, end]
+    (1-based, inclusive) through the tables' R*Tree indexes, in start order.
+    """
+    results = {}
+    for feature_type in feature_types:
+        table, columns, join = REGION_FEATURE_TYPES[feature_type]
+        rows = db.execute(text(
+            f"SELECT {columns} FROM {rtree_name(table)} r "
+            f"JOIN {table} f ON f.id = r.id {join} "
+            "WHERE r.min_chromosome_id <= :chromosome_id AND r.max_chromosome_id >= :chromosome_id "
+            "AND r.start_pos <= :end AND r.end_pos >= :start "
+            "ORDER BY f.start_pos, f.id LIMIT :limit"
+        ), {"chromosome_id": chromosome_id, "start": start, "end": end, "limit": limit}).all()
+        results[feature_type] = [
+            {"id": row[0], "start_pos": row[1], "end_pos": row[2], "name": row[3], "strand": row[4]}
+            for row in rows
+        ]
+    return results
@@ -1,5 +1,35 @@
-from sqlalchemy.orm import Session
-from ..models.statistic import GenomeStatistic
+from typing import Optional
+
+from sqlalchemy.orm import Session, joinedload
+from ..models.chromosome import Chromosome
+from ..models.statistic import GenomeStatistic, GenomeStatisticResult
 
 def get_statistic_by_name(db: Session, stat_name: str):
-    return db.query(GenomeStatistic).filter(GenomeStatistic.stat_name == stat_name).first()
\ No newline at end of file
+    return db.query(GenomeStatistic).filter(GenomeStatistic.stat_name == stat_name).first()
+
+def get_statistic_results(
+    db: Session,
+    stat_name: str,
+    chromosome_name: Optional[str] = None,
+    feature_type: Optional[str] = None,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100,
+):
+    """
+    Retrieve the result rows of a statistic in coordinate order. start/end keep
+    the rows overlapping that 1-based, inclusive range.
+    """
+    query = db.query(GenomeStatisticResult).options(joinedload(GenomeStatisticResult.chromosome))\
+        .filter(GenomeStatisticResult.stat_name == stat_name)
+    if chromosome_name is not None:
+        query = query.join(GenomeStatisticResult.chromosome).filter(Chromosome.name == chromosome_name)
+    if feature_type is not None:
+        query = query.filter(GenomeStatisticResult.feature_type == feature_type)
+    if start is not None:
+        query = query.filter(GenomeStatisticResult.end_pos >= start)
+    if end is not None:
+        query = query.filter(GenomeStatisticResult.start_pos <= end)
+    query = query.order_by(GenomeStatisticResult.chromosome_id, GenomeStatisticResult.start_pos, GenomeStatisticResult.id)
+    return query.offset(skip).limit(limit).all()
@@ -0,0 +1,30 @@
+from typing import Optional
+
+from sqlalchemy.orm import Session, joinedload
+from ..models.chromosome import Chromosome
+from ..models.tandem_repeat import TandemRepeat
+
+def get_tandem_repeats(
+    db: Session,
+    chromosome_name: Optional[str] = None,
+    period: Optional[int] = None,
+    motif: Optional[str] = None,
+    min_copies: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100,
+):
+    """
+    Retrieve tandem repeats in coordinate order, optionally filtered by
+    chromosome, period, motif and minimum copy number.
+    """
+    query = db.query(TandemRepeat).options(joinedload(TandemRepeat.chromosome))
+    if chromosome_name is not None:
+        query = query.join(TandemRepeat.chromosome).filter(Chromosome.name == chromosome_name)
+    if period is not None:
+        query = query.filter(TandemRepeat.period == period)
+    if motif is not None:
+        query = query.filter(TandemRepeat.motif == motif.upper())
+    if min_copies is not None:
+        query = query.filter(TandemRepeat.copy_number >= min_copies)
+    query = query.order_by(TandemRepeat.chromosome_id, TandemRepeat.start_pos)
+    return query.offset(skip).limit(limit).all()
@@ -1,6 +1,6 @@
 from sqlalchemy.orm import Session
 from ..models.telomere import Telomere
-from ..models.chromosome import Chromosome
+from ..services.sequence_store import get_sequence_store
 from typing import List, Optional
 
 def get_telomeres_by_chromosome_name(db: Session, chromosome_name: str) -> List[Telomere]:
@@ -18,21 +18,22 @@ def get_telomere_sequences(db: Session, chromosome_name: str) -> List[dict]:
     if not telomere_records:
         return []
     
-    chromosome = db.query(Chromosome).filter(Chromosome.name == chromosome_name).first()
-    if not chromosome or not chromosome.sequence:
+    handle = get_sequence_store(db).open(chromosome_name)
+    if handle is None:
         return []
     
     results = []
-    for telomere in telomere_records:
-        start_idx = telomere.start_position - 1
-        end_idx = telomere.end_position 
-        
-        sequence = chromosome.sequence[start_idx:end_idx]
-        results.append({
-            "chromosome_name": telomere.chromosome_name,
-            "start_position": telomere.start_position,
-            "end_position": telomere.end_position,
-            "length": telomere.length,
-            "sequence": sequence
-        })
+    with handle:
+        for telomere in telomere_records:
+            start_idx = telomere.start_position - 1
+            end_idx = telomere.end_position 
+            
+            sequence = handle.read(start_idx, end_idx)
+            results.append({
+                "chromosome_name": telomere.chromosome_name,
+                "start_position": telomere.start_position,
+                "end_position": telomere.end_position,
+                "length": telomere.length,
+                "sequence": sequence
+            })
     return results
\ No newline at end of file
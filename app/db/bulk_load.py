@@ -0,0 +1,85 @@
+"""
+    Deferred index maintenance for bulk loads.
+
+    Inserting millions of rows into a table with secondary indexes updates
+    every index row by row, in random B-tree order; building an index once
+    the rows are in sorts them in a single pass instead. deferred_indexes()
+    drops the non-unique indexes of the tables being loaded (and the triggers
+    feeding their R*Tree, see app/db/rtree.py), lets the loader insert, then
+    recreates the indexes, refills the R*Trees and runs ANALYZE so the query
+    planner sees statistics of the loaded data. It also bumps the load
+    generation of each table (table_loads), which data derived from the
+    tables compare against to detect a reload.
+
+    Unique indexes are kept: they enforce constraints the loaders rely on
+    (e.g. genes.gene_id). The index definitions come from the models, so
+    there is a single source of truth for the index set.
+    """
+from contextlib import contextmanager
+from typing import List
+
+from sqlalchemy import Index, Table
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateIndex
+
+from ..models.table_load import TableLoad
+from .rtree import drop_rtree_triggers_ddl, rtree_ddl
+
+
+def secondary_indexes(table: Table) -> List[Index]:
+    """The indexes of `table` that may be dropped during a bulk load."""
+    return sorted((index for index in table.indexes if not index.unique), key=lambda index: index.name)
+
+
+def drop_secondary_indexes(db: Session, *tables: Table):
+    connection = db.connection()
+    for table in tables:
+        for index in secondary_indexes(table):
+            connection.exec_driver_sql(f'DROP INDEX IF EXISTS "{index.name}"')
+        if "rtree_chromosome_sql" in table.info:
+            for statement in drop_rtree_triggers_ddl(table.name):
+                connection.exec_driver_sql(statement)
+
+
+def build_secondary_indexes(db: Session, *tables: Table):
+    """Creates the missing indexes and R*Tree triggers of `tables` and analyzes them."""
+    connection = db.connection()
+    for table in tables:
+        for index in secondary_indexes(table):
+            connection.execute(CreateIndex(index, if_not_exists=True))
+        if "rtree_chromosome_sql" in table.info:
+            for statement in rtree_ddl(table.name, table.info["rtree_chromosome_sql"]):
+                connection.exec_driver_sql(statement)
+        connection.exec_driver_sql(f'ANALYZE "{table.name}"')
+
+
+def bump_load_generation(db: Session, *tables: Table):
+    """Records that `tables` have been (re)loaded."""
+    connection = db.connection()
+    for table in tables:
+        connection.exec_driver_sql(
+            f"INSERT INTO {TableLoad.__tablename__} (table_name, generation) VALUES (?, 1) "
+            "ON CONFLICT (table_name) DO UPDATE SET generation = generation + 1",
+            (table.name,),
+        )
+
+
+@contextmanager
+def deferred_indexes(db: Session, *tables: Table):
+    """
+    Drops the secondary indexes of `tables` for the duration of the block and
+    rebuilds them at the end, committing, whether the block succeeded or not.
+    Either way the tables have changed, so their load generation is bumped.
+    """
+    drop_secondary_indexes(db, *tables)
+    db.commit()
+    try:
+        yield
+    except BaseException:
+        db.rollback()
+        raise
+    finally:
+        print(f"  Building indexes of {', '.join(table.name for table in tables)}...")
+        build_secondary_indexes(db, *tables)
+        bump_load_generation(db, *tables)
+        db.commit()
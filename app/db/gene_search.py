@@ -0,0 +1,48 @@
+"""
+    Full-text index over gene names and Ensembl ids for substring search.
+
+    ``gene_search`` is an external-content FTS5 table over genes(gene_name,
+    gene_id) using the trigram tokenizer, so any substring of three or more
+    characters is an index lookup, case-insensitively. The GTF ingest rebuilds
+    it once all genes are in; a bulk rebuild is several times faster than
+    keeping it in step row by row with triggers.
+    Exact and prefix matches are answered from the NOCASE indexes on the genes
+    table itself (see app/models/gene.py and app/crud/crud_gene.py).
+    """
+from typing import List
+
+from sqlalchemy import DDL, Table, event
+
+GENE_SEARCH_TABLE = "gene_search"
+
+# Trigram queries need at least this many characters
+MIN_SUBSTRING_LENGTH = 3
+
+# Re-reads every gene; run after loading genes (scripts/parse_gtf.py)
+REBUILD_GENE_SEARCH = f"INSERT INTO {GENE_SEARCH_TABLE}({GENE_SEARCH_TABLE}) VALUES ('rebuild')"
+
+
+def gene_search_ddl() -> List[str]:
+    """Statements creating the search index and (re)building it from the genes table."""
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {GENE_SEARCH_TABLE} USING fts5("
+        "gene_name, gene_id, content='genes', content_rowid='id', tokenize='trigram')",
+        REBUILD_GENE_SEARCH,
+    ]
+
+
+def drop_gene_search_ddl() -> List[str]:
+    return [f"DROP TABLE IF EXISTS {GENE_SEARCH_TABLE}"]
+
+
+def fts_phrase(query: str) -> str:
+    """Quotes a user query as one FTS5 phrase, so its punctuation is matched literally."""
+    return '"' + query.replace('"', '""') + '"'
+
+
+def attach_gene_search(table: Table):
+    """Creates and drops the search index together with the genes table (SQLite only)."""
+    for statement in gene_search_ddl():
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    for statement in drop_gene_search_ddl():
+        event.listen(table, "after_drop", DDL(statement).execute_if(dialect="sqlite"))
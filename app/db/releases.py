@@ -0,0 +1,206 @@
+"""
+    Immutable, versioned release bundles of the serving data.
+
+    The pipeline builds each release into a directory of its own,
+    <RELEASES_DIR>/<release>/: the database, the Parquet feature snapshots
+    and, with the FASTA sequence backend, the FASTA and its indexes. Once the
+    analyses are done, scripts/publish_release.py finalizes the bundle (a
+    single self-contained database file, no WAL), validates it, writes a
+    manifest and atomically repoints the <RELEASES_DIR>/current symlink.
+
+    A published bundle is never written again, so API workers open it
+    read-only and immutable and pick up a new release on their next request
+    (see app/db/session.get_read_engine); requests already running keep
+    reading the previous bundle, which stays on disk until pruned. A bundle
+    directory can be copied as is to another serving node and published
+    there with the same script.
+    """
+import json
+import os
+import shutil
+import sqlite3
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+RELEASE_DATABASE = "genome_guides.db"
+RELEASE_MANIFEST = "release.json"
+CURRENT = "current"
+
+# Snakemake markers of a build; not part of the bundle
+BUILD_DIR = ".build"
+
+# FASTA and index files of a release built with SEQUENCE_BACKEND=fasta
+SEQUENCE_DIR = "sequence"
+SEQUENCE_INDEX_SUFFIXES = (".fai", ".gzi")
+
+# Tables a release cannot be served without, and that must not be empty
+REQUIRED_TABLES = ("chromosomes", "genes", "genome_stats")
+
+
+def release_database_url(release_dir: str) -> str:
+    return f"sqlite:///{os.path.abspath(os.path.join(release_dir, RELEASE_DATABASE))}"
+
+
+def database_path(url: str) -> Optional[str]:
+    """File path of a SQLite URL (plain or file: URI), None for other databases."""
+    url = make_url(url)
+    if url.get_backend_name() != "sqlite" or not url.database or url.database == ":memory:":
+        return None
+    return url.database[len("file:"):] if url.database.startswith("file:") else url.database
+
+
+def current_release(releases_dir: str) -> Optional[str]:
+    """The directory `current` points at, if it holds a published release."""
+    release_dir = os.path.realpath(os.path.join(releases_dir, CURRENT))
+    return release_dir if os.path.isfile(os.path.join(release_dir, RELEASE_MANIFEST)) else None
+
+
+def bundle_file(db: Session, relative_path: str) -> Optional[str]:
+    """Path of a file of the release bundle the session's database belongs to, if there is one."""
+    path = database_path(str(db.get_bind().url))
+    if path is None:
+        return None
+    release_dir = os.path.dirname(os.path.abspath(path))
+    candidate = os.path.join(release_dir, relative_path)
+    if os.path.isfile(os.path.join(release_dir, RELEASE_MANIFEST)) and os.path.isfile(candidate):
+        return candidate
+    return None
+
+
+def _bundle_files(release_dir: str) -> Dict[str, int]:
+    """{relative path: size} of every file of the bundle."""
+    files = {}
+    for root, directories, names in os.walk(release_dir):
+        directories[:] = sorted(d for d in directories if d != BUILD_DIR)
+        for name in sorted(names):
+            path = os.path.join(root, name)
+            relative = os.path.relpath(path, release_dir)
+            if relative != RELEASE_MANIFEST:
+                files[relative] = os.path.getsize(path)
+    return files
+
+
+def _link_or_copy(source: str, target: str):
+    try:
+        os.link(source, target)
+    except OSError:  # Other filesystem
+        shutil.copy2(source, target)
+
+
+def finalize_release(release_dir: str, fasta_path: Optional[str] = None):
+    """
+    Turns a finished build into a self-contained bundle: folds the WAL into
+    the database file and leaves WAL mode, refreshes planner statistics, and
+    links in the FASTA and its indexes when given.
+    """
+    connection = sqlite3.connect(os.path.join(release_dir, RELEASE_DATABASE))
+    try:
+        connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        connection.execute("PRAGMA journal_mode = DELETE")
+        connection.execute("PRAGMA optimize")
+    finally:
+        connection.close()
+
+    if fasta_path:
+        sequence_dir = os.path.join(release_dir, SEQUENCE_DIR)
+        os.makedirs(sequence_dir, exist_ok=True)
+        for source in [fasta_path] + [fasta_path + suffix for suffix in SEQUENCE_INDEX_SUFFIXES]:
+            target = os.path.join(sequence_dir, os.path.basename(source))
+            if os.path.isfile(source) and not os.path.exists(target):
+                _link_or_copy(source, target)
+
+
+def validate_release(release_dir: str) -> List[str]:
+    """
+    Problems that keep a bundle from being served (empty when it is valid):
+    a missing or corrupt database, empty required tables, and, for a bundle
+    with a manifest (e.g. one copied from another node), missing or
+    truncated files.
+    """
+    path = os.path.join(release_dir, RELEASE_DATABASE)
+    if not os.path.isfile(path):
+        return [f"{path} does not exist"]
+    problems = []
+    connection = sqlite3.connect(f"file:{os.path.abspath(path)}?mode=ro", uri=True)
+    try:
+        check = connection.execute("PRAGMA quick_check").fetchall()
+        if check != [("ok",)]:
+            problems.append(f"Database check failed: {'; '.join(row[0] for row in check[:5])}")
+        tables = {name for name, in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        for table in REQUIRED_TABLES:
+            if table not in tables:
+                problems.append(f"Table {table} is missing")
+            elif connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] == 0:
+                problems.append(f"Table {table} is empty")
+    except sqlite3.DatabaseError as e:
+        problems.append(f"Database cannot be read: {e}")
+    finally:
+        connection.close()
+
+    manifest_path = os.path.join(release_dir, RELEASE_MANIFEST)
+    if os.path.isfile(manifest_path):
+        with open(manifest_path) as f:
+            expected = json.load(f)["files"]
+        actual = _bundle_files(release_dir)
+        for relative, size in expected.items():
+            if actual.get(relative) != size:
+                problems.append(f"{relative} is missing or has the wrong size")
+    return problems
+
+
+def write_manifest(release_dir: str) -> dict:
+    """Records the bundle's files and makes its database read-only."""
+    manifest = {
+        "release": os.path.basename(os.path.abspath(release_dir)),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "files": _bundle_files(release_dir),
+    }
+    os.chmod(os.path.join(release_dir, RELEASE_DATABASE), 0o444)
+    staging = os.path.join(release_dir, f"{RELEASE_MANIFEST}.tmp")
+    with open(staging, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(staging, os.path.join(release_dir, RELEASE_MANIFEST))
+    return manifest
+
+
+def publish_release(releases_dir: str, release_dir: str):
+    """Points `current` at `release_dir` in a single rename, so readers never see a missing link."""
+    target = os.path.relpath(os.path.abspath(release_dir), os.path.abspath(releases_dir))
+    staging = os.path.join(releases_dir, f"{CURRENT}.tmp-{os.getpid()}")
+    if os.path.lexists(staging):
+        os.remove(staging)
+    os.symlink(target, staging)
+    os.replace(staging, os.path.join(releases_dir, CURRENT))
+
+
+def _release_dirs(releases_dir: str) -> List[str]:
+    if not os.path.isdir(releases_dir):
+        return []
+    return sorted(
+        os.path.join(releases_dir, name) for name in os.listdir(releases_dir)
+        if not os.path.islink(os.path.join(releases_dir, name)) and os.path.isdir(os.path.join(releases_dir, name))
+    )
+
+
+def prune_releases(releases_dir: str, keep: int) -> List[str]:
+    """Removes all but the `keep` most recently finalized releases, never the current one."""
+    current = current_release(releases_dir)
+    published = sorted(
+        (d for d in _release_dirs(releases_dir) if os.path.isfile(os.path.join(d, RELEASE_MANIFEST))),
+        key=lambda d: os.path.getmtime(os.path.join(d, RELEASE_MANIFEST)),
+    )
+    removed = [d for d in published[:-keep] if os.path.realpath(d) != current] if keep > 0 else []
+    for release_dir in removed:
+        shutil.rmtree(release_dir)
+    return removed
+
+
+def remove_unfinished_releases(releases_dir: str) -> List[str]:
+    """Removes the builds that were never published (no manifest)."""
+    removed = [d for d in _release_dirs(releases_dir) if not os.path.isfile(os.path.join(d, RELEASE_MANIFEST))]
+    for release_dir in removed:
+        shutil.rmtree(release_dir)
+    return removed
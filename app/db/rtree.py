@@ -0,0 +1,68 @@
+"""
+    SQLite R*Tree indexes over feature coordinates.
+
+    Each indexed table gets an integer R*Tree ``<table>_rtree`` with one box
+    per row: the chromosome id on the first axis and start_pos..end_pos on the
+    second. Triggers keep it in step with every insert, update and delete on
+    the table, whatever code path writes the rows. A region query then bounds
+    both start and end in one index lookup, which a B-tree over
+    (chromosome_id, start_pos, end_pos) cannot do.
+
+    The R*Tree and triggers are created with their table by create_all() (see
+    attach_rtree_index); the migration adding them fills them for existing rows.
+    """
+from typing import List
+
+from sqlalchemy import DDL, Table, event
+
+
+def rtree_name(table_name: str) -> str:
+    return f"{table_name}_rtree"
+
+
+def rtree_ddl(table_name: str, chromosome_sql: str) -> List[str]:
+    """
+    Statements creating (or refreshing) the R*Tree of `table_name`.
+    `chromosome_sql` yields a row's chromosome id with the row referred to as
+    ``{row}``, e.g. ``{row}.chromosome_id``.
+    """
+    rtree = rtree_name(table_name)
+    new_chromosome = chromosome_sql.format(row="NEW")
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {rtree} USING rtree_i32("
+        "id, min_chromosome_id, max_chromosome_id, start_pos, end_pos)",
+        f"DELETE FROM {rtree}",
+        f"INSERT INTO {rtree} (id, min_chromosome_id, max_chromosome_id, start_pos, end_pos) "
+        f"SELECT id, {chromosome_sql.format(row=table_name)}, {chromosome_sql.format(row=table_name)}, start_pos, end_pos "
+        f"FROM {table_name}",
+        f"CREATE TRIGGER IF NOT EXISTS {rtree}_insert AFTER INSERT ON {table_name} BEGIN "
+        f"INSERT INTO {rtree} (id, min_chromosome_id, max_chromosome_id, start_pos, end_pos) "
+        f"VALUES (NEW.id, {new_chromosome}, {new_chromosome}, NEW.start_pos, NEW.end_pos); END",
+        f"CREATE TRIGGER IF NOT EXISTS {rtree}_update AFTER UPDATE ON {table_name} BEGIN "
+        f"DELETE FROM {rtree} WHERE id = OLD.id; "
+        f"INSERT INTO {rtree} (id, min_chromosome_id, max_chromosome_id, start_pos, end_pos) "
+        f"VALUES (NEW.id, {new_chromosome}, {new_chromosome}, NEW.start_pos, NEW.end_pos); END",
+        f"CREATE TRIGGER IF NOT EXISTS {rtree}_delete AFTER DELETE ON {table_name} BEGIN "
+        f"DELETE FROM {rtree} WHERE id = OLD.id; END",
+    ]
+
+
+def drop_rtree_triggers_ddl(table_name: str) -> List[str]:
+    """Statements dropping the triggers only; rtree_ddl() refills the R*Tree and recreates them."""
+    rtree = rtree_name(table_name)
+    return [f"DROP TRIGGER IF EXISTS {rtree}_{event}" for event in ("insert", "update", "delete")]
+
+
+def drop_rtree_ddl(table_name: str) -> List[str]:
+    rtree = rtree_name(table_name)
+    return [f"DROP TABLE IF EXISTS {rtree}"]
+
+
+def attach_rtree_index(table: Table, chromosome_sql: str = "{row}.chromosome_id"):
+    """Creates and drops the R*Tree of `table` together with the table (SQLite only)."""
+    # Kept for rebuilding the R*Tree after a bulk load (see app/db/bulk_load.py)
+    table.info["rtree_chromosome_sql"] = chromosome_sql
+    for statement in rtree_ddl(table.name, chromosome_sql):
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    for statement in drop_rtree_ddl(table.name):
+        event.listen(table, "after_drop", DDL(statement).execute_if(dialect="sqlite"))
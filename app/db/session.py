@@ -4,24 +4,121 @@
     This module provides functions to get and manage the SQLAlchemy engine and
     session objects, ensuring lazy initialization and proper connection handling.
     It's designed to be the canonical source for database interaction setup.
+
+    SQLite connections are configured on connect from a pragma profile (see
+    SQLITE_PROFILES): the read-write engine uses Settings.SQLITE_PROFILE, and
+    the API reads through a second, pooled engine that opens the database
+    read-only (mode=ro). Writers put the database in WAL mode, so API readers
+    keep reading the last committed state while an ingest writes.
+
+    When Settings.RELEASES_DIR holds a published release (app/db/releases.py),
+    the read engine serves <RELEASES_DIR>/current instead, and moves to a new
+    release as soon as `current` is repointed. The read-write engine always
+    opens SQLALCHEMY_DATABASE_URL, which keeps the tables users write to
+    (variants) across releases.
     """
-from sqlalchemy import create_engine
+import os
+import threading
+from typing import List
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker
 from ..config import get_settings
 from .base_class import Base # Import Base from its own file
+from .releases import current_release, release_database_url
+
+# Pragmas run on every new connection, per profile. All profiles also get
+# the mmap_size, cache_size and busy_timeout from Settings.
+SQLITE_PROFILES = {
+    # WAL: readers never block on the writer; NORMAL is durable at checkpoints
+    "default": {"journal_mode": "WAL", "synchronous": "NORMAL", "temp_store": "MEMORY"},
+    # Pipeline loaders: no fsync per commit (a failed load is rerun from scratch)
+    "bulk_load": {"journal_mode": "WAL", "synchronous": "OFF", "temp_store": "MEMORY"},
+    # API reads; journal_mode is a property of the file, set by the writers
+    "read_only": {"query_only": "ON", "temp_store": "MEMORY"},
+}
 
 # Use a dictionary to store engine and SessionLocal to avoid recreating them unnecessarily
 _SessionLocal = None
 _engine = None
+_ReadSessionLocal = None
+_read_engine = None
+_read_release = None # Release directory the read engine serves, if any
+_read_engine_lock = threading.Lock()
+
+def sqlite_pragmas(profile: str) -> List[str]:
+    settings = get_settings()
+    pragmas = dict(SQLITE_PROFILES[profile])
+    pragmas.update({
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        # Negative cache_size is in KiB rather than pages
+        "cache_size": -settings.SQLITE_CACHE_SIZE_KB,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+    })
+    return [f"PRAGMA {name} = {value}" for name, value in pragmas.items()]
+
+def make_engine(url: str, profile: str, read_only: bool = False, immutable: bool = False, **kwargs) -> Engine:
+    """
+    Creates an engine for `url`, applying the pragmas of `profile` to each new
+    SQLite connection. `read_only` opens a SQLite file with mode=ro, and
+    `immutable` also skips all locking, for files nothing writes to any more.
+    """
+    url = make_url(url)
+    if url.get_backend_name() != "sqlite":
+        return create_engine(url, **kwargs)
+    if read_only and url.database and url.database != ":memory:":
+        query = {"mode": "ro", "uri": "true"}
+        if immutable:
+            query["immutable"] = "1"
+        url = url.set(database=f"file:{os.path.abspath(url.database)}", query=query)
+    engine = create_engine(url, connect_args={"check_same_thread": False}, **kwargs)
+    pragmas = sqlite_pragmas(profile)
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    return engine
 
 def get_engine():
     global _engine
     if _engine is None:
         settings = get_settings()
         print(f"DEBUG: get_engine() creating engine with URL: {settings.SQLALCHEMY_DATABASE_URL}") # Debug print
-        _engine = create_engine(settings.SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+        _engine = make_engine(settings.SQLALCHEMY_DATABASE_URL, settings.SQLITE_PROFILE)
     return _engine
 
+def get_read_engine():
+    """
+    Pooled read-only engine for the API, over the current release when there
+    is one; the read-write engine for an in-memory database.
+    """
+    global _read_engine, _read_release, _ReadSessionLocal
+    settings = get_settings()
+    release = current_release(settings.RELEASES_DIR)
+    if _read_engine is not None and release == _read_release:
+        return _read_engine
+    with _read_engine_lock:
+        if _read_engine is None or release != _read_release:
+            previous = _read_engine
+            url = settings.SQLALCHEMY_DATABASE_URL
+            database = make_url(url).database
+            if release is not None:
+                engine = make_engine(release_database_url(release), "read_only", read_only=True, immutable=True)
+            elif not database or database == ":memory:":
+                engine = get_engine()
+            else:
+                engine = make_engine(url, "read_only", read_only=True)
+            _read_engine, _read_release, _ReadSessionLocal = engine, release, None
+            # Connections still checked out finish their requests on the old release
+            if previous is not None and previous is not _engine:
+                previous.dispose()
+    return _read_engine
+
 def get_session_local():
     global _SessionLocal
     engine = get_engine()
@@ -29,6 +126,13 @@ def get_session_local():
         _SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     return _SessionLocal
 
+def get_read_session_local():
+    global _ReadSessionLocal
+    engine = get_read_engine()
+    if _ReadSessionLocal is None or _ReadSessionLocal.kw["bind"] is not engine:
+        _ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    return _ReadSessionLocal
+
 def get_db():
     """
     FastAPI dependency that yields a new SQLAlchemy session.
@@ -43,6 +147,11 @@ def get_db():
 
 def reset_db_connection():
     """Resets the global engine and SessionLocal instances."""
-    global _engine, _SessionLocal
+    global _engine, _SessionLocal, _read_engine, _ReadSessionLocal, _read_release
+    for engine in {_engine, _read_engine} - {None}:
+        engine.dispose()
     _engine = None
-    _SessionLocal = None
\ No newline at end of file
+    _SessionLocal = None
+    _read_engine = None
+    _ReadSessionLocal = None
+    _read_release = None
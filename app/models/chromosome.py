@@ -1,5 +1,9 @@
-from sqlalchemy import Column, Integer, String, Text
+from typing import Optional
+
+from sqlalchemy import Column, Integer, String, LargeBinary, ForeignKey
+from sqlalchemy.orm import relationship, deferred
 from ..db.base_class import Base
+from ..utils import twobit
 
 class Chromosome(Base):
     __tablename__ = "chromosomes"
@@ -7,4 +11,56 @@ class Chromosome(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, index=True, nullable=False)
     length = Column(Integer, nullable=False)
-    sequence = Column(Text, nullable=True) # Added sequence column
\ No newline at end of file
+
+    # Sequence bytes live in their own table so that chromosome metadata
+    # queries never read them; they are only loaded on explicit access.
+    sequence_data = relationship(
+        "ChromosomeSequenceData", uselist=False, back_populates="chromosome",
+        cascade="all, delete-orphan",
+    )
+
+    @property
+    def has_sequence(self) -> bool:
+        return self.sequence_data is not None
+
+    def set_sequence(self, sequence: str):
+        """Packs and stores a sequence string, updating the chromosome length."""
+        packed = twobit.pack_sequence(sequence)
+        self.length = packed.length
+        if self.sequence_data is None:
+            self.sequence_data = ChromosomeSequenceData()
+        self.sequence_data.packed_sequence = packed.data
+        self.sequence_data.n_blocks = packed.n_blocks
+        self.sequence_data.mask_blocks = packed.mask_blocks
+
+    def get_sequence(self, start: int = 0, end: Optional[int] = None, soft_mask: bool = True) -> Optional[str]:
+        """
+        Returns the sequence of the 0-based, half-open region [start, end),
+        or the whole chromosome by default. Soft-masked bases are returned in
+        lowercase unless soft_mask is False.
+        """
+        if not self.has_sequence:
+            return None
+        packed = twobit.PackedSequence(
+            length=self.length,
+            data=self.sequence_data.packed_sequence,
+            n_blocks=self.sequence_data.n_blocks,
+            mask_blocks=self.sequence_data.mask_blocks,
+        )
+        return twobit.unpack_sequence(packed, start, end, soft_mask=soft_mask)
+
+
+class ChromosomeSequenceData(Base):
+    __tablename__ = "chromosome_sequences"
+
+    # Doubles as the SQLite rowid, which the sequence store opens blobs by
+    chromosome_id = Column(Integer, ForeignKey("chromosomes.id"), primary_key=True)
+
+    # Sequence stored 2-bit packed (see app/utils/twobit.py) with N and
+    # soft-mask runs kept as separate block lists. Deferred so that loading
+    # the row (e.g. to check a chromosome has a sequence) reads no blob.
+    packed_sequence = deferred(Column(LargeBinary, nullable=False))
+    n_blocks = deferred(Column(LargeBinary, nullable=True))
+    mask_blocks = deferred(Column(LargeBinary, nullable=True))
+
+    chromosome = relationship("Chromosome", back_populates="sequence_data")
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, LargeBinary, ForeignKey
+from sqlalchemy.orm import relationship
+from ..db.base_class import Base
+
+class CompositionIndex(Base):
+    """
+    Cumulative A/C/G/T/N/CpG counts of one chromosome, sampled every
+    sample_interval bases (see app/services/composition.py). `cumulative` is
+    a little-endian uint32 array of shape (ceil(length / sample_interval) + 1, 6).
+    """
+    __tablename__ = "composition_index"
+
+    chromosome_id = Column(Integer, ForeignKey("chromosomes.id"), primary_key=True)
+    sample_interval = Column(Integer, nullable=False)
+    cumulative = Column(LargeBinary, nullable=False)
+
+    chromosome = relationship("Chromosome")
@@ -1,14 +1,15 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from ..db.base_class import Base
+from ..db.rtree import attach_rtree_index
 
 class CpgIsland(Base):
     __tablename__ = "cpg_islands"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     chromosome_id = Column(Integer, ForeignKey("chromosomes.id"), nullable=False)
-    start_pos = Column(Integer, index=True, nullable=False)
-    end_pos = Column(Integer, index=True, nullable=False)
+    start_pos = Column(Integer, nullable=False)
+    end_pos = Column(Integer, nullable=False)
     name = Column(String, nullable=True) # Usually something like 'cpgIslandExt'
     
     # Statistics from UCSC format
@@ -19,3 +20,9 @@ class CpgIsland(Base):
     per_cpg = Column(Integer) # Percentage CpG
 
     chromosome = relationship("Chromosome")
+
+    __table_args__ = (
+        Index("idx_cpg_island_coords", "chromosome_id", "start_pos", "end_pos"),
+    )
+
+attach_rtree_index(CpgIsland.__table__)
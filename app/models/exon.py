@@ -1,14 +1,27 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from ..db.base_class import Base
+from ..db.rtree import attach_rtree_index
 
 class Exon(Base):
     __tablename__ = "exons"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     gene_id = Column(Integer, ForeignKey("genes.id"), nullable=False)
-    start_pos = Column(Integer, index=True, nullable=False)
-    end_pos = Column(Integer, index=True, nullable=False)
+    transcript_id = Column(Integer, ForeignKey("transcripts.id"))
+    start_pos = Column(Integer, nullable=False)
+    end_pos = Column(Integer, nullable=False)
     exon_number = Column(Integer)
 
     gene = relationship("Gene", backref="exons")
+    transcript = relationship("Transcript", backref="exons")
+
+    # Covering indexes: per-gene and per-transcript sums of exon lengths
+    # (e.g. transcripts.spliced_length) never read the table itself
+    __table_args__ = (
+        Index("idx_exon_gene", "gene_id", "start_pos", "end_pos"),
+        Index("idx_exon_transcript", "transcript_id", "start_pos", "end_pos"),
+    )
+
+# Exons have no chromosome_id of their own; their R*Tree takes the gene's
+attach_rtree_index(Exon.__table__, "(SELECT chromosome_id FROM genes WHERE genes.id = {row}.gene_id)")
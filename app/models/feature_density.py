@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, String, LargeBinary, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from ..db.base_class import Base
+
+# Bin sizes of the density pyramid, finest first; each is a multiple of the previous one
+DENSITY_RESOLUTIONS = (10_000, 100_000, 1_000_000, 10_000_000)
+
+# Feature classes with a density pyramid
+DENSITY_FEATURES = ("genes", "exons", "cpg_islands", "non_coding_rnas")
+
+# Per-bin values are stored as little-endian uint32 arrays
+DENSITY_DTYPE = "<u4"
+
+class FeatureDensity(Base):
+    """
+    Binned density of one feature class on one chromosome at one resolution:
+    per bin, the number of features starting in it and the bases covered by
+    at least one feature. Bin i spans 0-based positions [i * resolution, (i + 1) * resolution).
+    """
+    __tablename__ = "feature_density"
+
+    id = Column(Integer, primary_key=True, index=True)
+    feature = Column(String, nullable=False)
+    chromosome_id = Column(Integer, ForeignKey("chromosomes.id"), nullable=False)
+    resolution = Column(Integer, nullable=False)
+    bin_count = Column(Integer, nullable=False)
+    counts = Column(LargeBinary, nullable=False)
+    coverage = Column(LargeBinary, nullable=False)
+
+    chromosome = relationship("Chromosome")
+
+    __table_args__ = (
+        Index("idx_feature_density_lookup", "feature", "chromosome_id", "resolution", unique=True),
+    )
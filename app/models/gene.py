@@ -1,15 +1,17 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Index
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Index, collate
 from sqlalchemy.orm import relationship
 from ..db.base_class import Base
+from ..db.rtree import attach_rtree_index
+from ..db.gene_search import attach_gene_search
 
 class Gene(Base):
     __tablename__ = "genes"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     gene_id = Column(String, unique=True, index=True, nullable=False) # e.g., ENSG00000100196
     gene_name = Column(String, index=True) # e.g., PIK3R5
-    start_pos = Column(Integer, index=True, nullable=False)
-    end_pos = Column(Integer, index=True, nullable=False)
+    start_pos = Column(Integer, nullable=False)
+    end_pos = Column(Integer, nullable=False)
     strand = Column(String(1), nullable=False)
 
     # This creates the relationship to the Chromosome table
@@ -17,5 +19,13 @@ class Gene(Base):
     chromosome = relationship("Chromosome")
 
     __table_args__ = (
+        # Covers per-chromosome counts and lengths (gene density correlation)
+        # and the chromosome-ordered snapshot export; regions use the R*Tree
         Index("idx_gene_coords", "chromosome_id", "start_pos", "end_pos"),
-    )
\ No newline at end of file
+        # Case-insensitive exact and prefix lookups for gene search
+        Index("idx_gene_name_nocase", collate(gene_name, "NOCASE")),
+        Index("idx_gene_id_nocase", collate(gene_id, "NOCASE")),
+    )
+
+attach_rtree_index(Gene.__table__)
+attach_gene_search(Gene.__table__)
@@ -1,17 +1,25 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from ..db.base_class import Base
+from ..db.rtree import attach_rtree_index
 
 class NonCodingRNA(Base):
     __tablename__ = "non_coding_rnas"
 
-    id = Column(Integer, primary_key=True, index=True)
-    chromosome_id = Column(Integer, ForeignKey("chromosomes.id"), nullable=False, index=True)
-    start_pos = Column(Integer, index=True, nullable=False)
-    end_pos = Column(Integer, index=True, nullable=False)
+    id = Column(Integer, primary_key=True)
+    chromosome_id = Column(Integer, ForeignKey("chromosomes.id"), nullable=False)
+    start_pos = Column(Integer, nullable=False)
+    end_pos = Column(Integer, nullable=False)
     strand = Column(String(1))
     rna_type = Column(String, index=True) # e.g. rRNA, tRNA, snRNA
     rna_class = Column(String, index=True) # repClass from rmsk
     rna_name = Column(String) # repName from rmsk
 
     chromosome = relationship("Chromosome")
+
+    # rna_type / rna_class above cover the distribution GROUP BYs
+    __table_args__ = (
+        Index("idx_ncrna_coords", "chromosome_id", "start_pos", "end_pos"),
+    )
+
+attach_rtree_index(NonCodingRNA.__table__)
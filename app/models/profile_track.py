@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Integer, String, LargeBinary, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from ..db.base_class import Base
+
+# Window sizes of the profile tracks, finest first; each is a multiple of the
+# composition index sample interval they are derived from
+PROFILE_WINDOWS = (1_000, 10_000, 100_000, 1_000_000)
+
+# GC percentage, (G - C) / (G + C), its running sum along the chromosome,
+# CpG observed/expected and Shannon entropy (bits) of the A/C/G/T frequencies
+PROFILE_TRACKS = ("gc_content", "gc_skew", "cumulative_gc_skew", "cpg_oe", "entropy")
+
+# Per-window values are stored as little-endian float32 arrays, NaN where undefined
+PROFILE_DTYPE = "<f4"
+
+class ProfileTrack(Base):
+    """
+    One windowed sequence profile of one chromosome at one window size.
+    Window i spans 0-based positions [i * window_size, (i + 1) * window_size); the last
+    one stops at the end of the chromosome.
+    """
+    __tablename__ = "profile_tracks"
+
+    id = Column(Integer, primary_key=True, index=True)
+    track = Column(String, nullable=False)
+    chromosome_id = Column(Integer, ForeignKey("chromosomes.id"), nullable=False)
+    window_size = Column(Integer, nullable=False)
+    bin_count = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+
+    chromosome = relationship("Chromosome")
+
+    __table_args__ = (
+        Index("idx_profile_track_lookup", "track", "chromosome_id", "window_size", unique=True),
+    )
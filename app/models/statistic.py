@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, JSON
+from sqlalchemy import Column, Integer, String, Text, JSON, ForeignKey, Index
+from sqlalchemy.orm import relationship
 from ..db.base_class import Base
 
 class GenomeStatistic(Base):
@@ -8,4 +9,28 @@ class GenomeStatistic(Base):
     # The name of the statistic, e.g., "nuclear_base_composition"
     stat_name = Column(String, unique=True, index=True, nullable=False)
     # The value of the statistic, stored as a JSON object
-    stat_value = Column(JSON, nullable=False)
\ No newline at end of file
+    stat_value = Column(JSON, nullable=False)
+
+class GenomeStatisticResult(Base):
+    """
+    One row of a list-shaped statistic (e.g. a nested gene pair). genome_stats
+    keeps only the statistic's summary; its rows live here so they can be
+    paged and filtered instead of loaded as one JSON blob.
+    """
+    __tablename__ = "genome_stat_results"
+
+    id = Column(Integer, primary_key=True, index=True)
+    stat_name = Column(String, nullable=False) # Name of the owning statistic in genome_stats
+    chromosome_id = Column(Integer, ForeignKey("chromosomes.id"), nullable=True)
+    start_pos = Column(Integer, nullable=True)
+    end_pos = Column(Integer, nullable=True)
+    feature_type = Column(String, nullable=True)
+    name = Column(String, nullable=True)
+    value = Column(JSON, nullable=True) # Any further fields of the row
+
+    chromosome = relationship("Chromosome")
+
+    __table_args__ = (
+        Index("idx_stat_result_coords", "stat_name", "chromosome_id", "start_pos"),
+        Index("idx_stat_result_type", "stat_name", "feature_type"),
+    )
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String
+from ..db.base_class import Base
+
+class TableLoad(Base):
+    """
+    Load generation of a feature table: bumped by the loaders each time they
+    (re)load it (see app/db/bulk_load.py), so data derived from the table,
+    such as the feature snapshots, can tell with one lookup whether it is stale.
+    """
+    __tablename__ = "table_loads"
+
+    table_name = Column(String, primary_key=True)
+    generation = Column(Integer, nullable=False)
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from ..db.base_class import Base
+
+class TandemRepeat(Base):
+    """A perfect microsatellite (period 1-6) found by the sequence scanner."""
+    __tablename__ = "tandem_repeats"
+
+    id = Column(Integer, primary_key=True, index=True)
+    chromosome_id = Column(Integer, ForeignKey("chromosomes.id"), nullable=False)
+    start_pos = Column(Integer, nullable=False) # 1-based, inclusive
+    end_pos = Column(Integer, nullable=False)
+    period = Column(Integer, nullable=False, index=True)
+    motif = Column(String, nullable=False, index=True) # The repeating unit, e.g. "CAG"
+    copy_number = Column(Integer, nullable=False) # Complete copies of the motif
+    length = Column(Integer, nullable=False)
+
+    chromosome = relationship("Chromosome")
+
+    __table_args__ = (
+        Index("idx_tandem_repeat_coords", "chromosome_id", "start_pos", "end_pos"),
+    )
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from ..db.base_class import Base
+
+class Transcript(Base):
+    __tablename__ = "transcripts"
+
+    id = Column(Integer, primary_key=True)
+    transcript_id = Column(String, unique=True, index=True, nullable=False) # e.g., ENST00000456328
+    transcript_name = Column(String) # e.g., DDX11L1-202
+    transcript_biotype = Column(String)
+    gene_id = Column(Integer, ForeignKey("genes.id"), nullable=False)
+    start_pos = Column(Integer, nullable=False)
+    end_pos = Column(Integer, nullable=False)
+    strand = Column(String(1), nullable=False)
+    # Sum of the transcript's exon lengths, filled in by the GTF ingest
+    spliced_length = Column(Integer)
+
+    gene = relationship("Gene", backref="transcripts")
+
+    __table_args__ = (
+        # Also serves gene_id lookups
+        Index("idx_transcript_coords", "gene_id", "start_pos", "end_pos"),
+    )
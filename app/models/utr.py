@@ -1,14 +1,24 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from ..db.base_class import Base
 
 class Utr(Base):
     __tablename__ = "utrs"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     gene_id = Column(Integer, ForeignKey("genes.id"), nullable=False)
-    start_pos = Column(Integer, index=True, nullable=False)
-    end_pos = Column(Integer, index=True, nullable=False)
+    transcript_id = Column(Integer, ForeignKey("transcripts.id"))
+    start_pos = Column(Integer, nullable=False)
+    end_pos = Column(Integer, nullable=False)
     utr_type = Column(String) # '5_prime_utr' or '3_prime_utr'
 
     gene = relationship("Gene", backref="utrs")
+    transcript = relationship("Transcript", backref="utrs")
+
+    # Covering indexes for the GROUP BY gene_id / transcript_id sums of UTR
+    # lengths (analysis/calculate_utr_analysis.py)
+    __table_args__ = (
+        Index("idx_utr_gene", "gene_id", "start_pos", "end_pos"),
+        Index("idx_utr_transcript", "transcript_id", "start_pos", "end_pos"),
+    )
+
@@ -0,0 +1,18 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+
+# Regions accepted by one batch request
+MAX_BATCH_REGIONS = 10000
+
+class RegionComposition(BaseModel):
+    """Base composition of a 1-based, inclusive region."""
+    chromosome: str
+    start: int
+    end: int
+    length: int
+    base_counts: Dict[str, int] # A, C, G, T and N
+    cpg_count: int # CpG dinucleotides wholly inside the region
+    gc_content: Optional[float] = None # Percentage of G+C among A/C/G/T, None without called bases
+
+class CompositionBatchRequest(BaseModel):
+    regions: List[str] = Field(..., min_length=1, max_length=MAX_BATCH_REGIONS, examples=[["chr1:1-1000", "chrX:5,000,001-6,000,000"]])
@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from typing import List
+
+class DensitySlice(BaseModel):
+    """A run of density bins; bin i starts at 0-based position (first_bin + i) * resolution."""
+    feature: str
+    chromosome: str
+    resolution: int
+    total_bins: int
+    first_bin: int
+    counts: List[int] # Features starting in each bin
+    coverage: List[int] # Bases of each bin covered by at least one feature
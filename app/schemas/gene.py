@@ -23,4 +23,10 @@ class Gene(GeneBase):
     # Instead of 'chromosome_id', we now expect a 'chromosome' object
     # that matches the shape of our new ChromosomeInGeneResponse schema
     chromosome: ChromosomeInGeneResponse
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class GeneSuggestion(BaseModel):
+    """Lightweight autocomplete entry."""
+    gene_id: str
+    gene_name: str | None = None
+    locus: str # e.g. chr1:11869-14409
@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class TrackSlice(BaseModel):
+    """A run of profile track windows; window i starts at 0-based position (first_bin + i) * window."""
+    track: str
+    chromosome: str
+    window: int
+    total_bins: int
+    first_bin: int
+    values: List[Optional[float]] # None where the window has no called bases (or, for cpg_oe, no C or G)
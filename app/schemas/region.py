@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+
+class RegionFeature(BaseModel):
+    """A feature overlapping a queried region."""
+    id: int
+    start_pos: int
+    end_pos: int
+    name: Optional[str] = None
+    strand: Optional[str] = None
+
+class RegionResponse(BaseModel):
+    chromosome: str
+    start: int
+    end: int
+    # Overlapping features by type, e.g. {"genes": [...], "cpg_islands": [...]}
+    features: Dict[str, List[RegionFeature]]
@@ -0,0 +1,18 @@
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+
+# Intervals accepted by one batch request
+MAX_BATCH_INTERVALS = 100000
+
+class SequenceIntervalIn(BaseModel):
+    """A BED-like interval: 0-based start, exclusive end."""
+    chromosome: str
+    start: int = Field(..., ge=0)
+    end: int = Field(..., ge=1)
+    name: Optional[str] = None
+    strand: Literal["+", "-", "."] = "+" # "-" returns the reverse complement
+
+class SequenceBatchRequest(BaseModel):
+    intervals: List[SequenceIntervalIn] = Field(..., min_length=1, max_length=MAX_BATCH_INTERVALS)
+    line_width: int = Field(60, ge=1)
+    soft_mask: bool = True # Return soft-masked bases in lowercase
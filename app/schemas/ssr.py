@@ -1,25 +1,22 @@
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, ConfigDict
+from typing import Dict
 
-class SSR(BaseModel):
-    chromosome_name: str
+from .gene import ChromosomeInGeneResponse
+
+class TandemRepeat(BaseModel):
+    """A perfect microsatellite from the tandem_repeats table."""
+    id: int
+    chromosome: ChromosomeInGeneResponse
+    start_pos: int
+    end_pos: int
+    period: int
     motif: str
-    count: int
+    copy_number: int
     length: int
-    start_position: int
-    end_position: int
+    model_config = ConfigDict(from_attributes=True)
 
 class SSRSummary(BaseModel):
-    total_ssrs: int
-    # Potentially add more summary statistics later, e.g.,
-    # motifs_found: List[str]
-    # average_length: float
-
-class SSRResponse(BaseModel):
-    # This schema will be used for the API response which will return a list of SSRs
-    ssrs: List[SSR]
-    # summary: SSRSummary # Could add a summary if desired
-
-# Or, if we just want to return the raw list directly from the upserted statistic,
-# the Statistic schema we already have (Dict[str, Any]) would suffice for the general case.
-# However, defining a specific schema like SSRResponse is good for type-checking and API documentation.
\ No newline at end of file
+    """Shape of the simple_sequence_repeats genome statistic."""
+    total_repeats: int
+    repeats_by_period: Dict[int, int]
+    total_length_bp: int
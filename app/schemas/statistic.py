@@ -1,8 +1,21 @@
 from pydantic import BaseModel, ConfigDict
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+from .gene import ChromosomeInGeneResponse
 
 class Statistic(BaseModel):
     stat_name: str
     # Change the type from 'Json' to 'Dict[str, Any]' or just 'dict'
     stat_value: Dict[str, Any]
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class StatisticResult(BaseModel):
+    """One row of a list-shaped statistic."""
+    id: int
+    chromosome: Optional[ChromosomeInGeneResponse] = None
+    start_pos: Optional[int] = None
+    end_pos: Optional[int] = None
+    feature_type: Optional[str] = None
+    name: Optional[str] = None
+    value: Optional[Dict[str, Any]] = None
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,136 @@
+"""
+    Prefix-sum base composition index.
+
+    For every chromosome the index holds cumulative counts of A, C, G, T, N
+    and CpG sampled every COMPOSITION_SAMPLE_INTERVAL bases: row k counts the
+    bases in [0, k * interval) and the CpGs whose C lies there (the last row
+    covers the whole chromosome). The composition of any region is then the
+    difference of two rows, each topped up with the few bases between the row
+    and the region edge read from the sequence store, so a query never reads
+    more than a few COMPOSITION_SAMPLE_INTERVAL bases.
+
+    The rows are built by CompositionIndexAccumulator during the sequence scan
+    and stored as one little-endian uint32 blob per chromosome in
+    composition_index; queries read just the two rows they need.
+    """
+from typing import Dict, Optional
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..models.chromosome import Chromosome
+from ..models.composition_index import CompositionIndex
+from .sequence_store import get_sequence_store
+
+COMPOSITION_SAMPLE_INTERVAL = 1000
+
+# Columns of an index row; the CpG column is counted at the position of the C
+COMPOSITION_COLUMNS = ("A", "C", "G", "T", "N", "CpG")
+CPG_COLUMN = 5
+
+INDEX_DTYPE = np.dtype("<u4")
+_ROW_SIZE = len(COMPOSITION_COLUMNS) * INDEX_DTYPE.itemsize
+
+
+def block_counts(codes: np.ndarray, position: int, carry: np.ndarray,
+                 interval: int = COMPOSITION_SAMPLE_INTERVAL) -> np.ndarray:
+    """
+    Counts of `codes` (starting at chromosome position `position`) per sample
+    block, as an (n_blocks, 6) array whose first row is block position // interval.
+    `carry` is the base before `position` (or empty), so that a CpG split by the
+    window boundary is counted in the block of its C.
+    """
+    first_block = (position - len(carry)) // interval
+    last_block = (position + len(codes) - 1) // interval if len(codes) else first_block
+    n_blocks = last_block - first_block + 1
+    blocks = (position + np.arange(len(codes))) // interval - first_block
+    counts = np.zeros((n_blocks, len(COMPOSITION_COLUMNS)), dtype=np.int64)
+    counts[:, :5] = np.bincount(blocks * 5 + codes, minlength=n_blocks * 5).reshape(n_blocks, 5)
+
+    extended = np.concatenate((carry, codes))
+    cpg = np.flatnonzero((extended[:-1] == 1) & (extended[1:] == 2))
+    cpg_blocks = (position - len(carry) + cpg) // interval - first_block
+    counts[:, CPG_COLUMN] = np.bincount(cpg_blocks, minlength=n_blocks)
+    return counts
+
+
+def _read_rows(db: Session, chromosome_id: int, rows) -> Dict[int, np.ndarray]:
+    """Reads the given index rows (only their bytes) from the stored blob."""
+    rows = sorted(set(rows))
+    values = db.query(*[
+        func.substr(CompositionIndex.cumulative, row * _ROW_SIZE + 1, _ROW_SIZE) for row in rows
+    ]).filter(CompositionIndex.chromosome_id == chromosome_id).one()
+    return {row: np.frombuffer(value, dtype=INDEX_DTYPE).astype(np.int64) for row, value in zip(rows, values)}
+
+
+def _prefix_counts(db: Session, chromosome_id: int, chromosome_name: str, length: int,
+                   interval: int, positions) -> Optional[Dict[int, np.ndarray]]:
+    """
+    Counts of the bases in [0, x), and of the CpGs with their C there, for
+    each position x: the nearest index row at or before x plus the bases
+    between that row and x, read from the sequence store.
+    """
+    # Row and in-block offset of every position; the last row covers the whole chromosome
+    located = {x: ((-(-length // interval), 0) if x == length else (x // interval, x % interval)) for x in positions}
+    rows = _read_rows(db, chromosome_id, [row for row, _ in located.values()])
+
+    reads = {}
+    for row, offset in located.values():
+        if offset:
+            reads[row] = max(reads.get(row, 0), offset)
+    codes = {}
+    if reads:
+        handle = get_sequence_store(db).open(chromosome_name)
+        if handle is None:
+            return None
+        with handle:
+            for row, offset in reads.items():
+                # One base more, for a CpG whose G lies just past the offset
+                codes[row] = handle.read_codes(row * interval, min(row * interval + offset + 1, length))
+
+    prefix = {}
+    for x, (row, offset) in located.items():
+        counts = rows[row].copy()
+        if offset:
+            block = codes[row]
+            counts[:5] += np.bincount(block[:offset], minlength=5)[:5]
+            pairs = block[:offset + 1]
+            counts[CPG_COLUMN] += np.count_nonzero((pairs[:-1] == 1) & (pairs[1:] == 2))
+        prefix[x] = counts
+    return prefix
+
+
+def region_composition(db: Session, chromosome_name: str, start: int, end: int) -> Optional[dict]:
+    """
+    Composition of the 0-based, half-open region [start, end) (clamped to the
+    chromosome): base counts, CpGs lying wholly inside it and GC content.
+    Returns None if the chromosome has no composition index or sequence.
+    """
+    row = db.query(Chromosome.id, Chromosome.length, CompositionIndex.sample_interval)\
+        .join(CompositionIndex, CompositionIndex.chromosome_id == Chromosome.id)\
+        .filter(Chromosome.name == chromosome_name).first()
+    if row is None:
+        return None
+    chromosome_id, length, interval = row
+    start = min(max(0, start), length)
+    end = min(max(start, end), length)
+    cpg_end = max(start, end - 1)  # A CpG in the region needs its G in it too
+
+    prefix = _prefix_counts(db, chromosome_id, chromosome_name, length, interval, {start, end, cpg_end})
+    if prefix is None:
+        return None
+    counts = prefix[end] - prefix[start]
+    cpg_count = int(prefix[cpg_end][CPG_COLUMN] - prefix[start][CPG_COLUMN])
+
+    base_counts = {base: int(count) for base, count in zip(COMPOSITION_COLUMNS[:5], counts)}
+    called = base_counts["A"] + base_counts["C"] + base_counts["G"] + base_counts["T"]
+    return {
+        "chromosome": chromosome_name,
+        "start": start + 1,
+        "end": end,
+        "length": end - start,
+        "base_counts": base_counts,
+        "cpg_count": cpg_count,
+        "gc_content": round((base_counts["C"] + base_counts["G"]) / called * 100, 4) if called else None,
+    }
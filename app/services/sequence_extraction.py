@@ -0,0 +1,92 @@
+"""
+    Batch extraction of many small regions (exons, promoters, splice-site
+    flanks, ...) from the sequence store.
+
+    Intervals are grouped by chromosome and sorted by start; intervals closer
+    than COALESCE_GAP bases are merged into spans of at most COALESCE_MAX_SPAN
+    bases, and each span is read once. Every chromosome is opened once and its
+    spans are read in increasing order, so extracting every exon of the genome
+    is a single forward pass over the sequence. Coordinates are 0-based and
+    half-open, as in BED.
+    """
+from typing import Iterable, Iterator, NamedTuple, Optional, Tuple
+
+from .sequence_store import SequenceStore
+
+# Intervals separated by fewer bases than this are read as one span
+COALESCE_GAP = 64 * 1024
+
+# Upper bound on a coalesced span (a single longer interval is still read whole)
+COALESCE_MAX_SPAN = 4 * 1024 * 1024
+
+_COMPLEMENT = str.maketrans("ACGTNacgtn", "TGCANtgcan")
+
+
+class SequenceInterval(NamedTuple):
+    """A BED-like interval; strand "-" extracts the reverse complement."""
+    chromosome: str
+    start: int
+    end: int
+    name: Optional[str] = None
+    strand: str = "+"
+
+
+def reverse_complement(sequence: str) -> str:
+    return sequence.translate(_COMPLEMENT)[::-1]
+
+
+def fasta_header(interval: SequenceInterval) -> str:
+    """bedtools getfasta style header: [name::]chrom:start-end[(strand)]."""
+    header = f"{interval.chromosome}:{interval.start}-{interval.end}"
+    if interval.strand in ("+", "-"):
+        header += f"({interval.strand})"
+    return f"{interval.name}::{header}" if interval.name else header
+
+
+def format_fasta(interval: SequenceInterval, sequence: str, line_width: int = 60) -> str:
+    lines = [sequence[i:i + line_width] for i in range(0, len(sequence), line_width)]
+    return f">{fasta_header(interval)}\n" + "".join(line + "\n" for line in lines)
+
+
+def _spans(intervals, max_gap: int, max_span: int):
+    """Groups start-sorted intervals into (span_start, span_end, members)."""
+    members = []
+    span_start = span_end = 0
+    for interval in intervals:
+        if members and (interval.start > span_end + max_gap
+                        or max(span_end, interval.end) - span_start > max_span):
+            yield span_start, span_end, members
+            members = []
+        if not members:
+            span_start, span_end = interval.start, interval.end
+        else:
+            span_end = max(span_end, interval.end)
+        members.append(interval)
+    if members:
+        yield span_start, span_end, members
+
+
+def extract_sequences(store: SequenceStore, intervals: Iterable[SequenceInterval], soft_mask: bool = True,
+                      max_gap: int = COALESCE_GAP, max_span: int = COALESCE_MAX_SPAN
+                      ) -> Iterator[Tuple[SequenceInterval, str]]:
+    """
+    Yields (interval, sequence) for every interval, chromosome by chromosome
+    (in order of first appearance) and by start within a chromosome. Intervals
+    are clamped to the chromosome end. Raises ValueError for a chromosome
+    whose sequence is not available.
+    """
+    by_chromosome = {}
+    for interval in intervals:
+        by_chromosome.setdefault(interval.chromosome, []).append(interval)
+
+    for chromosome_name, chromosome_intervals in by_chromosome.items():
+        chromosome_intervals.sort(key=lambda interval: (interval.start, interval.end))
+        handle = store.open(chromosome_name)
+        if handle is None:
+            raise ValueError(f"Sequence not available for chromosome {chromosome_name}")
+        with handle:
+            for span_start, span_end, members in _spans(chromosome_intervals, max_gap, max_span):
+                span = handle.read(span_start, span_end, soft_mask=soft_mask)
+                for interval in members:
+                    sequence = span[interval.start - span_start:interval.end - span_start]
+                    yield interval, reverse_complement(sequence) if interval.strand == "-" else sequence
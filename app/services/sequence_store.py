@@ -0,0 +1,332 @@
+"""
+    Random-access reads of chromosome sequences.
+
+    Two interchangeable backends are available, selected through
+    Settings.SEQUENCE_BACKEND:
+
+    - "database": regions are read straight from the packed blobs in the
+      chromosomes table with SQLite incremental blob I/O, touching only the
+      packed bytes covering the region plus the N/soft-mask blocks that
+      overlap it.
+    - "fasta": regions are read from a memory-mapped FASTA file (plain or
+      bgzip) through its .fai index, so no sequence ingest is needed and the
+      genome bytes are shared between processes by the OS page cache.
+
+    Either way memory and latency scale with the region size, not with the
+    chromosome size. Coordinates are 0-based and half-open throughout.
+    """
+import os
+import sqlite3
+import struct
+from abc import ABC, abstractmethod
+from multiprocessing import shared_memory
+from typing import Iterator, Optional
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..db.releases import SEQUENCE_DIR, bundle_file
+from ..models.chromosome import Chromosome, ChromosomeSequenceData
+from ..utils import faidx, twobit
+
+# Packed bytes are copied into shared memory in slices of this size.
+SHARED_COPY_CHUNK_SIZE = 16 * 1024 * 1024
+
+# Block records are read in batches of this many (start, end) pairs once the
+# first overlapping block has been found by binary search.
+BLOCK_READ_BATCH = 4096
+
+_BLOCK_SIZE = 2 * twobit.BLOCK_DTYPE.itemsize
+
+
+class _BlobColumn:
+    """Reads byte ranges of a single blob cell of chromosome_sequences without loading the whole value."""
+
+    def __init__(self, db: Session, column, rowid: int):
+        self._db = db
+        self._column = column
+        self._rowid = rowid
+        self._blob = None
+
+        raw_connection = db.connection().connection.driver_connection
+        if hasattr(raw_connection, "blobopen"):
+            try:
+                self._blob = raw_connection.blobopen(
+                    ChromosomeSequenceData.__tablename__, column.key, rowid, readonly=True
+                )
+            except (AttributeError, sqlite3.Error):
+                # NULL cells cannot be opened as blobs; they read as empty
+                self._blob = None
+                self.size = 0
+                return
+            self.size = len(self._blob)
+        else:
+            # Fallback for sqlite3 builds without blobopen (Python < 3.11)
+            self.size = db.query(func.length(column)).filter(
+                ChromosomeSequenceData.chromosome_id == rowid
+            ).scalar() or 0
+
+    def read(self, offset: int, size: int) -> bytes:
+        size = max(0, min(size, self.size - offset))
+        if size == 0:
+            return b""
+        if self._blob is not None:
+            self._blob.seek(offset)
+            return self._blob.read(size)
+        return self._db.query(
+            func.substr(self._column, offset + 1, size)
+        ).filter(ChromosomeSequenceData.chromosome_id == self._rowid).scalar()
+
+    def close(self):
+        if self._blob is not None:
+            self._blob.close()
+            self._blob = None
+
+
+def _read_blocks(blob: _BlobColumn, start: int, end: int) -> np.ndarray:
+    """Binary-searches a stored block list and returns the blocks overlapping [start, end)."""
+    count = blob.size // _BLOCK_SIZE
+    lo, hi = 0, count
+    while lo < hi:
+        mid = (lo + hi) // 2
+        (block_end,) = struct.unpack("<I", blob.read(mid * _BLOCK_SIZE + 4, 4))
+        if block_end > start:
+            hi = mid
+        else:
+            lo = mid + 1
+
+    found = []
+    index = lo
+    while index < count:
+        batch_size = min(BLOCK_READ_BATCH, count - index)
+        batch = twobit.blocks_from_bytes(blob.read(index * _BLOCK_SIZE, batch_size * _BLOCK_SIZE))
+        stop = int(np.searchsorted(batch[:, 0], end, side="left"))
+        found.append(batch[:stop])
+        if stop < batch_size:
+            break
+        index += batch_size
+
+    if not found:
+        return np.empty((0, 2), dtype=np.int64)
+    return np.concatenate(found)
+
+
+class SequenceHandle(ABC):
+    """
+    An open handle on one chromosome sequence. Backends implement read_codes()
+    and read(); chunked iteration and clamping are shared.
+    """
+    name: str
+    length: int
+
+    def _clamp(self, start: int, end: Optional[int]):
+        end = self.length if end is None else min(end, self.length)
+        return max(0, start), end
+
+    @abstractmethod
+    def read_codes(self, start: int = 0, end: Optional[int] = None) -> np.ndarray:
+        """Returns base codes (see app/utils/twobit.py) for [start, end)."""
+
+    @abstractmethod
+    def read(self, start: int = 0, end: Optional[int] = None, soft_mask: bool = True) -> str:
+        """Returns the sequence of [start, end), soft-masked bases in lowercase unless soft_mask is False."""
+
+    def iter_chunks(self, start: int = 0, end: Optional[int] = None, chunk_size: int = 1 << 20,
+                    soft_mask: bool = True) -> Iterator[str]:
+        """Yields [start, end) as consecutive strings of at most chunk_size bases."""
+        start, end = self._clamp(start, end)
+        for chunk_start in range(start, end, chunk_size):
+            yield self.read(chunk_start, min(chunk_start + chunk_size, end), soft_mask=soft_mask)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ChromosomeSequence(SequenceHandle):
+    """A chromosome sequence read from the packed blobs in the database."""
+
+    def __init__(self, db: Session, rowid: int, name: str, length: int):
+        self.name = name
+        self.length = length
+        self._packed = _BlobColumn(db, ChromosomeSequenceData.packed_sequence, rowid)
+        self._n_blocks = _BlobColumn(db, ChromosomeSequenceData.n_blocks, rowid)
+        self._mask_blocks = _BlobColumn(db, ChromosomeSequenceData.mask_blocks, rowid)
+
+    def read_codes(self, start: int = 0, end: Optional[int] = None) -> np.ndarray:
+        start, end = self._clamp(start, end)
+        if end <= start:
+            return np.empty(0, dtype=np.uint8)
+        first_byte = start // 4
+        data = self._packed.read(first_byte, (end + 3) // 4 - first_byte)
+        codes = twobit.unpack_codes(data, start, end, byte_offset=first_byte)
+        return twobit.apply_n_blocks(codes, start, _read_blocks(self._n_blocks, start, end))
+
+    def read(self, start: int = 0, end: Optional[int] = None, soft_mask: bool = True) -> str:
+        start, end = self._clamp(start, end)
+        codes = self.read_codes(start, end)
+        mask_blocks = _read_blocks(self._mask_blocks, start, end) if soft_mask else None
+        return twobit.codes_to_string(codes, start, mask_blocks)
+
+    def close(self):
+        self._packed.close()
+        self._n_blocks.close()
+        self._mask_blocks.close()
+
+
+class FastaChromosomeSequence(SequenceHandle):
+    """
+    A chromosome sequence read from a memory-mapped, .fai-indexed FASTA file.
+    Holds a reader's reference on the shared mapping until closed.
+    """
+
+    def __init__(self, fasta: faidx.FastaFile, entry: faidx.FaiEntry):
+        self.name = entry.name
+        self.length = entry.length
+        self._fasta = fasta
+
+    def read_codes(self, start: int = 0, end: Optional[int] = None) -> np.ndarray:
+        start, end = self._clamp(start, end)
+        return twobit.encode_bytes(self._fasta.fetch(self.name, start, end))
+
+    def read(self, start: int = 0, end: Optional[int] = None, soft_mask: bool = True) -> str:
+        start, end = self._clamp(start, end)
+        raw = self._fasta.fetch(self.name, start, end)
+        return (raw if soft_mask else raw.upper()).decode("ascii")
+
+    def close(self):
+        if self._fasta is not None:
+            faidx.release_fasta(self._fasta)
+            self._fasta = None
+
+
+class SharedChromosomeSequence(SequenceHandle):
+    """
+    A chromosome's packed sequence and block lists copied into a
+    multiprocessing.shared_memory segment. Pickling a handle only passes the
+    segment name, so worker processes attach to the bytes without copying.
+    The process that created the segment unlinks it on close().
+    """
+
+    def __init__(self, name: str, length: int, segment_name: str, packed_size: int,
+                 n_size: int, mask_size: int, owner: bool = False):
+        self.name = name
+        self.length = length
+        self._sizes = (packed_size, n_size, mask_size)
+        self._owner = owner
+        self._shm = shared_memory.SharedMemory(name=segment_name)
+        self._block_cache = {}
+
+    @classmethod
+    def create(cls, handle: ChromosomeSequence) -> "SharedChromosomeSequence":
+        """Copies an open database sequence into a new shared memory segment."""
+        columns = (handle._packed, handle._n_blocks, handle._mask_blocks)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, sum(c.size for c in columns)))
+        position = 0
+        for column in columns:
+            for offset in range(0, column.size, SHARED_COPY_CHUNK_SIZE):
+                chunk = column.read(offset, SHARED_COPY_CHUNK_SIZE)
+                shm.buf[position:position + len(chunk)] = chunk
+                position += len(chunk)
+        shm.close()
+        return cls(handle.name, handle.length, shm.name, *(c.size for c in columns), owner=True)
+
+    def __getstate__(self):
+        return (self.name, self.length, self._shm.name, self._sizes)
+
+    def __setstate__(self, state):
+        name, length, segment_name, sizes = state
+        self.__init__(name, length, segment_name, *sizes)
+
+    def _blocks(self, index: int) -> np.ndarray:
+        if index not in self._block_cache:
+            start = sum(self._sizes[:index])
+            raw = bytes(self._shm.buf[start:start + self._sizes[index]])
+            self._block_cache[index] = twobit.blocks_from_bytes(raw)
+        return self._block_cache[index]
+
+    def read_codes(self, start: int = 0, end: Optional[int] = None) -> np.ndarray:
+        start, end = self._clamp(start, end)
+        codes = twobit.unpack_codes(self._shm.buf[:self._sizes[0]], start, end)
+        return twobit.apply_n_blocks(codes, start, self._blocks(1))
+
+    def read(self, start: int = 0, end: Optional[int] = None, soft_mask: bool = True) -> str:
+        start, end = self._clamp(start, end)
+        mask_blocks = self._blocks(2) if soft_mask else None
+        return twobit.codes_to_string(self.read_codes(start, end), start, mask_blocks)
+
+    def close(self):
+        if self._shm is None:
+            return
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+        self._shm = None
+
+
+class SequenceStore(ABC):
+    """Common interface of the sequence backends."""
+
+    @abstractmethod
+    def open(self, chromosome_name: str) -> Optional[SequenceHandle]:
+        """Opens a chromosome for region reads, or returns None if its sequence is not available."""
+
+    def fetch(self, chromosome_name: str, start: int, end: int, soft_mask: bool = True) -> Optional[str]:
+        """Returns the sequence of [start, end) on a chromosome, or None if it is not available."""
+        handle = self.open(chromosome_name)
+        if handle is None:
+            return None
+        with handle:
+            return handle.read(start, end, soft_mask=soft_mask)
+
+
+class DatabaseSequenceStore(SequenceStore):
+    """Serves chromosome regions from the packed sequences in the database."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def open(self, chromosome_name: str) -> Optional[ChromosomeSequence]:
+        """Opens a chromosome for region reads, or returns None if it has no stored sequence."""
+        row = self.db.query(Chromosome.id, Chromosome.length).join(
+            ChromosomeSequenceData, ChromosomeSequenceData.chromosome_id == Chromosome.id
+        ).filter(Chromosome.name == chromosome_name).first()
+        if row is None:
+            return None
+        return ChromosomeSequence(self.db, row.id, chromosome_name, row.length)
+
+
+class FastaSequenceStore(SequenceStore):
+    """Serves chromosome regions from a memory-mapped FASTA file."""
+
+    def __init__(self, fasta_path: str):
+        self.fasta_path = fasta_path
+
+    def open(self, chromosome_name: str) -> Optional[FastaChromosomeSequence]:
+        """Opens a chromosome for region reads, or returns None if the FASTA does not contain it."""
+        fasta = faidx.acquire_fasta(self.fasta_path)
+        entry = fasta.get_entry(chromosome_name)
+        if entry is None:
+            faidx.release_fasta(fasta)
+            return None
+        return FastaChromosomeSequence(fasta, entry)
+
+
+def get_sequence_store(db: Session) -> SequenceStore:
+    """
+    Returns the sequence store selected by Settings.SEQUENCE_BACKEND. The
+    FASTA backend reads the FASTA of the session's release bundle when it
+    has one (see app/db/releases.py), else FASTA_PATH.
+    """
+    settings = get_settings()
+    if settings.SEQUENCE_BACKEND == "fasta":
+        fasta_path = bundle_file(db, os.path.join(SEQUENCE_DIR, os.path.basename(settings.FASTA_PATH)))
+        return FastaSequenceStore(fasta_path or settings.FASTA_PATH)
+    return DatabaseSequenceStore(db)
@@ -0,0 +1,229 @@
+"""
+    Memory-mapped random access to FASTA files through a samtools-style .fai index.
+
+    Plain FASTA files are read straight out of the mapping. bgzip-compressed
+    files are supported through their BGZF block index (read from a samtools
+    .gzi file when present, otherwise built by walking the block headers), so
+    only the compressed blocks covering a region are inflated. Because the
+    file is mapped read-only, every process reading the same genome shares
+    its pages through the OS page cache.
+    """
+import bisect
+import gzip
+import mmap
+import os
+import struct
+import threading
+import zlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+_BGZF_MAGIC = b"\x1f\x8b\x08\x04"
+_NEWLINES = b"\r\n"
+
+
+@dataclass
+class FaiEntry:
+    """One .fai record: sequence name, length, byte offset and line layout."""
+    name: str
+    length: int
+    offset: int
+    line_bases: int
+    line_width: int
+
+    def position_offset(self, position: int) -> int:
+        """Returns the (uncompressed) byte offset of a 0-based base position."""
+        return self.offset + (position // self.line_bases) * self.line_width + position % self.line_bases
+
+
+def read_fai(path: str) -> List[FaiEntry]:
+    entries = []
+    with open(path) as f:
+        for line in f:
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) < 5:
+                continue
+            entries.append(FaiEntry(fields[0], int(fields[1]), int(fields[2]), int(fields[3]), int(fields[4])))
+    return entries
+
+
+def write_fai(path: str, entries: List[FaiEntry]):
+    with open(path, "w") as f:
+        for e in entries:
+            f.write(f"{e.name}\t{e.length}\t{e.offset}\t{e.line_bases}\t{e.line_width}\n")
+
+
+def is_bgzf(path: str) -> bool:
+    with open(path, "rb") as f:
+        header = f.read(16)
+    return header[:4] == _BGZF_MAGIC and header[12:14] == b"BC"
+
+
+def build_fai(path: str) -> List[FaiEntry]:
+    """Scans a (plain or bgzip) FASTA file once and returns its .fai entries."""
+    opener = gzip.open if is_bgzf(path) else open
+    entries = []
+    current = None
+    offset = 0
+    short_line_seen = False
+
+    with opener(path, "rb") as f:
+        for line in f:
+            offset += len(line)
+            if line.startswith(b">"):
+                current = FaiEntry(line[1:].split()[0].decode(), 0, offset, 0, 0)
+                entries.append(current)
+                short_line_seen = False
+                continue
+            if current is None:
+                continue
+            bases = len(line.rstrip(_NEWLINES))
+            if bases == 0:
+                continue
+            if current.line_bases == 0:
+                current.line_bases, current.line_width = bases, len(line)
+            elif short_line_seen or bases > current.line_bases:
+                raise ValueError(f"Inconsistent line lengths in sequence {current.name} of {path}")
+            elif bases < current.line_bases:
+                short_line_seen = True
+            current.length += bases
+    return entries
+
+
+def load_or_build_fai(path: str) -> List[FaiEntry]:
+    """Reads ``<path>.fai``, building (and, where possible, writing) it first if missing or stale."""
+    fai_path = path + ".fai"
+    if os.path.exists(fai_path) and os.path.getmtime(fai_path) >= os.path.getmtime(path):
+        return read_fai(fai_path)
+    entries = build_fai(path)
+    try:
+        write_fai(fai_path, entries)
+    except OSError:
+        pass
+    return entries
+
+
+class _BgzfBlocks:
+    """Compressed/uncompressed offsets of the blocks of a mapped BGZF file."""
+
+    def __init__(self, data: mmap.mmap, path: str):
+        self._data = data
+        gzi_path = path + ".gzi"
+        if os.path.exists(gzi_path):
+            self.coffsets, self.uoffsets = self._read_gzi(gzi_path)
+        else:
+            self.coffsets, self.uoffsets = self._scan()
+
+    @staticmethod
+    def _read_gzi(gzi_path: str):
+        with open(gzi_path, "rb") as f:
+            raw = f.read()
+        (count,) = struct.unpack_from("<Q", raw)
+        pairs = struct.unpack_from(f"<{2 * count}Q", raw, 8)
+        # The .gzi format omits the implicit first block at (0, 0)
+        return [0] + list(pairs[0::2]), [0] + list(pairs[1::2])
+
+    def _scan(self):
+        coffsets, uoffsets = [], []
+        coffset = uoffset = 0
+        size = len(self._data)
+        while coffset < size:
+            (bsize,) = struct.unpack_from("<H", self._data, coffset + 16)
+            block_end = coffset + bsize + 1
+            (isize,) = struct.unpack_from("<I", self._data, block_end - 4)
+            if isize:
+                coffsets.append(coffset)
+                uoffsets.append(uoffset)
+            uoffset += isize
+            coffset = block_end
+        return coffsets, uoffsets
+
+    def _inflate(self, coffset: int) -> bytes:
+        (xlen,) = struct.unpack_from("<H", self._data, coffset + 10)
+        (bsize,) = struct.unpack_from("<H", self._data, coffset + 16)
+        return zlib.decompress(self._data[coffset + 12 + xlen:coffset + bsize + 1 - 8], wbits=-15)
+
+    def read(self, start: int, end: int) -> bytes:
+        """Returns uncompressed bytes [start, end)."""
+        index = bisect.bisect_right(self.uoffsets, start) - 1
+        parts = []
+        position = start
+        while position < end and index < len(self.coffsets):
+            block = self._inflate(self.coffsets[index])
+            block_start = self.uoffsets[index]
+            parts.append(block[position - block_start:end - block_start])
+            position = block_start + len(block)
+            index += 1
+        return b"".join(parts)
+
+
+class FastaFile:
+    """A read-only memory-mapped FASTA file with its .fai index."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.index: Dict[str, FaiEntry] = {e.name: e for e in load_or_build_fai(path)}
+        self._file = open(path, "rb")
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._bgzf = _BgzfBlocks(self._data, path) if is_bgzf(path) else None
+        self._readers = 0  # See acquire_fasta()
+        self._replaced = False
+
+    def get_entry(self, name: str) -> Optional[FaiEntry]:
+        return self.index.get(name)
+
+    def fetch(self, name: str, start: int, end: int) -> bytes:
+        """Returns the bases of [start, end) on ``name`` as ASCII bytes, newlines removed."""
+        entry = self.index[name]
+        start, end = max(0, start), min(end, entry.length)
+        if end <= start:
+            return b""
+        first = entry.position_offset(start)
+        last = entry.position_offset(end - 1) + 1
+        if self._bgzf is not None:
+            raw = self._bgzf.read(first, last)
+        else:
+            raw = self._data[first:last]
+        return raw.translate(None, _NEWLINES)
+
+    def close(self):
+        self._data.close()
+        self._file.close()
+
+
+# {file name: ((path, mtime_ns, size), FastaFile)}
+_open_files: Dict[str, Tuple[Tuple[str, int, int], FastaFile]] = {}
+_open_files_lock = threading.Lock()
+
+
+def acquire_fasta(path: str) -> FastaFile:
+    """
+    Returns a process-wide shared FastaFile for ``path``, to be handed back
+    with release_fasta() when the reader is done. One mapping is kept per file
+    name: another file of the same name (e.g. the FASTA of a newer release)
+    or the same file rewritten since (a changed modification time or size)
+    is mapped anew, and the mapping it replaces is closed as soon as its last
+    reader has released it.
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    signature = (path, stat.st_mtime_ns, stat.st_size)
+    with _open_files_lock:
+        cached = _open_files.get(os.path.basename(path))
+        if cached is None or cached[0] != signature:
+            if cached is not None:
+                cached[1]._replaced = True
+                if cached[1]._readers == 0:
+                    cached[1].close()
+            cached = _open_files[os.path.basename(path)] = (signature, FastaFile(path))
+        fasta = cached[1]
+        fasta._readers += 1
+    return fasta
+
+
+def release_fasta(fasta: FastaFile):
+    """Hands back a FastaFile from acquire_fasta()."""
+    with _open_files_lock:
+        fasta._readers -= 1
+        if fasta._replaced and fasta._readers == 0:
+            fasta.close()
@@ -0,0 +1,163 @@
+"""
+    Array-backed interval overlap engine (nested containment list).
+
+    Intervals are closed ``[start, end]`` pairs, as stored in the feature
+    tables (1-based, inclusive). An IntervalIndex sorts them by start (longest
+    first on ties) and hangs every interval under the nearest interval that
+    contains it. Within each resulting sublist neither starts nor ends ever
+    decrease, so the members of a sublist overlapping or containing a query
+    are one contiguous range found by binary search. Queries are run for a
+    whole batch at once: every step is a few np.searchsorted calls over the
+    current (query, sublist) frontier, so the cost grows with the number of
+    hits rather than with how long or deeply nested the intervals are.
+
+    Indexes are built per chromosome; query results refer to intervals by
+    their position in the arrays the index was built from.
+    """
+from typing import Dict, Tuple
+
+import numpy as np
+
+# Sublist ids and coordinates are combined into one int64 search key
+_KEY_SHIFT = 32
+
+
+def _key(sublists: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    return (sublists.astype(np.int64) << _KEY_SHIFT) | positions.astype(np.int64)
+
+
+def _expand(lo: np.ndarray, hi: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Expands the ranges [lo, hi) into (range number, position) pairs."""
+    counts = np.maximum(hi - lo, 0)
+    owner = np.repeat(np.arange(len(lo)), counts)
+    offsets = np.cumsum(counts) - counts
+    return owner, lo[owner] + np.arange(len(owner)) - offsets[owner]
+
+
+class IntervalIndex:
+    """Overlap, containment, count and nearest queries over one set of intervals."""
+
+    def __init__(self, starts, ends):
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        if starts.shape != ends.shape:
+            raise ValueError("starts and ends must have the same length")
+        if len(starts) and (starts.min() < 0 or ends.max() >= 1 << _KEY_SHIFT):
+            raise ValueError("coordinates must be between 0 and 2^32")
+        self.starts = starts
+        self.ends = ends
+
+        order = np.lexsort((-ends, starts))
+        sorted_ends = ends[order].tolist()
+        # Parent of each interval in sorted order: the nearest earlier interval containing it
+        parent = np.full(len(order), -1, dtype=np.int64)
+        stack = []
+        for i, end in enumerate(sorted_ends):
+            while stack and sorted_ends[stack[-1]] < end:
+                stack.pop()
+            if stack:
+                parent[i] = stack[-1]
+            stack.append(i)
+
+        # Sublist 0 is the top level; the children of sorted interval p form sublist p + 1
+        layout = np.lexsort((np.arange(len(order)), parent))
+        self._ids = order[layout]
+        self._sublist = parent[layout] + 1
+        self._child_sublist = layout + 1
+        self._start_keys = _key(self._sublist, starts[self._ids])
+        self._end_keys = _key(self._sublist, ends[self._ids])
+        self._has_children = np.bincount(self._sublist, minlength=len(order) + 1)[self._child_sublist] > 0
+
+        # Plain sorted coordinates for counting and nearest queries
+        self._by_start = np.argsort(starts, kind="stable")
+        self._by_end = np.argsort(ends, kind="stable")
+        self._sorted_starts = starts[self._by_start]
+        self._sorted_ends = ends[self._by_end]
+
+    def __len__(self):
+        return len(self.starts)
+
+    def _search(self, query_starts, query_ends, containing: bool):
+        query_starts = np.asarray(query_starts, dtype=np.int64)
+        query_ends = np.asarray(query_ends, dtype=np.int64)
+        found_queries, found_ids = [], []
+        queries = np.arange(len(query_starts))
+        sublists = np.zeros(len(queries), dtype=np.int64)
+        while len(queries):
+            qs, qe = query_starts[queries], query_ends[queries]
+            if containing:
+                # start <= query start and end >= query end
+                lo = np.searchsorted(self._end_keys, _key(sublists, qe), side="left")
+                hi = np.searchsorted(self._start_keys, _key(sublists, qs), side="right")
+            else:
+                # end >= query start and start <= query end
+                lo = np.searchsorted(self._end_keys, _key(sublists, qs), side="left")
+                hi = np.searchsorted(self._start_keys, _key(sublists, qe), side="right")
+            owner, positions = _expand(lo, hi)
+            found_queries.append(queries[owner])
+            found_ids.append(self._ids[positions])
+            # Children of a hit may be hits too; children of a non-hit never are
+            descend = self._has_children[positions]
+            queries = queries[owner[descend]]
+            sublists = self._child_sublist[positions[descend]]
+        if not found_queries:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        return np.concatenate(found_queries), np.concatenate(found_ids)
+
+    def overlaps(self, query_starts, query_ends) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns (query index, interval index) for every overlapping pair."""
+        return self._search(query_starts, query_ends, containing=False)
+
+    def containing(self, query_starts, query_ends) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns (query index, interval index) for every interval containing a query."""
+        return self._search(query_starts, query_ends, containing=True)
+
+    def count_overlaps(self, query_starts, query_ends) -> np.ndarray:
+        """Returns the number of intervals overlapping each query."""
+        # Every interval ending before a query also starts before its end
+        starting_before_end = np.searchsorted(self._sorted_starts, query_ends, side="right")
+        ending_before_start = np.searchsorted(self._sorted_ends, query_starts, side="left")
+        return starting_before_end - ending_before_start
+
+    def nearest(self, query_starts, query_ends) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns (interval index, distance) of the interval nearest to each query.
+        Distance is 0 for an overlapping interval and the gap in bases otherwise;
+        the upstream interval wins ties. The index is -1 when the index is empty.
+        """
+        query_starts = np.asarray(query_starts, dtype=np.int64)
+        query_ends = np.asarray(query_ends, dtype=np.int64)
+        nearest = np.full(len(query_starts), -1, dtype=np.int64)
+        distance = np.full(len(query_starts), np.iinfo(np.int64).max, dtype=np.int64)
+        if not len(self):
+            return nearest, distance
+
+        before = np.searchsorted(self._sorted_ends, query_starts, side="left") - 1
+        has_before = before >= 0
+        nearest[has_before] = self._by_end[before[has_before]]
+        distance[has_before] = query_starts[has_before] - self._sorted_ends[before[has_before]]
+
+        after = np.searchsorted(self._sorted_starts, query_ends, side="right")
+        has_after = after < len(self)
+        after_distance = np.full(len(query_starts), np.iinfo(np.int64).max, dtype=np.int64)
+        after_distance[has_after] = self._sorted_starts[after[has_after]] - query_ends[has_after]
+        closer = has_after & (after_distance < distance)
+        nearest[closer] = self._by_start[after[closer]]
+        distance[closer] = after_distance[closer]
+
+        # An overlapping interval always overlaps some top-level interval, so one
+        # search step over the top level finds one for every overlapping query
+        lo = np.searchsorted(self._end_keys, _key(np.zeros(len(query_starts), dtype=np.int64), query_starts), side="left")
+        hi = np.searchsorted(self._start_keys, _key(np.zeros(len(query_starts), dtype=np.int64), query_ends), side="right")
+        overlapping = hi > lo
+        nearest[overlapping] = self._ids[lo[overlapping]]
+        distance[overlapping] = 0
+        return nearest, distance
+
+
+def split_by_chromosome(chromosome_ids) -> Dict[int, np.ndarray]:
+    """Maps each chromosome id to the (ascending) positions of its rows."""
+    chromosome_ids = np.asarray(chromosome_ids)
+    order = np.argsort(chromosome_ids, kind="stable")
+    keys, first = np.unique(chromosome_ids[order], return_index=True)
+    return {int(key): rows for key, rows in zip(keys, np.split(order, first[1:]))}
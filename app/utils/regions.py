@@ -0,0 +1,20 @@
+"""
+    Parsing of genomic region strings such as ``chr7:55,000,000-55,200,000``.
+    Coordinates are 1-based and inclusive, like the feature tables.
+    """
+import re
+from typing import Tuple
+
+_REGION = re.compile(r"^\s*([^:\s]+):([\d,]+)-([\d,]+)\s*$")
+
+
+def parse_region(region: str) -> Tuple[str, int, int]:
+    """Returns (chromosome, start, end); raises ValueError for a malformed or empty region."""
+    match = _REGION.match(region)
+    if match is None:
+        raise ValueError(f"Invalid region '{region}', expected chrom:start-end")
+    chromosome = match.group(1)
+    start, end = (int(match.group(i).replace(",", "")) for i in (2, 3))
+    if start < 1 or end < start:
+        raise ValueError(f"Invalid region '{region}': need 1 <= start <= end")
+    return chromosome, start, end
@@ -0,0 +1,172 @@
+"""
+    2-bit packed sequence codec.
+
+    Sequences are packed UCSC .2bit style: four bases per byte (A=0, C=1, G=2,
+    T=3, most significant bits first), with runs of N and runs of soft-masked
+    (lowercase) bases kept in two separate block lists. Block lists are sorted,
+    non-overlapping half-open ``(start, end)`` pairs stored as little-endian
+    uint32 bytes so they can be persisted next to the packed bases.
+    """
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+BASES = "ACGT"
+N_CODE = 4
+
+# Sequences are packed in slices of this many bases to bound the temporary
+# arrays created per chromosome. Must be a multiple of 4.
+PACK_CHUNK_SIZE = 16 * 1024 * 1024
+
+BLOCK_DTYPE = np.dtype("<u4")
+
+_ENCODE_TABLE = np.full(256, N_CODE, dtype=np.uint8)
+for _code, _base in enumerate(BASES):
+    _ENCODE_TABLE[ord(_base)] = _code
+    _ENCODE_TABLE[ord(_base.lower())] = _code
+
+_DECODE_TABLE = np.frombuffer(b"ACGTN", dtype=np.uint8)
+
+# Row ``b`` holds the four base codes packed into byte ``b``.
+_UNPACK_TABLE = np.array(
+    [[(b >> shift) & 3 for shift in (6, 4, 2, 0)] for b in range(256)], dtype=np.uint8
+)
+
+
+@dataclass
+class PackedSequence:
+    """A packed sequence together with its N and soft-mask block lists."""
+    length: int
+    data: bytes
+    n_blocks: bytes
+    mask_blocks: bytes
+
+
+class _RunCollector:
+    """Accumulates runs of True values across consecutive boolean slices."""
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+
+    def add(self, mask: np.ndarray, offset: int):
+        if not mask.any():
+            return
+        edges = np.diff(mask.view(np.int8), prepend=0, append=0)
+        starts = np.flatnonzero(edges == 1) + offset
+        ends = np.flatnonzero(edges == -1) + offset
+        # Merge with a run that finished exactly at the previous slice boundary
+        if self.ends and self.ends[-1][-1] == starts[0]:
+            self.ends[-1][-1] = ends[0]
+            starts, ends = starts[1:], ends[1:]
+        if len(starts):
+            self.starts.append(starts)
+            self.ends.append(ends)
+
+    def to_bytes(self) -> bytes:
+        if not self.starts:
+            return b""
+        pairs = np.column_stack((np.concatenate(self.starts), np.concatenate(self.ends)))
+        return pairs.astype(BLOCK_DTYPE).tobytes()
+
+
+def encode_bytes(raw: bytes) -> np.ndarray:
+    """Encodes ASCII sequence bytes into base codes (0-3, ``N_CODE`` for anything else)."""
+    return _ENCODE_TABLE[np.frombuffer(raw, dtype=np.uint8)]
+
+
+def encode_bases(sequence: str) -> np.ndarray:
+    """Encodes a sequence string into base codes (0-3, ``N_CODE`` for anything else)."""
+    return encode_bytes(sequence.encode("ascii"))
+
+
+def pack_sequence(sequence: str) -> PackedSequence:
+    """Packs a sequence string into 2-bit bases plus N and soft-mask blocks."""
+    length = len(sequence)
+    packed_chunks = []
+    n_runs = _RunCollector()
+    mask_runs = _RunCollector()
+
+    for offset in range(0, length, PACK_CHUNK_SIZE):
+        raw = np.frombuffer(sequence[offset:offset + PACK_CHUNK_SIZE].encode("ascii"), dtype=np.uint8)
+        codes = _ENCODE_TABLE[raw]
+
+        is_n = codes == N_CODE
+        n_runs.add(is_n, offset)
+        mask_runs.add(raw >= ord("a"), offset)
+
+        codes[is_n] = 0
+        remainder = len(codes) % 4
+        if remainder:
+            codes = np.concatenate((codes, np.zeros(4 - remainder, dtype=np.uint8)))
+        packed_chunks.append(
+            ((codes[0::4] << 6) | (codes[1::4] << 4) | (codes[2::4] << 2) | codes[3::4]).tobytes()
+        )
+
+    return PackedSequence(
+        length=length,
+        data=b"".join(packed_chunks),
+        n_blocks=n_runs.to_bytes(),
+        mask_blocks=mask_runs.to_bytes(),
+    )
+
+
+def blocks_from_bytes(raw: Optional[bytes]) -> np.ndarray:
+    """Returns a ``(k, 2)`` array of ``(start, end)`` pairs from a stored block list."""
+    if not raw:
+        return np.empty((0, 2), dtype=np.int64)
+    return np.frombuffer(raw, dtype=BLOCK_DTYPE).reshape(-1, 2).astype(np.int64)
+
+
+def overlapping_blocks(blocks: np.ndarray, start: int, end: int) -> np.ndarray:
+    """Returns the blocks overlapping ``[start, end)``."""
+    first = np.searchsorted(blocks[:, 1], start, side="right")
+    last = np.searchsorted(blocks[:, 0], end, side="left")
+    return blocks[first:last]
+
+
+def unpack_codes(packed: bytes, start: int, end: int, byte_offset: int = 0) -> np.ndarray:
+    """
+    Unpacks the base codes of ``[start, end)``.
+    ``packed`` may be a slice of the full packed data whose first byte holds
+    base ``byte_offset * 4``. N positions are not restored; see ``apply_n_blocks``.
+    """
+    if end <= start:
+        return np.empty(0, dtype=np.uint8)
+    first = start // 4 - byte_offset
+    last = (end + 3) // 4 - byte_offset
+    raw = np.frombuffer(packed, dtype=np.uint8, count=last - first, offset=first)
+    skip = start % 4
+    return _UNPACK_TABLE[raw].reshape(-1)[skip:skip + end - start]
+
+
+def apply_n_blocks(codes: np.ndarray, start: int, n_blocks: np.ndarray) -> np.ndarray:
+    """Marks the positions of ``codes`` (which begins at ``start``) covered by N blocks."""
+    end = start + len(codes)
+    for block_start, block_end in overlapping_blocks(n_blocks, start, end):
+        codes[max(block_start, start) - start:min(block_end, end) - start] = N_CODE
+    return codes
+
+
+def codes_to_string(codes: np.ndarray, start: int = 0, mask_blocks: Optional[np.ndarray] = None) -> str:
+    """Decodes base codes to a string, lowercasing positions inside soft-mask blocks."""
+    letters = _DECODE_TABLE[codes]
+    if mask_blocks is not None and len(mask_blocks):
+        end = start + len(codes)
+        for block_start, block_end in overlapping_blocks(mask_blocks, start, end):
+            letters[max(block_start, start) - start:min(block_end, end) - start] |= 0x20
+    return letters.tobytes().decode("ascii")
+
+
+def unpack_sequence(packed: PackedSequence, start: int = 0, end: Optional[int] = None,
+                    soft_mask: bool = True) -> str:
+    """Decodes ``[start, end)`` of a packed sequence back to a string."""
+    end = packed.length if end is None else min(end, packed.length)
+    start = max(0, start)
+    if end <= start:
+        return ""
+    codes = unpack_codes(packed.data, start, end)
+    apply_n_blocks(codes, start, blocks_from_bytes(packed.n_blocks))
+    mask_blocks = blocks_from_bytes(packed.mask_blocks) if soft_mask else None
+    return codes_to_string(codes, start, mask_blocks)
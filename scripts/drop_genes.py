@@ -11,6 +11,10 @@ def drop_genes_table():
         # We drop exons first because it depends on genes
         db.execute(text("DROP TABLE IF EXISTS exons"))
         db.execute(text("DROP TABLE IF EXISTS genes"))
+        # Their R*Tree indexes are recreated (and refilled) with the tables
+        db.execute(text("DROP TABLE IF EXISTS exons_rtree"))
+        db.execute(text("DROP TABLE IF EXISTS genes_rtree"))
+        db.execute(text("DROP TABLE IF EXISTS gene_search"))
         db.commit()
         print("Tables dropped. You can now run parse_gtf.py.")
     except Exception as e:
@@ -0,0 +1,18 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import utils.analysis_helpers as analysis_helpers
+from utils.feature_snapshots import export_snapshots
+
+def export_feature_snapshots(directory: str = None):
+    """
+    Writes Parquet snapshots of the feature tables, one file per table and
+    chromosome, for the analyses to load their inputs from.
+    """
+    print("Exporting feature snapshots...")
+    with analysis_helpers.get_db_session() as db:
+        counts = export_snapshots(db, directory)
+    print(f"Successfully exported {sum(counts.values())} rows from {len(counts)} tables.")
+
+if __name__ == "__main__":
+    export_feature_snapshots(sys.argv[1] if len(sys.argv) > 1 else None)
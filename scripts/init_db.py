@@ -5,7 +5,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app.db.base_class import Base
 from app.db.session import get_engine
-from app.models import chromosome, gene, statistic, centromere, telomere, cpg_island, exon, utr, non_coding_rna # Import all models
+from app.models import chromosome, gene, statistic, centromere, telomere, cpg_island, exon, utr, transcript, non_coding_rna, tandem_repeat, feature_density, composition_index, profile_track, table_load # Import all models
 
 def init_db(db = None):
     """
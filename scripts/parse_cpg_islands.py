@@ -1,7 +1,6 @@
 import os
 import sys
 import pandas as pd
-from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 # Add the backend directory to sys.path
@@ -9,6 +8,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app.models.chromosome import Chromosome
 from app.models.cpg_island import CpgIsland
+from app.db.bulk_load import deferred_indexes
 import utils.analysis_helpers as analysis_helpers
 
 # UCSC cpgIslandExt columns:
@@ -23,9 +23,8 @@ def load_cpg_islands(file_path, db: Session = None):
 
     def _process(db_session: Session):
         try:
-            # 1. Optimize SQLite
-            db_session.execute(text("PRAGMA synchronous = OFF"))
-            db_session.execute(text("PRAGMA journal_mode = MEMORY"))
+            # 1. SQLite pragmas come from the engine's profile (the Snakefile runs
+            # loaders with SQLITE_PROFILE=bulk_load, see app/db/session.py)
             
             # 2. Get Chromosome Mapping
             chromosome_map = {c.name: c.id for c in db_session.query(Chromosome.name, Chromosome.id).all()}
@@ -38,39 +37,40 @@ def load_cpg_islands(file_path, db: Session = None):
                 file_path, sep='\t', names=COLUMNS, header=None, chunksize=CHUNK_SIZE
             )
 
-            for chunk in reader:
-                # Map Chromosome IDs
-                chunk['chromosome_id'] = chunk['chrom'].map(chromosome_map)
+            with deferred_indexes(db_session, CpgIsland.__table__):
+                for chunk in reader:
+                    # Map Chromosome IDs
+                    chunk['chromosome_id'] = chunk['chrom'].map(chromosome_map)
                 
-                # Handle missing 'chr' prefix if needed
-                mask_missing = chunk['chromosome_id'].isna()
-                if mask_missing.any():
-                    chunk.loc[mask_missing, 'chromosome_id'] = chunk.loc[mask_missing, 'chrom'].apply(lambda x: chromosome_map.get(f"chr{x}"))
+                    # Handle missing 'chr' prefix if needed
+                    mask_missing = chunk['chromosome_id'].isna()
+                    if mask_missing.any():
+                        chunk.loc[mask_missing, 'chromosome_id'] = chunk.loc[mask_missing, 'chrom'].apply(lambda x: chromosome_map.get(f"chr{x}"))
                 
-                # Drop rows where chromosome not found
-                chunk.dropna(subset=['chromosome_id'], inplace=True)
+                    # Drop rows where chromosome not found
+                    chunk.dropna(subset=['chromosome_id'], inplace=True)
                 
-                if chunk.empty:
-                    continue
+                    if chunk.empty:
+                        continue
                 
-                # Prepare records
-                records = []
-                for _, row in chunk.iterrows():
-                    records.append({
-                        "chromosome_id": int(row['chromosome_id']),
-                        "start_pos": row['chromStart'],
-                        "end_pos": row['chromEnd'],
-                        "name": row['name'],
-                        "length": row['length'],
-                        "cpg_num": row['cpgNum'],
-                        "gc_num": row['gcNum'],
-                        "per_gc": row['perGc'],
-                        "per_cpg": row['perCpg']
-                    })
+                    # Prepare records
+                    records = []
+                    for _, row in chunk.iterrows():
+                        records.append({
+                            "chromosome_id": int(row['chromosome_id']),
+                            "start_pos": row['chromStart'],
+                            "end_pos": row['chromEnd'],
+                            "name": row['name'],
+                            "length": row['length'],
+                            "cpg_num": row['cpgNum'],
+                            "gc_num": row['gcNum'],
+                            "per_gc": row['perGc'],
+                            "per_cpg": row['perCpg']
+                        })
                 
-                if records:
-                    db_session.bulk_insert_mappings(CpgIsland, records)
-                    total_processed += len(records)
+                    if records:
+                        db_session.bulk_insert_mappings(CpgIsland, records)
+                        total_processed += len(records)
             
             db_session.commit()
             print(f"Successfully loaded {total_processed} CpG islands into the database.")
@@ -5,7 +5,9 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from sqlalchemy.orm import Session
 from Bio import SeqIO
 import utils.analysis_helpers as analysis_helpers
-from app.models.chromosome import Chromosome
+from app.config import get_settings
+from app.models.chromosome import Chromosome, ChromosomeSequenceData
+from app.utils import faidx
 
 FASTA_FILE_PATH = sys.argv[1] if len(sys.argv) > 1 else "uploads/hg38.fa"
 
@@ -23,13 +25,14 @@ def load_fasta_to_db(file_path, db: Session = None):
                 existing_chromosome = db_session.query(Chromosome).filter(Chromosome.name == chrom_name).first()
                 
                 if existing_chromosome:
-                    existing_chromosome.sequence = seq
-                    existing_chromosome.length = length
+                    existing_chromosome.set_sequence(seq)
                     print(f"  Updated {chrom_name} (Length: {length})")
                 else:
-                    new_chromosome = Chromosome(name=chrom_name, sequence=seq, length=length)
+                    new_chromosome = Chromosome(name=chrom_name)
+                    new_chromosome.set_sequence(seq)
                     db_session.add(new_chromosome)
                     print(f"  Added {chrom_name} (Length: {length})")
+                del seq
                 
                 # Commit after each chromosome to free memory (if SQLAlchemy session manages it well)
                 # and to show progress
@@ -47,5 +50,46 @@ def load_fasta_to_db(file_path, db: Session = None):
         with analysis_helpers.get_db_session() as session:
             _process_fasta(session)
 
+def load_fasta_index_to_db(file_path, db: Session = None):
+    """
+    Registers chromosome names and lengths from the FASTA's .fai index (built
+    if missing) without copying any sequence into the database. Used when
+    sequences are served from the memory-mapped FASTA (SEQUENCE_BACKEND=fasta).
+    """
+    print(f"Indexing FASTA: {file_path}")
+    settings = get_settings()
+    if os.path.abspath(settings.FASTA_PATH) != os.path.abspath(file_path):
+        print(f"  Warning: FASTA_PATH is {settings.FASTA_PATH}; sequences will be served from there, not {file_path}")
+
+    def _process_index(db_session: Session):
+        try:
+            existing = dict(db_session.query(Chromosome.name, Chromosome.id).all())
+            for entry in faidx.load_or_build_fai(file_path):
+                if entry.name in existing:
+                    db_session.query(Chromosome).filter(Chromosome.name == entry.name).update({"length": entry.length})
+                    # Drop any sequence stored by an earlier database-backend ingest
+                    db_session.query(ChromosomeSequenceData).filter(
+                        ChromosomeSequenceData.chromosome_id == existing[entry.name]
+                    ).delete()
+                    print(f"  Updated {entry.name} (Length: {entry.length})")
+                else:
+                    db_session.add(Chromosome(name=entry.name, length=entry.length))
+                    print(f"  Added {entry.name} (Length: {entry.length})")
+            db_session.commit()
+            print("Successfully registered FASTA sequences.")
+        except Exception as e:
+            print(f"An error occurred: {e}")
+            db_session.rollback()
+            raise
+
+    if db:
+        _process_index(db)
+    else:
+        with analysis_helpers.get_db_session() as session:
+            _process_index(session)
+
 if __name__ == "__main__":
-    load_fasta_to_db(FASTA_FILE_PATH)
\ No newline at end of file
+    if get_settings().SEQUENCE_BACKEND == "fasta":
+        load_fasta_index_to_db(FASTA_FILE_PATH)
+    else:
+        load_fasta_to_db(FASTA_FILE_PATH)
@@ -1,41 +1,74 @@
 import os
 import sys
-import re
 import pandas as pd
-from sqlalchemy import text
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app.models.chromosome import Chromosome
 from app.models.gene import Gene
+from app.models.transcript import Transcript
 from app.models.exon import Exon
 from app.models.utr import Utr
+from app.db.bulk_load import deferred_indexes
+from app.db.gene_search import REBUILD_GENE_SEARCH
 import utils.analysis_helpers as analysis_helpers
 
 GTF_FILE_PATH = sys.argv[1] if len(sys.argv) > 1 else "Homo_sapiens.GRCh38.115.chr.gtf"
 
+GENE_ID_PATTERN = r'gene_id "([^"].*?)"'
+GENE_NAME_PATTERN = r'gene_name "([^"].*?)"'
+TRANSCRIPT_ID_PATTERN = r'transcript_id "([^"].*?)"'
+TRANSCRIPT_NAME_PATTERN = r'transcript_name "([^"].*?)"'
+TRANSCRIPT_BIOTYPE_PATTERN = r'transcript_biotype "([^"].*?)"'
+EXON_NUMBER_PATTERN = r'exon_number "?(\d+)"?'
+
+CHUNK_SIZE = 1_000_000
+
+GENE_INSERT = "INSERT INTO genes (id, gene_id, gene_name, start_pos, end_pos, strand, chromosome_id) VALUES (?, ?, ?, ?, ?, ?, ?)"
+TRANSCRIPT_INSERT = "INSERT INTO transcripts (id, transcript_id, transcript_name, transcript_biotype, gene_id, start_pos, end_pos, strand) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+EXON_INSERT = "INSERT INTO exons (gene_id, transcript_id, exon_number, start_pos, end_pos) VALUES (?, ?, ?, ?, ?)"
+UTR_INSERT = "INSERT INTO utrs (gene_id, transcript_id, start_pos, end_pos, utr_type) VALUES (?, ?, ?, ?, ?)"
+SPLICED_LENGTH_UPDATE = """
+    UPDATE transcripts SET spliced_length = (
+        SELECT SUM(end_pos - start_pos + 1) FROM exons WHERE exons.transcript_id = transcripts.id
+    ) WHERE id >= ?
+"""
+
+
+def _nullable(series: pd.Series) -> pd.Series:
+    """Object series with NaN replaced by None, ready for the DB driver."""
+    return series.astype(object).where(series.notna(), None)
+
+
+def _rows(df: pd.DataFrame, columns) -> list:
+    """Raw parameter tuples for executemany, built column-wise."""
+    return list(zip(*(df[column].tolist() for column in columns)))
+
+
 def load_gtf_to_db(file_path, db: Session = None):
     print(f"Reading GTF file: {file_path} (Optimized Chunked Processing)...")
 
     def _process_gtf(db_session: Session):
         try:
-            # 1. Optimize SQLite
-            db_session.execute(text("PRAGMA synchronous = OFF"))
-            db_session.execute(text("PRAGMA journal_mode = MEMORY"))
-            
-            # 2. Get Chromosome Mapping
-            chromosome_map = {c.name: c.id for c in db_session.query(Chromosome.name, Chromosome.id).all()}
-            alt_chromosome_map = {c.name.replace('chr', ''): c.id for c in db_session.query(Chromosome.name, Chromosome.id).all()}
-            
-            CHUNK_SIZE = 1_000_000 
-            total_processed = 0
-            processed_gene_ids = set() # Track inserted gene_ids to prevent duplicates
-            
-            # Regex for fast extraction
-            gene_id_pattern = r'gene_id "([^"].*?)"'
-            gene_name_pattern = r'gene_name "([^"].*?)"'
+            # 1. SQLite pragmas come from the engine's profile (the Snakefile runs
+            # loaders with SQLITE_PROFILE=bulk_load, see app/db/session.py)
+
+            # 2. Get Chromosome Mapping (Ensembl "1" and UCSC "chr1" seqnames both resolve)
+            chromosomes = db_session.query(Chromosome.name, Chromosome.id).all()
+            chromosome_map = {c.name.replace('chr', ''): c.id for c in chromosomes}
+            chromosome_map.update({c.name: c.id for c in chromosomes})
 
+            # 3. gene_id -> genes.id, kept in memory for the whole file. Genes are
+            # inserted with explicit ids, so exons and UTRs never need a lookup query.
+            gene_id_map = dict(db_session.query(Gene.gene_id, Gene.id).all())
+            next_gene_id = (db_session.query(func.max(Gene.id)).scalar() or 0) + 1
+            # Likewise transcript_id -> transcripts.id for exons and UTRs
+            transcript_id_map = dict(db_session.query(Transcript.transcript_id, Transcript.id).all())
+            next_transcript_id = first_new_transcript_id = (db_session.query(func.max(Transcript.id)).scalar() or 0) + 1
+
+            total_processed = 0
             reader = pd.read_csv(
                 file_path,
                 sep='\t',
@@ -45,130 +78,100 @@ def load_gtf_to_db(file_path, db: Session = None):
                     "seqname", "source", "feature", "start", "end",
                     "score", "strand", "frame", "attribute"
                 ],
+                usecols=["seqname", "feature", "start", "end", "strand", "attribute"],
+                dtype={"seqname": str, "feature": str, "strand": str, "attribute": str},
                 chunksize=CHUNK_SIZE,
-                low_memory=False
             )
 
-            for chunk in reader:
-                # Extract gene_id for ALL rows in chunk (vectorized)
-                chunk['gene_id'] = chunk['attribute'].str.extract(gene_id_pattern)
-                
-                # Filter subsets
-                genes_df = chunk[chunk["feature"] == "gene"].copy()
-                exons_df = chunk[chunk["feature"] == "exon"].copy()
-                utrs_df = chunk[chunk["feature"].str.contains("utr", case=False, na=False)].copy()
-
-                # --- A. Process Genes ---
-                if not genes_df.empty:
-                    # Deduplicate within the current chunk first
-                    genes_df.drop_duplicates(subset=['gene_id'], inplace=True)
-                    
-                    # Filter out genes we've already seen globally
-                    if processed_gene_ids:
-                        genes_df = genes_df[~genes_df['gene_id'].isin(processed_gene_ids)]
-                    
+            # Secondary indexes are built once after the load rather than row by row
+            with deferred_indexes(db_session, Gene.__table__, Transcript.__table__, Exon.__table__, Utr.__table__):
+                for chunk in reader:
+                    connection = db_session.connection()  # each commit below releases it
+                    # Keep only genes, transcripts, exons and UTRs before touching the attribute strings
+                    utr_features = [f for f in chunk["feature"].dropna().unique() if "utr" in f.lower()]
+                    is_utr = chunk["feature"].isin(utr_features)
+                    total_processed += len(chunk)
+                    chunk = chunk[chunk["feature"].isin(["gene", "transcript", "exon"]) | is_utr]
+                    is_utr = is_utr[chunk.index]
+                    # Extract gene_id and transcript_id for the remaining rows (vectorized)
+                    chunk = chunk.assign(
+                        gene_id=chunk['attribute'].str.extract(GENE_ID_PATTERN, expand=False),
+                        transcript_id=chunk['attribute'].str.extract(TRANSCRIPT_ID_PATTERN, expand=False),
+                    )
+
+                    # --- A. Process Genes ---
+                    genes_df = chunk[chunk["feature"] == "gene"].dropna(subset=['gene_id'])
+                    genes_df = genes_df.drop_duplicates(subset=['gene_id'])
+                    genes_df = genes_df[~genes_df['gene_id'].isin(gene_id_map.keys())]
                     if not genes_df.empty:
-                        genes_df['gene_name'] = genes_df['attribute'].str.extract(gene_name_pattern)
-                        
-                        # Map seqname to chrom_id
-                        genes_df['seqname_str'] = genes_df['seqname'].astype(str)
-                        
-                        # Create a map for this chunk's seqnames
-                        unique_seqnames = genes_df['seqname_str'].unique()
-                        chunk_chrom_map = {}
-                        for s in unique_seqnames:
-                            if s in chromosome_map:
-                                chunk_chrom_map[s] = chromosome_map[s]
-                            elif f"chr{s}" in chromosome_map:
-                                 chunk_chrom_map[s] = chromosome_map[f"chr{s}"]
-                            elif s in alt_chromosome_map:
-                                 chunk_chrom_map[s] = alt_chromosome_map[s]
-                        
-                        # Map IDs
-                        genes_df['chromosome_id'] = genes_df['seqname_str'].map(chunk_chrom_map)
-                        genes_df.dropna(subset=['chromosome_id'], inplace=True)
-                        
-                        # Prepare dictionaries for bulk insert
-                        gene_records = []
-                        genes_df.dropna(subset=['gene_id'], inplace=True) # Ensure gene_id is present
-                        
-                        for _, row in genes_df.iterrows():
-                            gene_records.append({
-                                "chromosome_id": int(row['chromosome_id']),
-                                "gene_id": row['gene_id'],
-                                "gene_name": row['gene_name'],
-                                "start_pos": row['start'],
-                                "end_pos": row['end'],
-                                "strand": row['strand']
-                            })
-                        
-                        if gene_records:
-                            # Use INSERT OR IGNORE to handle duplicates gracefully (SQLite specific optimization)
-                            # This bypasses the need for complex pre-filtering of cross-chunk duplicates
-                            stmt = Gene.__table__.insert().prefix_with("OR IGNORE")
-                            db_session.execute(stmt, gene_records)
-                            
-                            # Flush not needed strictly for ID generation if we don't use the IDs immediately in this block for genes
-                            # But we need IDs for Exon mapping below.
-                            # Querying DB for IDs is safer after insert.
-                            db_session.flush()
-
-                # --- Map Gene IDs to DB IDs ---
-                # We need the DB IDs (integers) for the exons and UTRs
-                # Optimization: Query only the gene_ids present in this chunk's exons/utrs
-                needed_gene_ids = set(exons_df['gene_id']).union(set(utrs_df['gene_id']))
-                if needed_gene_ids:
-                    # Fetch mapping from DB
-                    # Chunking the IN clause if too large
-                    needed_list = list(needed_gene_ids)
-                    gene_id_map = {}
-                    
-                    # SQLite limit for variables is usually 999 or 32000. 
-                    # SQLAlchemy handles this but safer to chunk manually or assume flush worked
-                    
-                    # Query batches
-                    BATCH = 5000
-                    for i in range(0, len(needed_list), BATCH):
-                        batch_ids = needed_list[i:i+BATCH]
-                        results = db_session.query(Gene.gene_id, Gene.id).filter(Gene.gene_id.in_(batch_ids)).all()
-                        for gid, db_id in results:
-                            gene_id_map[gid] = db_id
-
-                    # --- B. Process Exons ---
-                    if not exons_df.empty:
-                        exons_df['gene_db_id'] = exons_df['gene_id'].map(gene_id_map)
-                        exons_df.dropna(subset=['gene_db_id'], inplace=True)
-                        
-                        exon_records = exons_df[[ 
-                            'gene_db_id', 'start', 'end'
-                        ]].rename(columns={
-                            'gene_db_id': 'gene_id', 'start': 'start_pos', 'end': 'end_pos'
-                        }).to_dict('records')
-                        
-                        if exon_records:
-                            db_session.bulk_insert_mappings(Exon, exon_records)
-
-                    # --- C. Process UTRs ---
-                    if not utrs_df.empty:
-                        utrs_df['gene_db_id'] = utrs_df['gene_id'].map(gene_id_map)
-                        utrs_df.dropna(subset=['gene_db_id'], inplace=True)
-                        
-                        # Add utr_type
-                        utr_records = []
-                        for _, row in utrs_df.iterrows():
-                            utr_records.append({
-                                "gene_id": int(row['gene_db_id']),
-                                "start_pos": row['start'],
-                                "end_pos": row['end'],
-                                "utr_type": row['feature']
-                            })
-                        
-                        if utr_records:
-                            db_session.bulk_insert_mappings(Utr, utr_records)
-                
-                db_session.commit()
-                total_processed += len(chunk)
-                print(f"  Processed {total_processed:,} lines...")
+                        genes_df = genes_df.assign(chromosome_id=genes_df['seqname'].map(chromosome_map))
+                        genes_df = genes_df.dropna(subset=['chromosome_id'])
+                        genes_df = genes_df.assign(
+                            id=range(next_gene_id, next_gene_id + len(genes_df)),
+                            gene_name=_nullable(genes_df['attribute'].str.extract(GENE_NAME_PATTERN, expand=False)),
+                            chromosome_id=genes_df['chromosome_id'].astype(int),
+                        )
+                        if not genes_df.empty:
+                            connection.exec_driver_sql(GENE_INSERT, _rows(genes_df, [
+                                'id', 'gene_id', 'gene_name', 'start', 'end', 'strand', 'chromosome_id'
+                            ]))
+                            gene_id_map.update(zip(genes_df['gene_id'].tolist(), genes_df['id'].tolist()))
+                            next_gene_id += len(genes_df)
+
+                    # --- B. Process Transcripts ---
+                    transcripts_df = chunk[chunk["feature"] == "transcript"].dropna(subset=['transcript_id'])
+                    transcripts_df = transcripts_df.drop_duplicates(subset=['transcript_id'])
+                    transcripts_df = transcripts_df[~transcripts_df['transcript_id'].isin(transcript_id_map.keys())]
+                    transcripts_df = transcripts_df.assign(gene_db_id=transcripts_df['gene_id'].map(gene_id_map))
+                    transcripts_df = transcripts_df.dropna(subset=['gene_db_id'])
+                    if not transcripts_df.empty:
+                        attributes = transcripts_df['attribute'].str
+                        transcripts_df = transcripts_df.assign(
+                            id=range(next_transcript_id, next_transcript_id + len(transcripts_df)),
+                            gene_db_id=transcripts_df['gene_db_id'].astype(int),
+                            transcript_name=_nullable(attributes.extract(TRANSCRIPT_NAME_PATTERN, expand=False)),
+                            transcript_biotype=_nullable(attributes.extract(TRANSCRIPT_BIOTYPE_PATTERN, expand=False)),
+                        )
+                        connection.exec_driver_sql(TRANSCRIPT_INSERT, _rows(transcripts_df, [
+                            'id', 'transcript_id', 'transcript_name', 'transcript_biotype',
+                            'gene_db_id', 'start', 'end', 'strand'
+                        ]))
+                        transcript_id_map.update(zip(transcripts_df['transcript_id'].tolist(), transcripts_df['id'].tolist()))
+                        next_transcript_id += len(transcripts_df)
+
+                    # --- C. Process Exons and D. UTRs ---
+                    features_df = chunk[(chunk["feature"] == "exon") | is_utr]
+                    features_df = features_df.assign(gene_db_id=features_df['gene_id'].map(gene_id_map))
+                    features_df = features_df.dropna(subset=['gene_db_id'])
+                    features_df = features_df.assign(
+                        gene_db_id=features_df['gene_db_id'].astype(int),
+                        transcript_db_id=features_df['transcript_id'].map(transcript_id_map).astype("Int64"),
+                    )
+
+                    exons_df = features_df[features_df["feature"] == "exon"]
+                    exons_df = exons_df.assign(
+                        transcript_db_id=_nullable(exons_df['transcript_db_id']),
+                        exon_number=_nullable(exons_df['attribute'].str.extract(EXON_NUMBER_PATTERN, expand=False).astype("Int64")),
+                    )
+                    exon_rows = _rows(exons_df, ['gene_db_id', 'transcript_db_id', 'exon_number', 'start', 'end'])
+                    if exon_rows:
+                        connection.exec_driver_sql(EXON_INSERT, exon_rows)
+
+                    utrs_df = features_df[features_df["feature"] != "exon"]
+                    utrs_df = utrs_df.assign(transcript_db_id=_nullable(utrs_df['transcript_db_id']))
+                    utr_rows = _rows(utrs_df, ['gene_db_id', 'transcript_db_id', 'start', 'end', 'feature'])
+                    if utr_rows:
+                        connection.exec_driver_sql(UTR_INSERT, utr_rows)
+
+                    db_session.commit()
+                    print(f"  Processed {total_processed:,} lines...")
+
+            # 4. Spliced length of the transcripts added by this file, from their
+            # exons (an index-only scan of idx_exon_transcript)
+            db_session.connection().exec_driver_sql(SPLICED_LENGTH_UPDATE, (first_new_transcript_id,))
+            # 5. Gene name search index, rebuilt in one go rather than row by row
+            db_session.connection().exec_driver_sql(REBUILD_GENE_SEARCH)
+            db_session.commit()
 
             print("Successfully loaded all features from GTF.")
 
@@ -9,6 +9,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from app.db.session import get_session_local
 from app.models.non_coding_rna import NonCodingRNA
 from app.models.chromosome import Chromosome
+from app.db.bulk_load import deferred_indexes
 import utils.analysis_helpers as analysis_helpers
 
 def parse_rmsk(file_path: str):
@@ -64,39 +65,40 @@ def parse_rmsk(file_path: str):
             comment='#'
         )
         
-        for chunk in reader:
-            chunk_rnas = []
+        with deferred_indexes(db, NonCodingRNA.__table__):
+            for chunk in reader:
+                chunk_rnas = []
             
-            # Filter for RNA
-            # repClass is often 'rRNA', 'tRNA', etc.
-            # Sometimes SINE/LINE etc are there.
+                # Filter for RNA
+                # repClass is often 'rRNA', 'tRNA', etc.
+                # Sometimes SINE/LINE etc are there.
             
-            rna_chunk = chunk[chunk['repClass'].isin(rna_classes) | chunk['repClass'].str.contains('RNA', na=False, case=False)]
-            # Refine filter: exclude simple repeats if they matched 'RNA' vaguely, but explicitly including expected classes is safer.
-            # Actually, standard classes: SINE, LINE, LTR, DNA, Simple_repeat, Low_complexity, Satellite, rRNA, scRNA, snRNA, srpRNA, tRNA, RC, RNA
+                rna_chunk = chunk[chunk['repClass'].isin(rna_classes) | chunk['repClass'].str.contains('RNA', na=False, case=False)]
+                # Refine filter: exclude simple repeats if they matched 'RNA' vaguely, but explicitly including expected classes is safer.
+                # Actually, standard classes: SINE, LINE, LTR, DNA, Simple_repeat, Low_complexity, Satellite, rRNA, scRNA, snRNA, srpRNA, tRNA, RC, RNA
             
-            filtered = chunk[chunk['repClass'].isin(rna_classes)]
+                filtered = chunk[chunk['repClass'].isin(rna_classes)]
             
-            for _, row in filtered.iterrows():
-                chrom_name = row['genoName']
-                if chrom_name not in chrom_map:
-                    continue # Skip unknown chromosomes
+                for _, row in filtered.iterrows():
+                    chrom_name = row['genoName']
+                    if chrom_name not in chrom_map:
+                        continue # Skip unknown chromosomes
                 
-                chunk_rnas.append({
-                    "chromosome_id": chrom_map[chrom_name],
-                    "start_pos": int(row['genoStart']),
-                    "end_pos": int(row['genoEnd']),
-                    "strand": row['strand'],
-                    "rna_type": row['repClass'], # e.g. tRNA
-                    "rna_class": row['repClass'], # same
-                    "rna_name": row['repName']    # e.g. tRNA-Ala
-                })
+                    chunk_rnas.append({
+                        "chromosome_id": chrom_map[chrom_name],
+                        "start_pos": int(row['genoStart']),
+                        "end_pos": int(row['genoEnd']),
+                        "strand": row['strand'],
+                        "rna_type": row['repClass'], # e.g. tRNA
+                        "rna_class": row['repClass'], # same
+                        "rna_name": row['repName']    # e.g. tRNA-Ala
+                    })
             
-            if chunk_rnas:
-                db.bulk_insert_mappings(NonCodingRNA, chunk_rnas)
-                count += len(chunk_rnas)
-                db.commit()
-                print(f"  Loaded {count} non-coding RNAs...")
+                if chunk_rnas:
+                    db.bulk_insert_mappings(NonCodingRNA, chunk_rnas)
+                    count += len(chunk_rnas)
+                    db.commit()
+                    print(f"  Loaded {count} non-coding RNAs...")
                 
     except Exception as e:
         print(f"Error parsing RMSK: {e}")
@@ -0,0 +1,52 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.config import get_settings
+from app.db import releases
+
+USAGE = """Usage:
+  python publish_release.py <release_dir>      finalize (first time only), validate and publish a release
+  python publish_release.py --clean <releases_dir>   remove the builds that were never published
+"""
+
+def publish(release_dir: str, releases_dir: str = None):
+    """
+    Publishes a release built by the pipeline, or one copied from another
+    node: finalizes it unless it already has a manifest, validates it, points
+    <releases_dir>/current at it and prunes old releases. Exits with an error,
+    leaving `current` alone, when validation fails.
+    """
+    settings = get_settings()
+    release_dir = os.path.abspath(release_dir)
+    releases_dir = releases_dir or os.path.dirname(release_dir)
+    print(f"Publishing release: {release_dir}")
+
+    if not os.path.isfile(os.path.join(release_dir, releases.RELEASE_MANIFEST)):
+        print("  Finalizing...")
+        releases.finalize_release(release_dir, settings.FASTA_PATH if settings.SEQUENCE_BACKEND == "fasta" else None)
+        problems = releases.validate_release(release_dir)
+        if not problems:
+            releases.write_manifest(release_dir)
+    else:
+        problems = releases.validate_release(release_dir)
+    if problems:
+        for problem in problems:
+            print(f"  Invalid release: {problem}")
+        sys.exit(1)
+
+    releases.publish_release(releases_dir, release_dir)
+    print(f"  {os.path.join(releases_dir, releases.CURRENT)} -> {os.path.basename(release_dir)}")
+    for removed in releases.prune_releases(releases_dir, settings.RELEASES_KEEP):
+        print(f"  Removed old release: {removed}")
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--clean":
+        for removed in releases.remove_unfinished_releases(sys.argv[2]):
+            print(f"Removed unpublished build: {removed}")
+    elif len(sys.argv) == 2:
+        publish(sys.argv[1])
+    else:
+        print(USAGE)
+        sys.exit(1)
@@ -22,6 +22,13 @@ async def raise_http_exception_endpoint():
 # -----------------------------
 
 
+def _remove_database(db_file):
+    """Removes a SQLite database along with its WAL and shared-memory files."""
+    for path in (db_file, f"{db_file}-wal", f"{db_file}-shm"):
+        if os.path.exists(path):
+            os.remove(path)
+
+
 @pytest.fixture(scope="function") # Changed to function scope
 def setup_test_environment():
     """
@@ -31,8 +38,7 @@ def setup_test_environment():
     env_file = os.path.join(backend_root, "testing.env")
     db_file = os.path.join(backend_root, "test_genome_guides.db")
     # Ensure a clean slate for the test database at the very beginning of the fixture
-    if os.path.exists(db_file):
-        os.remove(db_file)
+    _remove_database(db_file)
     fasta_file = os.path.join(backend_root, "test_hg38.fa")
     gtf_file = os.path.join(backend_root, "test_Homo_sapiens.GRCh38.115.chr.gtf")
     # Create dummy files for testing if they don't exist
@@ -56,11 +62,13 @@ def setup_test_environment():
     with open(gtf_file, "w") as f:
         # Parent Gene
         f.write('1\tensembl_havana\tgene\t10000\t20000\t.\t+\t.\tgene_id "ENSG00000223972"; gene_version "5"; gene_name "DDX11L1"; gene_source "ensembl_havana"; gene_biotype "transcribed_unprocessed_pseudogene";\n')
+        # Transcript for parent
+        f.write('1\tensembl_havana\ttranscript\t10000\t17000\t.\t+\t.\tgene_id "ENSG00000223972"; transcript_id "ENST00000456328"; transcript_name "DDX11L1-202"; transcript_biotype "processed_transcript";\n')
         # Exon for parent
-        f.write('1\tensembl_havana\texon\t10000\t12000\t.\t+\t.\tgene_id "ENSG00000223972"; exon_number "1";\n')
-        f.write('1\tensembl_havana\texon\t15000\t17000\t.\t+\t.\tgene_id "ENSG00000223972"; exon_number "2";\n')
+        f.write('1\tensembl_havana\texon\t10000\t12000\t.\t+\t.\tgene_id "ENSG00000223972"; transcript_id "ENST00000456328"; exon_number "1";\n')
+        f.write('1\tensembl_havana\texon\t15000\t17000\t.\t+\t.\tgene_id "ENSG00000223972"; transcript_id "ENST00000456328"; exon_number "2";\n')
         # UTR for parent
-        f.write('1\tensembl_havana\tUTR\t10000\t10500\t.\t+\t.\tgene_id "ENSG00000223972";\n')
+        f.write('1\tensembl_havana\tUTR\t10000\t10500\t.\t+\t.\tgene_id "ENSG00000223972"; transcript_id "ENST00000456328";\n')
         
         # Nested Gene (entirely inside 10000-20000)
         f.write('1\tensembl_havana\tgene\t13000\t14000\t.\t+\t.\tgene_id "ENSG_NESTED_1"; gene_name "NESTED1";\n')
@@ -76,6 +84,7 @@ def setup_test_environment():
         f.write(f'fasta_file: "{os.path.basename(fasta_file)}"\n') # Use basename for config
         f.write(f'gtf_file: "{os.path.basename(gtf_file)}"\n')
         f.write(f'cpg_island_file: "{os.path.basename(cpg_file)}"\n')
+        f.write('releases_dir: ""\n') # Build in place, at SQLALCHEMY_DATABASE_URL
 
     # Set environment variables for subprocesses and application settings
     os.environ["ENV_FILE"] = env_file
@@ -107,8 +116,10 @@ def setup_test_environment():
         subprocess.run(["snakemake", "--cores", "1", "clean", "--configfile", config_file], cwd=backend_root, check=True, env=updated_env) # Pass the updated environment
         if os.path.exists(env_file):
             os.remove(env_file)
-        if os.path.exists(db_file):
-            os.remove(db_file)
+        # Close pooled connections before the files they point to go away
+        from app.db.session import reset_db_connection
+        reset_db_connection()
+        _remove_database(db_file)
         if os.path.exists(fasta_file):
             os.remove(fasta_file)
         if os.path.exists(gtf_file):
@@ -137,3 +148,26 @@ def client(setup_test_environment):
         yield client
 
 
+
+@pytest.fixture
+def sequence_reads(client):
+    """
+    Records every SQL statement the app runs against the chromosome_sequences
+    table, so tests can assert that metadata endpoints never touch sequence bytes.
+    """
+    from sqlalchemy import event
+    from app.db.session import get_read_engine
+
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if "chromosome_sequences" in statement:
+            statements.append(statement)
+
+    # The API reads through the read-only engine
+    engine = get_read_engine()
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
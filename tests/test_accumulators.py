@@ -0,0 +1,88 @@
+import random
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from analysis import accumulators, kmers
+from app.db.base_class import Base
+from app.models.chromosome import Chromosome
+from app.models.tandem_repeat import TandemRepeat
+from app.utils import twobit
+
+def _random_sequence(length, seed=7):
+    rng = random.Random(seed)
+    # Repeat-rich sequence with N runs so SSRs, CpGs and N-breaks cross window boundaries
+    units = ["AT", "CA", "GC", "CG", "TGC", "ATGC", "A", "C", "G", "T", "NNN"]
+    parts = []
+    while sum(map(len, parts)) < length:
+        parts.append(rng.choice(units) * rng.randint(1, 9))
+    return "".join(parts)[:length]
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add(Chromosome(name="chr1", length=3000))
+    session.commit()
+    yield session
+    session.close()
+
+def _run(acc_type, codes, window, db):
+    accumulator = acc_type("chr1")
+    for start in range(0, len(codes), window):
+        accumulator.update(codes[start:start + window])
+    acc_type.clear_results(db)
+    return acc_type.finalize({"chr1": acc_type.store_results(db, "chr1", accumulator.result())})
+
+@pytest.mark.parametrize("acc_type", accumulators.DEFAULT_ACCUMULATORS)
+@pytest.mark.parametrize("window", [1, 7, 64, 1000])
+def test_windowed_accumulators_match_single_window(acc_type, window, db):
+    codes = twobit.encode_bases(_random_sequence(3000))
+    assert _run(acc_type, codes, window, db) == _run(acc_type, codes, len(codes), db)
+
+def _ssr_hits(codes, window):
+    accumulator = accumulators.SsrAccumulator("chr1")
+    for start in range(0, len(codes), window):
+        accumulator.update(codes[start:start + window])
+    starts, periods, lengths, motifs = accumulator.result()
+    return sorted(zip(starts.tolist(), periods.tolist(), lengths.tolist(), motifs.tolist()))
+
+def _brute_force_ssrs(sequence, min_copies):
+    hits = []
+    for period, copies in min_copies.items():
+        start = 0
+        while start + period <= len(sequence):
+            motif = sequence[start:start + period]
+            end = start + period
+            while end < len(sequence) and sequence[end] == sequence[end - period]:
+                end += 1
+            primitive = all(motif != motif[d:] + motif[:d] or period % d for d in range(1, period))
+            previous_extends = start > 0 and sequence[start - 1] == sequence[start - 1 + period]
+            if ("N" not in motif and primitive and not previous_extends
+                    and (end - start) // period >= copies):
+                hits.append((start, period, end - start, motif))
+            start += 1
+    return sorted(hits)
+
+@pytest.mark.parametrize("window", [1, 7, 64, 1000])
+def test_ssr_scanner_finds_every_perfect_repeat(window):
+    sequence = _random_sequence(3000, seed=11)
+    codes = twobit.encode_bases(sequence)
+    min_copies = accumulators.get_settings().SSR_MIN_COPIES
+    expected = _brute_force_ssrs(sequence, min_copies)
+    assert expected
+    hits = _ssr_hits(codes, window)
+    labels = {p: kmers.kmer_labels(p) for p in min_copies}
+    assert [(s, p, l, labels[p][m]) for s, p, l, m in hits] == expected
+
+def test_ssr_hits_are_stored_as_they_arrive(db):
+    codes = twobit.encode_bases(_random_sequence(3000))
+    summary = _run(accumulators.SsrAccumulator, codes, 64, db)["simple_sequence_repeats"]
+    rows = db.query(TandemRepeat).all()
+    assert summary["total_repeats"] == len(rows) > 0
+    assert summary["total_length_bp"] == sum(row.length for row in rows)
+    assert summary["repeats_by_period"] == {
+        period: sum(row.period == period for row in rows) for period in {row.period for row in rows}
+    }
@@ -9,12 +9,13 @@ def test_get_utr_correlation_statistic(client: TestClient):
     assert isinstance(data["stat_value"], dict)
     
     # Based on conftest.py:
-    # Gene DDX11L1 has 2 exons: 10000-12000 (2001) and 15000-17000 (2001). Total = 4002.
+    # Transcript ENST00000456328 of DDX11L1 has 2 exons: 10000-12000 (2001) and 15000-17000 (2001). Total = 4002.
     # It has 1 UTR: 10000-10500 (501).
     
     assert data["stat_value"]["total_genes_analyzed"] >= 1
-    assert data["stat_value"]["average_transcript_length"] > 0
-    assert data["stat_value"]["average_utr_length"] > 0
+    assert data["stat_value"]["total_transcripts_analyzed"] == 1
+    assert data["stat_value"]["average_transcript_length"] == 4002
+    assert data["stat_value"]["average_utr_length"] == 501
 
 def test_get_nested_genes_statistic(client: TestClient):
     response = client.get("/api/v1/statistics/nested_genes_statistics")
@@ -28,6 +29,27 @@ def test_get_nested_genes_statistic(client: TestClient):
     # NESTED1: 13000-14000 (Inside)
     
     assert data["stat_value"]["total_nested_pairs"] >= 1
-    found_nested = any(p["inner_gene"] == "NESTED1" and p["outer_gene"] == "DDX11L1" 
-                       for p in data["stat_value"]["nested_pairs"])
-    assert found_nested
+    # The pairs themselves are result rows, not part of the statistic
+    assert "nested_pairs" not in data["stat_value"]
+
+    response = client.get("/api/v1/statistics/nested_genes_statistics/results", params={"chromosome": "chr1"})
+    assert response.status_code == 200
+    rows = response.json()
+    assert len(rows) == data["stat_value"]["total_nested_pairs"]
+    nested = [row for row in rows if row["name"] == "NESTED1"]
+    assert len(nested) == 1
+    assert nested[0]["feature_type"] == "nested_gene"
+    assert nested[0]["value"]["outer_gene"] == "DDX11L1"
+    assert nested[0]["chromosome"]["name"] == "chr1"
+
+def test_statistic_results_filters(client: TestClient):
+    url = "/api/v1/statistics/nested_genes_statistics/results"
+    # NESTED1 spans 13000-14000
+    assert [row["name"] for row in client.get(url, params={"start": 13500, "end": 13600}).json()] == ["NESTED1"]
+    assert client.get(url, params={"start": 14001}).json() == []
+    assert client.get(url, params={"type": "other"}).json() == []
+    assert client.get(url, params={"chromosome": "chrX"}).json() == []
+    assert client.get(url, params={"skip": 1}).json() == []
+
+    response = client.get("/api/v1/statistics/NONEXISTENT/results")
+    assert response.status_code == 404
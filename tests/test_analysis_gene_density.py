@@ -21,3 +21,42 @@ def test_get_gene_density_statistic(client: TestClient):
     # If length is 12, bin size 1,000,000. num_bins = ceil(12 / 1M) = 1.
     assert len(bins) > 0
     assert bins[0] >= 1 # Should contain at least the one dummy gene
+
+def test_density_pyramid_matches_brute_force():
+    import numpy as np
+    from analysis.calculate_gene_density import density_pyramid
+
+    rng = np.random.default_rng(3)
+    length = 23_456_789
+    starts = rng.integers(1, length, 2000)
+    ends = starts + rng.integers(0, 300_000, 2000)
+    covered = np.zeros(length, dtype=np.int64)
+    for start, end in zip(starts, ends):
+        covered[start - 1:min(end, length)] = 1
+
+    pyramid = density_pyramid(starts, ends, length)
+    assert sorted(pyramid) == [10_000, 100_000, 1_000_000, 10_000_000]
+    for resolution, (counts, coverage) in pyramid.items():
+        bins = -(-length // resolution)
+        assert counts.tolist() == np.bincount((starts - 1) // resolution, minlength=bins).tolist()
+        assert coverage.tolist() == np.add.reduceat(covered, np.arange(0, length, resolution)).tolist()
+
+def test_read_density(client: TestClient):
+    # The dummy chr1 is 12 bases long: both genes start past its end and count
+    # in the last bin, but cover none of its bases
+    response = client.get("/api/v1/density/genes/chr1")
+    assert response.status_code == 200
+    assert response.json() == {
+        "feature": "genes", "chromosome": "chr1", "resolution": 1000000,
+        "total_bins": 1, "first_bin": 0, "counts": [2], "coverage": [0],
+    }
+    data = client.get("/api/v1/density/cpg_islands/chr1", params={"resolution": 10000}).json()
+    assert (data["total_bins"], data["counts"]) == (1, [1])
+    # Slices past the end of the chromosome are empty
+    data = client.get("/api/v1/density/genes/chr1", params={"resolution": 10000, "start": 20001}).json()
+    assert (data["first_bin"], data["counts"], data["coverage"]) == (1, [], [])
+
+def test_read_density_errors(client: TestClient):
+    assert client.get("/api/v1/density/genes/chr1", params={"resolution": 5000}).status_code == 400
+    assert client.get("/api/v1/density/bogus/chr1").status_code == 404
+    assert client.get("/api/v1/density/genes/chrZ").status_code == 404
@@ -0,0 +1,83 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from analysis.calculate_gene_chromosome_correlation import calculate_gene_chromosome_correlation
+from analysis.calculate_rna_distribution import calculate_rna_distribution
+from analysis.calculate_utr_analysis import calculate_utr_analysis
+from app.config import get_settings
+from app.db.base_class import Base
+from app.models import exon, cpg_island # Register the remaining snapshot tables
+from app.models.chromosome import Chromosome
+from app.models.gene import Gene
+from app.models.non_coding_rna import NonCodingRNA
+from app.models.statistic import GenomeStatistic
+from app.models.transcript import Transcript
+from app.models.utr import Utr
+from utils import analytics, feature_snapshots
+
+STATISTICS = {
+    "gene_density_length_correlation": calculate_gene_chromosome_correlation,
+    "rna_distribution": calculate_rna_distribution,
+    "utr_transcript_correlation": calculate_utr_analysis,
+}
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(get_settings(), "FEATURE_SNAPSHOT_DIR", str(tmp_path / "snapshots"))
+    engine = create_engine(f"sqlite:///{tmp_path / 'analytics.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        Chromosome(id=1, name="chr1", length=50_000),
+        Chromosome(id=2, name="chr2", length=40_000),
+        Chromosome(id=3, name="chrM", length=16_569),
+        Chromosome(id=4, name="chr3", length=30_000),  # No features
+    ])
+    for i in range(1, 31):
+        chromosome_id = 1 + i % 3
+        session.add(Gene(id=i, gene_id=f"G{i}", start_pos=100 * i, end_pos=100 * i + 37 * i, strand="+", chromosome_id=chromosome_id))
+        session.add(Transcript(id=i, transcript_id=f"T{i}", gene_id=i, start_pos=100 * i, end_pos=100 * i + 37 * i,
+                               strand="+", spliced_length=None if i % 7 == 0 else 20 * i + i % 4))
+        if i % 2:
+            session.add(Utr(gene_id=i, transcript_id=i, start_pos=100 * i, end_pos=100 * i + i % 5, utr_type="5_prime_utr"))
+            session.add(Utr(gene_id=i, transcript_id=i, start_pos=100 * i + 30, end_pos=100 * i + 35, utr_type="3_prime_utr"))
+        session.add(Utr(gene_id=i, transcript_id=None, start_pos=1, end_pos=2, utr_type="5_prime_utr"))
+        session.add(NonCodingRNA(chromosome_id=1 + i % 2, start_pos=10 * i, end_pos=10 * i + 5,
+                                 rna_type=["tRNA", "snRNA", None][i % 3], rna_class=["small", None][i % 2]))
+    session.commit()
+    yield session
+    session.close()
+
+def _statistics(db, engine_name, monkeypatch):
+    monkeypatch.setattr(get_settings(), "ANALYTICS_ENGINE", engine_name)
+    for calculate in STATISTICS.values():
+        calculate(db)
+    db.flush()
+    return {name: db.query(GenomeStatistic.stat_value).filter(GenomeStatistic.stat_name == name).scalar() for name in STATISTICS}
+
+def test_engine_selection(db, monkeypatch):
+    # No snapshot of the database yet
+    assert analytics.get_analytics_engine(db).name == "sqlite"
+    feature_snapshots.export_snapshots(db)
+    with analytics.get_analytics_engine(db) as engine:
+        assert engine.name == "duckdb"
+    monkeypatch.setattr(get_settings(), "ANALYTICS_ENGINE", "sqlite")
+    assert analytics.get_analytics_engine(db).name == "sqlite"
+
+def test_engines_produce_identical_statistics(db, monkeypatch):
+    from_sqlite = _statistics(db, "sqlite", monkeypatch)
+    feature_snapshots.export_snapshots(db)
+    from_duckdb = _statistics(db, "duckdb", monkeypatch)
+    assert from_duckdb["rna_distribution"] == from_sqlite["rna_distribution"]
+    assert from_duckdb["rna_distribution"]["counts_by_class"] == {"null": 15, "small": 15}
+    assert [c["chromosome"] for c in from_sqlite["rna_distribution"]["chromosome_distribution"]] == ["chr1", "chr2", "chr3"]
+    assert from_duckdb["utr_transcript_correlation"] == pytest.approx(from_sqlite["utr_transcript_correlation"])
+    correlation_sqlite = from_sqlite["gene_density_length_correlation"]
+    correlation_duckdb = from_duckdb["gene_density_length_correlation"]
+    assert correlation_duckdb["correlation_coefficient"] == pytest.approx(correlation_sqlite["correlation_coefficient"])
+    assert [c["gene_count"] for c in correlation_duckdb["chromosome_data"]] == [10, 10]
+    assert correlation_duckdb["chromosome_data"] == [
+        {**c, "average_gene_length": pytest.approx(c["average_gene_length"])} for c in correlation_sqlite["chromosome_data"]
+    ]
+    assert from_duckdb["utr_transcript_correlation"]["total_transcripts_analyzed"] == 26
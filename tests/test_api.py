@@ -23,6 +23,25 @@ def test_search_genes(client: TestClient):
     assert len(data) > 0
     assert data[0]["gene_name"] == "DDX11L1"
 
+def test_search_genes_ranks_exact_prefix_substring(client: TestClient):
+    # Case-insensitive matches on the name or the Ensembl id
+    assert [g["gene_name"] for g in client.get("/api/v1/genes/search/nested1").json()] == ["NESTED1"]
+    assert [g["gene_name"] for g in client.get("/api/v1/genes/search/ensg_nested_1").json()] == ["NESTED1"]
+    # Prefix matches come in name order
+    assert [g["gene_id"] for g in client.get("/api/v1/genes/search/ENSG").json()] == ["ENSG00000223972", "ENSG_NESTED_1"]
+    # Substrings from three characters on
+    assert [g["gene_name"] for g in client.get("/api/v1/genes/search/x11").json()] == ["DDX11L1"]
+    assert client.get("/api/v1/genes/search/x1").status_code == 404
+    assert len(client.get("/api/v1/genes/search/ENSG", params={"limit": 1}).json()) == 1
+
+def test_autocomplete_genes(client: TestClient):
+    response = client.get("/api/v1/genes/autocomplete", params={"q": "dd"})
+    assert response.status_code == 200
+    assert response.json() == [{"gene_id": "ENSG00000223972", "gene_name": "DDX11L1", "locus": "chr1:10000-20000"}]
+    # Prefix only: no substring matches
+    assert client.get("/api/v1/genes/autocomplete", params={"q": "x11"}).json() == []
+    assert client.get("/api/v1/genes/autocomplete").status_code == 422
+
 def test_search_genes_not_found(client: TestClient):
     response = client.get("/api/v1/genes/search/NONEXISTENT")
     assert response.status_code == 404
@@ -57,19 +76,23 @@ def test_get_simple_sequence_repeats(client: TestClient):
     assert response.status_code == 200
     data = response.json()
     assert data["stat_name"] == "simple_sequence_repeats"
-    assert isinstance(data["stat_value"], dict) # stat_value is now a dict
-    assert "ssrs" in data["stat_value"] # Check for the 'ssrs' key
-    assert isinstance(data["stat_value"]["ssrs"], list) # The actual list of SSRs
-    # The minimal data contains one SSR, so check for len > 0
-    assert len(data["stat_value"]["ssrs"]) > 0 
-    # Validate the structure of an SSR entry
-    ssr_entry = data["stat_value"]["ssrs"][0]
-    assert "chromosome_name" in ssr_entry
-    assert "motif" in ssr_entry
-    assert "count" in ssr_entry
-    assert "length" in ssr_entry
-    assert "start_position" in ssr_entry
-    assert "end_position" in ssr_entry
+    # The stat is a summary; the repeats themselves are in the tandem_repeats table
+    assert data["stat_value"]["total_repeats"] == 1
+    assert data["stat_value"]["repeats_by_period"] == {"4": 1}
+    assert data["stat_value"]["total_length_bp"] == 12
+
+def test_read_tandem_repeats(client: TestClient):
+    response = client.get("/api/v1/tandem-repeats/", params={"chromosome": "chr1"})
+    assert response.status_code == 200
+    data = response.json()
+    # chr1 of the dummy FASTA is ATGCATGCATGC
+    assert len(data) == 1
+    repeat = data[0]
+    assert repeat["chromosome"]["name"] == "chr1"
+    assert (repeat["start_pos"], repeat["end_pos"]) == (1, 12)
+    assert (repeat["period"], repeat["motif"], repeat["copy_number"], repeat["length"]) == (4, "ATGC", 3, 12)
+
+    assert client.get("/api/v1/tandem-repeats/", params={"period": 2}).json() == []
 
 def test_read_chromosome_lengths(client: TestClient):
     response = client.get("/api/v1/chromosomes/lengths")
@@ -175,6 +198,14 @@ def test_get_dinucleotide_frequency(client: TestClient):
     }
     assert data["stat_value"] == expected_dinucleotides
 
+def test_get_trinucleotide_frequency(client: TestClient):
+    response = client.get("/api/v1/statistics/trinucleotide_frequency")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["stat_name"] == "trinucleotide_frequency"
+    # Based on dummy fasta ">chr1\nATGCATGCATGC": ATG, TGC, GCA, CAT, ATG, TGC, GCA, CAT, ATG, TGC
+    assert data["stat_value"] == {"ATG": 3, "TGC": 3, "GCA": 2, "CAT": 2}
+
 def test_get_cpg_frequency_per_chromosome(client: TestClient):
     response = client.get("/api/v1/statistics/cpg_frequency_per_chromosome")
     assert response.status_code == 200
@@ -194,3 +225,43 @@ def test_get_per_chromosome_composition(client: TestClient):
     # Based on dummy fasta ">chr1\nATGCATGCATGC"
     expected_composition = {"A": 3, "T": 3, "C": 3, "G": 3}
     assert data["stat_value"]["chr1"] == expected_composition
+
+def test_stream_chromosome_sequence(client: TestClient):
+    response = client.get("/api/v1/chromosomes/chr1/sequence", params={"start": 2, "end": 9})
+    assert response.status_code == 200
+    assert response.text == "GCATGCA" # ATGCATGCATGC[2:9]
+
+    response = client.get("/api/v1/chromosomes/chr1/sequence", params={"format": "fasta", "line_width": 5},
+                          headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == ">chr1:0-12\nATGCA\nTGCAT\nGC\n"
+
+    for accept_encoding in ["identity", "gzip;q=0", "*, gzip;q=0", "gzip;foo=1;Q=0"]:
+        response = client.get("/api/v1/chromosomes/chr1/sequence", headers={"Accept-Encoding": accept_encoding})
+        assert "content-encoding" not in response.headers
+        assert response.text == "ATGCATGCATGC"
+
+    response = client.get("/api/v1/chromosomes/chr1/sequence", headers={"Accept-Encoding": "identity;q=0.5, *"})
+    assert response.headers["content-encoding"] == "gzip"
+
+def test_stream_ends_when_chromosome_disappears(client: TestClient):
+    from app.api.endpoints.chromosomes import _stream_region
+    # Checked by the request, then gone by the time the body streams
+    assert list(_stream_region("chrUn", 0, 10, "raw", 60, True)) == []
+
+def test_stream_chromosome_sequence_errors(client: TestClient):
+    response = client.get("/api/v1/chromosomes/chrUn/sequence")
+    assert response.status_code == 404
+    response = client.get("/api/v1/chromosomes/chr1/sequence", params={"start": 12})
+    assert response.status_code == 400
+
+def test_metadata_endpoints_never_read_sequences(client: TestClient, sequence_reads):
+    for url in ["/api/v1/chromosomes/", "/api/v1/chromosomes/lengths",
+                "/api/v1/genes/search/DDX11L1", "/api/v1/genes/DDX11L1"]:
+        assert client.get(url).status_code == 200
+    assert sequence_reads == []
+
+    # The guard does see sequence reads
+    assert client.get("/api/v1/chromosomes/chr1/sequence?start=0&end=4").status_code == 200
+    assert sequence_reads
@@ -0,0 +1,75 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base_class import Base
+from app.db.bulk_load import deferred_indexes, secondary_indexes
+from app.models import transcript, utr  # Register the tables genes and exons refer to
+from app.models.chromosome import Chromosome
+from app.models.exon import Exon
+from app.models.gene import Gene
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'bulk_load.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add(Chromosome(id=1, name="chr1", length=1_000_000))
+    session.commit()
+    yield session
+    session.close()
+
+def _schema_objects(db, kind):
+    return {name for name, in db.connection().exec_driver_sql(
+        "SELECT name FROM sqlite_master WHERE type = ?", (kind,)).fetchall()}
+
+def _insert_genes(db):
+    connection = db.connection()
+    connection.exec_driver_sql(
+        "INSERT INTO genes (id, gene_id, gene_name, start_pos, end_pos, strand, chromosome_id) VALUES (?, ?, ?, ?, ?, '+', 1)",
+        [(i, f"G{i}", f"N{i}", 1000 * i, 1000 * i + 500) for i in range(1, 101)])
+    connection.exec_driver_sql(
+        "INSERT INTO exons (gene_id, start_pos, end_pos, exon_number) VALUES (?, ?, ?, 1)",
+        [(i, 1000 * i, 1000 * i + 100) for i in range(1, 101)])
+
+def test_indexes_are_dropped_during_the_load_and_rebuilt(db):
+    tables = (Gene.__table__, Exon.__table__)
+    names = {index.name for table in tables for index in secondary_indexes(table)}
+    assert {"idx_gene_coords", "idx_exon_gene", "idx_exon_transcript"} <= names
+    assert not any(index.unique for table in tables for index in secondary_indexes(table))
+
+    with deferred_indexes(db, *tables):
+        assert not names & _schema_objects(db, "index")
+        assert "ix_genes_gene_id" in _schema_objects(db, "index")  # Unique indexes stay
+        assert not {"genes_rtree_insert", "exons_rtree_insert"} & _schema_objects(db, "trigger")
+        _insert_genes(db)
+
+    assert names <= _schema_objects(db, "index")
+    assert {"genes_rtree_insert", "exons_rtree_insert"} <= _schema_objects(db, "trigger")
+    connection = db.connection()
+    # R*Trees are refilled from the loaded rows, statistics are gathered
+    assert connection.exec_driver_sql("SELECT COUNT(*) FROM exons_rtree WHERE min_chromosome_id = 1").scalar() == 100
+    assert connection.exec_driver_sql("SELECT COUNT(*) FROM sqlite_stat1 WHERE tbl = 'exons'").scalar() > 0
+
+def test_indexes_are_rebuilt_when_the_load_fails(db):
+    with pytest.raises(RuntimeError):
+        with deferred_indexes(db, Gene.__table__):
+            _insert_genes(db)
+            raise RuntimeError("parse error")
+    assert db.query(Gene).count() == 0
+    assert "idx_gene_coords" in _schema_objects(db, "index")
+
+def test_analysis_queries_use_covering_indexes(db):
+    _insert_genes(db)
+    db.connection().exec_driver_sql("ANALYZE")
+    plans = {
+        "SELECT transcript_id, SUM(end_pos - start_pos + 1) FROM utrs WHERE transcript_id IS NOT NULL GROUP BY transcript_id":
+            "COVERING INDEX idx_utr_transcript",
+        "SELECT gene_id, SUM(end_pos - start_pos + 1) FROM exons GROUP BY gene_id":
+            "COVERING INDEX idx_exon_gene",
+        "SELECT chromosome_id, COUNT(id), AVG(end_pos - start_pos + 1) FROM genes GROUP BY chromosome_id":
+            "COVERING INDEX idx_gene_coords",
+    }
+    for query, index in plans.items():
+        plan = " ".join(row[-1] for row in db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {query}").fetchall())
+        assert index in plan, plan
@@ -0,0 +1,100 @@
+import random
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from analysis import accumulators
+from app.db.base_class import Base
+from app.models.chromosome import Chromosome
+from app.models.composition_index import CompositionIndex
+from app.services import composition
+from app.utils import twobit
+
+def _random_sequence(length, seed=11):
+    rng = random.Random(seed)
+    units = ["CG", "CGCG", "GC", "AT", "C", "G", "acgt", "N", "NNNN"]
+    parts = []
+    while sum(map(len, parts)) < length:
+        parts.append(rng.choice(units) * rng.randint(1, 5))
+    return "".join(parts)[:length]
+
+# Not a multiple of the sample interval, with CpGs across block edges
+SEQUENCE = _random_sequence(5 * composition.COMPOSITION_SAMPLE_INTERVAL + 321)
+
+def _index(codes, window):
+    accumulator = accumulators.CompositionIndexAccumulator("chrT")
+    for start in range(0, len(codes), window):
+        accumulator.update(codes[start:start + window])
+    return accumulator.result()
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'composition.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    chromosome = Chromosome(name="chrT")
+    chromosome.set_sequence(SEQUENCE)
+    session.add(chromosome)
+    session.commit()
+    codes = twobit.encode_bases(SEQUENCE)
+    accumulators.CompositionIndexAccumulator.clear_results(session)
+    accumulators.CompositionIndexAccumulator.store_results(session, "chrT", _index(codes, 4096))
+    session.commit()
+    yield session
+    session.close()
+
+def _brute_force(start, end):
+    region = SEQUENCE[start:end].upper()
+    counts = {base: region.count(base) for base in "ACGTN"}
+    return counts, region.count("CG")
+
+def test_index_rows_are_prefix_counts():
+    codes = twobit.encode_bases(SEQUENCE)
+    index = _index(codes, 777)
+    interval = composition.COMPOSITION_SAMPLE_INTERVAL
+    assert index.shape == (-(-len(SEQUENCE) // interval) + 1, 6)
+    for row in range(len(index)):
+        counts, _ = _brute_force(0, min(row * interval, len(SEQUENCE)))
+        # The CpG column counts CpGs by their C, so one may reach past the row edge
+        cpgs = SEQUENCE[:min(row * interval + 1, len(SEQUENCE))].upper().count("CG")
+        assert index[row].tolist() == [counts[b] for b in "ACGTN"] + [cpgs]
+    assert np.array_equal(index, _index(codes, 1000))
+
+def test_region_composition_matches_brute_force(db):
+    rng = random.Random(3)
+    length = len(SEQUENCE)
+    regions = [(0, length), (0, 0), (999, 1001), (1000, 2000), (length - 5, length), (4321, 4322)]
+    regions += [tuple(sorted(rng.sample(range(length + 1), 2))) for _ in range(200)]
+    for start, end in regions:
+        result = composition.region_composition(db, "chrT", start, end)
+        counts, cpgs = _brute_force(start, end)
+        assert result["base_counts"] == counts, (start, end)
+        assert result["cpg_count"] == cpgs, (start, end)
+        assert (result["start"], result["end"], result["length"]) == (start + 1, end, end - start)
+
+def test_region_composition_unknown_chromosome(db):
+    assert composition.region_composition(db, "chrUn", 0, 10) is None
+    db.query(CompositionIndex).delete()
+    assert composition.region_composition(db, "chrT", 0, 10) is None
+
+def test_composition_endpoints(client: TestClient):
+    # chr1 of the dummy FASTA is ATGCATGCATGC
+    response = client.get("/api/v1/composition/chr1:1-12")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["base_counts"] == {"A": 3, "C": 3, "G": 3, "T": 3, "N": 0}
+    assert (data["start"], data["end"], data["length"], data["cpg_count"], data["gc_content"]) == (1, 12, 12, 0, 50.0)
+
+    response = client.post("/api/v1/composition/", json={"regions": ["chr1:3-4", "chr1:2-2"]})
+    assert response.status_code == 200
+    assert [r["base_counts"] for r in response.json()] == [
+        {"A": 0, "C": 1, "G": 1, "T": 0, "N": 0}, {"A": 0, "C": 0, "G": 0, "T": 1, "N": 0},
+    ]
+
+    assert client.get("/api/v1/composition/chr1:5-2").status_code == 400
+    assert client.get("/api/v1/composition/chrZ:1-10").status_code == 404
+    assert client.post("/api/v1/composition/", json={"regions": ["chr1:1-5", "chr1"]}).status_code == 400
+    assert client.post("/api/v1/composition/", json={"regions": []}).status_code == 422
@@ -0,0 +1,73 @@
+import pytest
+from Bio import bgzf
+
+from app.services.sequence_store import FastaSequenceStore
+from app.utils import faidx, twobit
+
+SEQUENCES = {
+    "chrA": "NNNNNNNNacgtacgtACGTTTGACnnnnGGCCAATT" * 30,
+    "chrB": "ACGTNNNNacgt" * 7 + "GAT",
+}
+
+def _fasta_text(line_width):
+    lines = []
+    for name, seq in SEQUENCES.items():
+        lines.append(f">{name} test sequence")
+        lines.extend(seq[i:i + line_width] for i in range(0, len(seq), line_width))
+    return "\n".join(lines) + "\n"
+
+@pytest.fixture(params=["plain", "bgzip"])
+def fasta_path(request, tmp_path):
+    path = tmp_path / ("genome.fa" if request.param == "plain" else "genome.fa.gz")
+    if request.param == "plain":
+        path.write_text(_fasta_text(60))
+    else:
+        # Small blocks so regions span several BGZF blocks
+        with bgzf.BgzfWriter(str(path), "wb") as handle:
+            text = _fasta_text(50).encode()
+            for i in range(0, len(text), 300):
+                handle.write(text[i:i + 300])
+                handle.flush()
+    return str(path)
+
+def test_fai_matches_layout(fasta_path):
+    entries = {e.name: e for e in faidx.load_or_build_fai(fasta_path)}
+    assert {name: e.length for name, e in entries.items()} == {n: len(s) for n, s in SEQUENCES.items()}
+
+def test_fetch_regions(fasta_path):
+    store = FastaSequenceStore(fasta_path)
+    for name, seq in SEQUENCES.items():
+        for start, end in [(0, 7), (55, 181), (59, 61), (3, len(seq))]:
+            assert store.fetch(name, start, end) == seq[start:end]
+            assert store.fetch(name, start, end, soft_mask=False) == seq[start:end].upper()
+    with store.open("chrA") as handle:
+        assert handle.read_codes(0, 40).tolist() == twobit.encode_bases(SEQUENCES["chrA"][:40]).tolist()
+    assert store.fetch("chrZ", 0, 10) is None
+
+def test_rewritten_fasta_is_remapped(tmp_path):
+    path = tmp_path / "genome.fa"
+    path.write_text(">chrA\nACGT\n")
+    assert FastaSequenceStore(str(path)).fetch("chrA", 0, 4) == "ACGT"
+    path.write_text(">chrA\nGGGGCC\n")
+    assert FastaSequenceStore(str(path)).fetch("chrA", 0, 6) == "GGGGCC"
+
+def test_replaced_mapping_is_closed_after_its_last_reader(tmp_path):
+    # The same FASTA in two releases
+    old, new = tmp_path / "r1" / "genome.fa", tmp_path / "r2" / "genome.fa"
+    for path, sequence in [(old, "ACGT"), (new, "GGCC")]:
+        path.parent.mkdir()
+        path.write_text(f">chrA\n{sequence}\n")
+
+    reader = FastaSequenceStore(str(old)).open("chrA")
+    old_mapping = reader._fasta
+    assert FastaSequenceStore(str(new)).fetch("chrA", 0, 4) == "GGCC"
+    # Replaced, but still mapped for the reader that holds it
+    assert reader.read() == "ACGT"
+    reader.close()
+    assert old_mapping._data.closed
+
+    new_mapping = faidx.acquire_fasta(str(new))
+    faidx.release_fasta(new_mapping)
+    assert not new_mapping._data.closed  # The current mapping stays cached
+    assert FastaSequenceStore(str(old)).fetch("chrA", 0, 4) == "ACGT"
+    assert new_mapping._data.closed  # Replaced with no readers: closed at once
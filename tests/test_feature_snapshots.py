@@ -0,0 +1,96 @@
+import os
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base_class import Base
+from app.db.bulk_load import deferred_indexes
+from app.models.chromosome import Chromosome
+from app.models.gene import Gene
+from app.models.transcript import Transcript
+from app.models.utr import Utr
+from app.models import exon, cpg_island, non_coding_rna # Register the remaining snapshot tables
+from utils import feature_snapshots
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'snapshots.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    # Chromosome ids out of name order, to check rows are grouped by id
+    chromosomes = [Chromosome(id=2, name="chr10", length=10_000), Chromosome(id=1, name="chr2", length=20_000)]
+    session.add_all(chromosomes)
+    genes = [
+        Gene(id=1, gene_id="G1", gene_name="A", start_pos=100, end_pos=900, strand="+", chromosome_id=2),
+        Gene(id=2, gene_id="G2", gene_name=None, start_pos=50, end_pos=60, strand="-", chromosome_id=1),
+        Gene(id=3, gene_id="G3", gene_name="C", start_pos=5, end_pos=500, strand="+", chromosome_id=2),
+    ]
+    session.add_all(genes)
+    session.add_all([
+        Transcript(id=1, transcript_id="T1", gene_id=1, start_pos=100, end_pos=900, strand="+", spliced_length=400),
+        Transcript(id=2, transcript_id="T2", gene_id=2, start_pos=50, end_pos=60, strand="-", spliced_length=None),
+    ])
+    session.add_all([
+        Utr(id=1, gene_id=1, transcript_id=1, start_pos=100, end_pos=150, utr_type="5_prime_utr"),
+        Utr(id=2, gene_id=2, transcript_id=None, start_pos=50, end_pos=52, utr_type="3_prime_utr"),
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+def _sorted(columns):
+    order = np.lexsort((columns["id"], columns["chromosome_id"]))
+    return {name: values[order].tolist() for name, values in columns.items()}
+
+def test_snapshot_matches_database(db, tmp_path):
+    directory = str(tmp_path / "snapshots")
+    counts = feature_snapshots.export_snapshots(db, directory)
+    assert counts == {"genes": 3, "transcripts": 2, "exons": 0, "utrs": 2, "cpg_islands": 0, "non_coding_rnas": 0}
+    assert sorted(os.listdir(os.path.join(directory, "genes"))) == ["chromosome=chr10", "chromosome=chr2"]
+    assert feature_snapshots.snapshot_directory(db, directory) == directory
+
+    for table, columns in [
+        ("genes", ["chromosome_id", "id", "gene_id", "gene_name", "start_pos", "end_pos"]),
+        ("transcripts", ["chromosome_id", "id", "gene_id", "spliced_length"]),
+        ("utrs", ["chromosome_id", "id", "transcript_id", "utr_type"]),
+        ("exons", ["chromosome_id", "id", "start_pos"]),
+    ]:
+        from_snapshot = feature_snapshots.load_features(db, table, columns, directory=directory)
+        from_database = feature_snapshots.load_features(db, table, columns, directory=str(tmp_path / "missing"))
+        assert _sorted(from_snapshot) == _sorted(from_database)
+
+    genes = feature_snapshots.load_features(db, "genes", ["id", "gene_name", "end_pos"], directory=directory)
+    assert genes["end_pos"].dtype == np.int64
+    assert sorted(zip(genes["id"].tolist(), genes["gene_name"].tolist())) == [(1, "A"), (2, None), (3, "C")]
+    transcripts = feature_snapshots.load_features(db, "transcripts", ["id", "spliced_length"], directory=directory)
+    assert sorted(zip(*(c.tolist() for c in transcripts.values()))) == [(1, 400), (2, feature_snapshots.MISSING)]
+
+def test_load_features_by_chromosome(db, tmp_path):
+    directory = str(tmp_path / "snapshots")
+    feature_snapshots.export_snapshots(db, directory)
+    for source in (directory, str(tmp_path / "missing")):
+        genes = feature_snapshots.load_features(db, "genes", ["id"], chromosome_names=["chr10"], directory=source)
+        assert genes["id"].tolist() == [1, 3]
+
+def test_snapshot_of_another_database_is_ignored(db, tmp_path):
+    directory = str(tmp_path / "snapshots")
+    feature_snapshots.export_snapshots(db, directory)
+    other = create_engine(f"sqlite:///{tmp_path / 'other.db'}")
+    Base.metadata.create_all(bind=other)
+    with sessionmaker(bind=other)() as session:
+        assert feature_snapshots.snapshot_directory(session, directory) is None
+        assert len(feature_snapshots.load_features(session, "genes", ["id"], directory=directory)["id"]) == 0
+
+def test_snapshot_of_a_reloaded_table_is_ignored(db, tmp_path):
+    directory = str(tmp_path / "snapshots")
+    feature_snapshots.export_snapshots(db, directory)
+    # Reloaded in place: same database file, different rows
+    with deferred_indexes(db, Utr.__table__):
+        db.query(Utr).delete()
+        db.add(Utr(id=1, gene_id=1, transcript_id=1, start_pos=100, end_pos=180, utr_type="5_prime_utr"))
+    assert feature_snapshots.snapshot_directory(db, directory) is None
+    assert feature_snapshots.snapshot_directory(db, directory, ("genes",)) == directory
+    utrs = feature_snapshots.load_features(db, "utrs", ["id", "end_pos"], directory=directory)
+    assert utrs["end_pos"].tolist() == [180]
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from app.utils.intervals import IntervalIndex
+
+def _random_intervals(count, seed):
+    rng = np.random.default_rng(seed)
+    starts = rng.integers(1, 2000, count)
+    # Mostly short intervals plus a few long ones that contain many others
+    lengths = np.where(rng.random(count) < 0.1, rng.integers(200, 1500, count), rng.integers(0, 60, count))
+    return starts, starts + lengths
+
+def _pairs(queries, ids):
+    return sorted(zip(queries.tolist(), ids.tolist()))
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_queries_match_brute_force(seed):
+    starts, ends = _random_intervals(400, seed)
+    # Duplicates and identical starts
+    starts = np.concatenate([starts, starts[:20], starts[:10]])
+    ends = np.concatenate([ends, ends[:20], starts[:10] + 5])
+    query_starts, query_ends = _random_intervals(300, seed + 100)
+    index = IntervalIndex(starts, ends)
+
+    overlap = (starts[None, :] <= query_ends[:, None]) & (ends[None, :] >= query_starts[:, None])
+    contain = (starts[None, :] <= query_starts[:, None]) & (ends[None, :] >= query_ends[:, None])
+
+    assert _pairs(*index.overlaps(query_starts, query_ends)) == _pairs(*np.nonzero(overlap))
+    assert _pairs(*index.containing(query_starts, query_ends)) == _pairs(*np.nonzero(contain))
+    assert index.count_overlaps(query_starts, query_ends).tolist() == overlap.sum(axis=1).tolist()
+
+    nearest, distance = index.nearest(query_starts, query_ends)
+    gaps = np.maximum(np.maximum(starts[None, :] - query_ends[:, None], query_starts[:, None] - ends[None, :]), 0)
+    assert distance.tolist() == gaps.min(axis=1).tolist()
+    assert (gaps[np.arange(len(query_starts)), nearest] == distance).all()
+
+def test_nearest_prefers_upstream_and_handles_empty_index():
+    index = IntervalIndex([10, 30], [20, 40])
+    nearest, distance = index.nearest([25, 5, 45, 15], [25, 5, 50, 16])
+    assert nearest.tolist() == [0, 0, 1, 0]
+    assert distance.tolist() == [5, 5, 5, 0]
+
+    nearest, _ = IntervalIndex([], []).nearest([1], [2])
+    assert nearest.tolist() == [-1]
+    assert IntervalIndex([], []).overlaps([1], [2])[0].tolist() == []
+
+def test_closed_interval_boundaries():
+    index = IntervalIndex([10], [20])
+    assert index.count_overlaps([1, 20, 21, 5], [10, 30, 30, 9]).tolist() == [1, 1, 0, 0]
@@ -0,0 +1,28 @@
+from collections import Counter
+
+import pytest
+
+from analysis import kmers
+from app.utils import twobit
+
+SEQUENCE = "ACGTNACGTTGCAnnACGCGCGATATGGCCNNNNTTAGGCA"
+
+def _naive_counts(sequence, k):
+    sequence = sequence.upper()
+    windows = (sequence[i:i + k] for i in range(len(sequence) - k + 1))
+    return Counter(w for w in windows if "N" not in w)
+
+@pytest.mark.parametrize("k", range(1, kmers.MAX_K + 1))
+def test_count_kmers_matches_naive_count_and_skips_n_breaks(k):
+    counts = kmers.count_kmers(twobit.encode_bases(SEQUENCE), k)
+    assert len(counts) == 4 ** k
+    assert kmers.kmer_frequencies(counts, k) == dict(_naive_counts(SEQUENCE, k))
+
+def test_count_kmers_across_chunk_boundaries(monkeypatch):
+    monkeypatch.setattr(kmers, "KMER_CHUNK_SIZE", 5)
+    counts = kmers.count_kmers(twobit.encode_bases(SEQUENCE), 3)
+    assert kmers.kmer_frequencies(counts, 3) == dict(_naive_counts(SEQUENCE, 3))
+
+def test_count_kmers_rejects_unsupported_k():
+    with pytest.raises(ValueError):
+        kmers.count_kmers(twobit.encode_bases(SEQUENCE), 9)
@@ -0,0 +1,63 @@
+import math
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from analysis import accumulators
+from analysis.calculate_profile_tracks import profile_tracks, window_counts
+from app.services import composition
+from app.utils import twobit
+
+def _index(sequence):
+    accumulator = accumulators.CompositionIndexAccumulator("chrT")
+    accumulator.update(twobit.encode_bases(sequence))
+    return accumulator.result()
+
+def test_window_counts_match_brute_force():
+    rng = np.random.default_rng(5)
+    sequence = "".join(rng.choice(list("ACGTNacgt"), 23_456))
+    interval = composition.COMPOSITION_SAMPLE_INTERVAL
+    cumulative = _index(sequence)
+    for window in (interval, 10 * interval):
+        counts = window_counts(cumulative, interval, window)
+        assert len(counts) == -(-len(sequence) // window)
+        for i, row in enumerate(counts):
+            chunk = sequence[i * window:(i + 1) * window].upper()
+            # CpGs count in the window of their C
+            cpgs = sequence[i * window:(i + 1) * window + 1].upper().count("CG")
+            assert row.tolist() == [chunk.count(b) for b in "ACGTN"] + [cpgs]
+    with pytest.raises(ValueError):
+        window_counts(cumulative, interval, interval + 1)
+
+def test_profile_tracks_values():
+    # A, C, G, T, N, CpG per window: mixed, no C or G, all N
+    counts = np.array([[10, 20, 30, 40, 0, 6], [50, 0, 0, 50, 0, 0], [0, 0, 0, 0, 100, 0]])
+    tracks = profile_tracks(counts)
+    assert tracks["gc_content"][:2].tolist() == [50.0, 0.0]
+    assert tracks["gc_skew"][0] == pytest.approx(0.2)
+    assert tracks["cumulative_gc_skew"].tolist() == pytest.approx([0.2, 0.2, 0.2])
+    assert tracks["cpg_oe"][0] == pytest.approx(6 * 100 / (20 * 30))
+    expected_entropy = -sum(p * math.log2(p) for p in (0.1, 0.2, 0.3, 0.4))
+    assert tracks["entropy"][:2].tolist() == pytest.approx([expected_entropy, 1.0])
+    for track in ("gc_content", "gc_skew", "cpg_oe", "entropy"):
+        assert np.isnan(tracks[track][2])
+    assert np.isnan(tracks["gc_skew"][1]) and np.isnan(tracks["cpg_oe"][1])
+
+def test_read_track(client: TestClient):
+    # chr1 of the dummy FASTA is ATGCATGCATGC: one window at every size
+    response = client.get("/api/v1/tracks/gc_content/chr1", params={"window": 1000})
+    assert response.status_code == 200
+    assert response.json() == {
+        "track": "gc_content", "chromosome": "chr1", "window": 1000,
+        "total_bins": 1, "first_bin": 0, "values": [50.0],
+    }
+    assert client.get("/api/v1/tracks/entropy/chr1").json()["values"] == [2.0]
+    assert client.get("/api/v1/tracks/cpg_oe/chr1").json()["values"] == [0.0]
+    data = client.get("/api/v1/tracks/gc_skew/chr1", params={"window": 1000, "start": 1001}).json()
+    assert (data["first_bin"], data["values"]) == (1, [])
+
+def test_read_track_errors(client: TestClient):
+    assert client.get("/api/v1/tracks/gc_content/chr1", params={"window": 5000}).status_code == 400
+    assert client.get("/api/v1/tracks/bogus/chr1").status_code == 404
+    assert client.get("/api/v1/tracks/gc_content/chrZ").status_code == 404
@@ -0,0 +1,34 @@
+from fastapi.testclient import TestClient
+
+def test_region_returns_overlapping_features(client: TestClient):
+    # DDX11L1 10000-20000 holds NESTED1 13000-14000, exons 10000-12000 and
+    # 15000-17000, and overlaps the CpG island 11000-12000
+    response = client.get("/api/v1/regions/chr1:11,500-13,500")
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["chromosome"], data["start"], data["end"]) == ("chr1", 11500, 13500)
+    features = data["features"]
+    assert [g["name"] for g in features["genes"]] == ["DDX11L1", "NESTED1"]
+    assert features["genes"][0]["strand"] == "+"
+    assert [(e["start_pos"], e["end_pos"], e["name"]) for e in features["exons"]] == [(10000, 12000, "ENST00000456328")]
+    assert [(c["start_pos"], c["end_pos"]) for c in features["cpg_islands"]] == [(11000, 12000)]
+    assert features["non_coding_rnas"] == []
+
+def test_region_bounds_are_inclusive_and_types_filter(client: TestClient):
+    response = client.get("/api/v1/regions/chr1:14000-14999", params={"types": ["genes", "exons"]})
+    assert response.status_code == 200
+    features = response.json()["features"]
+    assert set(features) == {"genes", "exons"}
+    assert [g["name"] for g in features["genes"]] == ["DDX11L1", "NESTED1"]
+    assert features["exons"] == []
+
+    features = client.get("/api/v1/regions/chr1:20001-30000").json()["features"]
+    assert all(not rows for rows in features.values())
+
+def test_region_errors(client: TestClient):
+    assert client.get("/api/v1/regions/chr1:200-100").status_code == 400
+    assert client.get("/api/v1/regions/chr1").status_code == 400
+    assert client.get("/api/v1/regions/chr1:1-10", params={"types": ["bogus"]}).status_code == 400
+    response = client.get("/api/v1/regions/chrZ:1-10")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Chromosome not found"}
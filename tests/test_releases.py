@@ -0,0 +1,110 @@
+import json
+import os
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import get_settings
+from app.db import releases
+from app.db.session import get_read_engine, make_engine, reset_db_connection
+
+def _build(releases_dir, name, genes=1):
+    """A finished pipeline build: a WAL-mode database with the required tables."""
+    release_dir = releases_dir / name
+    release_dir.mkdir(parents=True)
+    engine = make_engine(releases.release_database_url(release_dir), "default")
+    with engine.begin() as connection:
+        for table in releases.REQUIRED_TABLES:
+            connection.exec_driver_sql(f"CREATE TABLE {table} (id INTEGER PRIMARY KEY, name TEXT)")
+            connection.exec_driver_sql(f"INSERT INTO {table} (name) VALUES ('{name}')")
+        for i in range(1, genes):
+            connection.exec_driver_sql(f"INSERT INTO genes (name) VALUES ('{name}-{i}')")
+    engine.dispose()  # The pipeline's loaders have exited by the time it publishes
+    return release_dir
+
+def _publish(releases_dir, release_dir, fasta_path=None):
+    releases.finalize_release(release_dir, fasta_path)
+    assert releases.validate_release(release_dir) == []
+    releases.write_manifest(release_dir)
+    releases.publish_release(releases_dir, release_dir)
+
+@pytest.fixture
+def releases_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(get_settings(), "RELEASES_DIR", str(tmp_path / "releases"))
+    yield tmp_path / "releases"
+    reset_db_connection()
+
+def test_release_is_finalized_and_published(releases_dir, tmp_path):
+    fasta = tmp_path / "genome.fa"
+    fasta.write_text(">chr1\nACGT\n")
+    (tmp_path / "genome.fa.fai").write_text("chr1\t4\t6\t4\t5\n")
+    release_dir = _build(releases_dir, "r1")
+    _publish(releases_dir, release_dir, str(fasta))
+
+    assert os.path.islink(releases_dir / releases.CURRENT)
+    assert releases.current_release(releases_dir) == os.path.realpath(release_dir)
+    # A single self-contained, read-only database file
+    assert not os.path.exists(f"{release_dir / releases.RELEASE_DATABASE}-wal")
+    assert sqlite3.connect(release_dir / releases.RELEASE_DATABASE).execute("PRAGMA journal_mode").fetchone() == ("delete",)
+    assert not os.access(release_dir / releases.RELEASE_DATABASE, os.W_OK) or os.geteuid() == 0
+    manifest = json.loads((release_dir / releases.RELEASE_MANIFEST).read_text())
+    assert set(manifest["files"]) == {releases.RELEASE_DATABASE, "sequence/genome.fa", "sequence/genome.fa.fai"}
+
+def test_invalid_releases_are_reported(releases_dir):
+    assert releases.validate_release(releases_dir / "missing") != []
+
+    empty = _build(releases_dir, "empty")
+    sqlite3.connect(empty / releases.RELEASE_DATABASE, isolation_level=None).execute("DELETE FROM genes")
+    assert releases.validate_release(empty) == ["Table genes is empty"]
+
+    # A copy from another node that lost a file on the way
+    copied = _build(releases_dir, "copied")
+    (copied / "snapshots").mkdir()
+    (copied / "snapshots" / "genes.parquet").write_bytes(b"PAR1")
+    releases.finalize_release(copied)
+    releases.write_manifest(copied)
+    os.remove(copied / "snapshots" / "genes.parquet")
+    assert releases.validate_release(copied) == ["snapshots/genes.parquet is missing or has the wrong size"]
+    assert releases.current_release(releases_dir) is None
+
+def test_read_engine_follows_current_release(releases_dir):
+    _publish(releases_dir, _build(releases_dir, "r1", genes=1))
+    with get_read_engine().connect() as connection:
+        assert connection.exec_driver_sql("SELECT COUNT(*) FROM genes").scalar() == 1
+        # Published releases are opened immutable and read-only
+        assert connection.exec_driver_sql("PRAGMA query_only").scalar() == 1
+
+    _publish(releases_dir, _build(releases_dir, "r2", genes=3))
+    with get_read_engine().connect() as connection:
+        assert connection.exec_driver_sql("SELECT COUNT(*) FROM genes").scalar() == 3
+
+def test_old_releases_are_pruned(releases_dir):
+    for i, name in enumerate(["r1", "r2", "r3", "r4"]):
+        release_dir = _build(releases_dir, name)
+        _publish(releases_dir, release_dir)
+        os.utime(release_dir / releases.RELEASE_MANIFEST, (1_000_000 + i, 1_000_000 + i))
+    unfinished = _build(releases_dir, "r5")
+    # Repoint current at an old release (a rollback); it must be kept
+    releases.publish_release(releases_dir, releases_dir / "r1")
+
+    removed = releases.prune_releases(releases_dir, keep=2)
+    assert sorted(os.path.basename(d) for d in removed) == ["r2"]
+    assert releases.remove_unfinished_releases(releases_dir) == [str(unfinished)]
+    assert sorted(os.listdir(releases_dir)) == [releases.CURRENT, "r1", "r3", "r4"]
+
+def test_submitted_variants_are_kept_outside_releases(releases_dir, tmp_path, monkeypatch):
+    monkeypatch.setattr(get_settings(), "SQLALCHEMY_DATABASE_URL", f"sqlite:///{tmp_path / 'variants.db'}")
+    reset_db_connection()
+    _publish(releases_dir, _build(releases_dir, "r1"))
+    from app.main import create_app
+    variant = {"rsid": "rs334", "chromosome": "chr11", "position": 5227002,
+               "reference": "T", "alternate": "A", "gene_symbol": "HBB"}
+
+    with TestClient(create_app()) as client:
+        assert client.post("/api/v1/variants/", json=variant).status_code == 201
+        assert client.get("/api/v1/variants/rs334").json()["gene_symbol"] == "HBB"
+        # Still there once a new release is published
+        _publish(releases_dir, _build(releases_dir, "r2"))
+        assert [v["rsid"] for v in client.get("/api/v1/variants/").json()] == ["rs334"]
+        assert get_read_engine().url.database.endswith("r2/genome_guides.db")
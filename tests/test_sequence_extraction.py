@@ -0,0 +1,105 @@
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base_class import Base
+from app.models.chromosome import Chromosome
+from app.services import sequence_extraction
+from app.services.sequence_extraction import SequenceInterval, extract_sequences, reverse_complement
+from app.services.sequence_store import get_sequence_store
+
+SEQUENCES = {
+    "chrA": ("NNNNacgtACGTTTGACnnnnGGCCAATT" * 300) + "ACGTNNNNacgt",
+    "chrB": "GATTACA" * 500,
+}
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'extract.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    for name, sequence in SEQUENCES.items():
+        chromosome = Chromosome(name=name)
+        chromosome.set_sequence(sequence)
+        session.add(chromosome)
+    session.commit()
+    yield session
+    session.close()
+
+class _CountingStore:
+    """Wraps a sequence store, recording every region read."""
+    def __init__(self, store):
+        self.store = store
+        self.reads = []
+
+    def open(self, chromosome_name):
+        handle = self.store.open(chromosome_name)
+        if handle is not None:
+            read = handle.read
+            def counting_read(start=0, end=None, soft_mask=True):
+                self.reads.append((chromosome_name, start, end))
+                return read(start, end, soft_mask=soft_mask)
+            handle.read = counting_read
+        return handle
+
+def test_reverse_complement():
+    assert reverse_complement("ACGTNacgtn") == "nacgtNACGT"
+
+def test_extract_matches_slices(db):
+    rng = random.Random(7)
+    intervals = []
+    for i in range(500):
+        name = rng.choice(sorted(SEQUENCES))
+        start = rng.randrange(len(SEQUENCES[name]))
+        intervals.append(SequenceInterval(name, start, start + rng.randint(1, 300), f"r{i}", rng.choice("+-.")))
+    store = _CountingStore(get_sequence_store(db))
+    results = list(extract_sequences(store, intervals, max_gap=100, max_span=2000))
+
+    assert sorted(results) == sorted(
+        (i, reverse_complement(SEQUENCES[i.chromosome][i.start:i.end]) if i.strand == "-" else SEQUENCES[i.chromosome][i.start:i.end])
+        for i in intervals
+    )
+    # Chromosome by chromosome, sorted by start, each span read once in increasing order
+    assert [i.chromosome for i, _ in results] == sorted((i.chromosome for i in intervals), key=[i.chromosome for i in intervals].index)
+    for name in SEQUENCES:
+        spans = [(start, end) for chrom, start, end in store.reads if chrom == name]
+        assert all(a[0] < b[0] for a, b in zip(spans, spans[1:]))
+        assert all(end - start <= 2000 for start, end in spans)
+    assert len(store.reads) < len(intervals) / 4
+
+def test_extract_coalesces_into_one_read(db):
+    intervals = [SequenceInterval("chrB", start, start + 10) for start in range(3000, 0, -100)]
+    store = _CountingStore(get_sequence_store(db))
+    results = list(extract_sequences(store, intervals))
+    assert store.reads == [("chrB", 100, 3010)]
+    assert [i.start for i, _ in results] == list(range(100, 3001, 100))
+
+def test_extract_unknown_chromosome(db):
+    with pytest.raises(ValueError):
+        list(extract_sequences(get_sequence_store(db), [SequenceInterval("chrUn", 0, 10)]))
+
+def test_fasta_headers():
+    sequence = "ACGTACG"
+    assert sequence_extraction.format_fasta(SequenceInterval("chr1", 2, 9, "exon1", "-"), sequence, 3) == ">exon1::chr1:2-9(-)\nACG\nTAC\nG\n"
+    assert sequence_extraction.format_fasta(SequenceInterval("chr1", 2, 9, strand="."), sequence) == ">chr1:2-9\nACGTACG\n"
+
+def test_sequence_batch_endpoint(client: TestClient):
+    # chr1 of the dummy FASTA is ATGCATGCATGC
+    response = client.post("/api/v1/sequences/batch", json={"intervals": [
+        {"chromosome": "chr1", "start": 8, "end": 12, "name": "b"},
+        {"chromosome": "chr1", "start": 0, "end": 5, "name": "a", "strand": "-"},
+    ], "line_width": 4})
+    assert response.status_code == 200
+    assert response.text == ">a::chr1:0-5(-)\nTGCA\nT\n>b::chr1:8-12(+)\nATGC\n"
+
+def test_sequence_batch_errors(client: TestClient):
+    def post(*intervals):
+        return client.post("/api/v1/sequences/batch", json={"intervals": [
+            dict(zip(("chromosome", "start", "end"), i)) for i in intervals]}).status_code
+    assert post(("chrZ", 0, 5)) == 404
+    assert post(("chr1", 0, 13)) == 400
+    assert post(("chr1", 5, 5)) == 400
+    assert post() == 422
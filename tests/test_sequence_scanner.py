@@ -0,0 +1,36 @@
+import os
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from analysis import parallel_utils, sequence_scanner
+from analysis.accumulators import PerChromosomeCompositionAccumulator
+from app.db.base_class import Base
+from app.models.chromosome import Chromosome
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'scan.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    for name, sequence in [("chr1", "ACGTNNacgt" * 20), ("chr2", "GGCCAT" * 30)]:
+        chromosome = Chromosome(name=name)
+        chromosome.set_sequence(sequence)
+        session.add(chromosome)
+    session.commit()
+    yield session
+    session.close()
+
+def test_parallel_scan_matches_serial_scan(db):
+    stats = sequence_scanner.run_scan(db, [PerChromosomeCompositionAccumulator], processes=1)
+    assert sequence_scanner.run_scan(db, [PerChromosomeCompositionAccumulator], processes=2) == stats
+    assert stats["per_chromosome_composition"]["chr2"] == {"A": 30, "C": 60, "G": 60, "T": 30}
+
+def _killed_worker(task):
+    os._exit(1)
+
+def test_scan_fails_when_a_worker_dies(db, monkeypatch):
+    monkeypatch.setattr(parallel_utils, "scan_worker", _killed_worker)
+    with pytest.raises(RuntimeError, match="exited unexpectedly"):
+        sequence_scanner.run_scan(db, [PerChromosomeCompositionAccumulator], processes=2)
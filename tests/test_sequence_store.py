@@ -0,0 +1,48 @@
+import pickle
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base_class import Base
+from app.models.chromosome import Chromosome
+from app.services import sequence_store
+
+SEQUENCE = ("NNNNNNNNacgtacgtACGTTTGACnnnnGGCCAATT" * 40) + "ACGTNNNNacgt"
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'store.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    chromosome = Chromosome(name="chrT")
+    chromosome.set_sequence(SEQUENCE)
+    session.add(chromosome)
+    session.commit()
+    yield session
+    session.close()
+
+def test_fetch_matches_slices(db):
+    store = sequence_store.get_sequence_store(db)
+    for start, end in [(0, 10), (3, 41), (7, 8), (100, 777), (0, len(SEQUENCE)), (1480, 5000)]:
+        assert store.fetch("chrT", start, end) == SEQUENCE[start:end]
+        assert store.fetch("chrT", start, end, soft_mask=False) == SEQUENCE[start:end].upper()
+
+def test_fetch_unknown_chromosome(db):
+    assert sequence_store.get_sequence_store(db).fetch("chrUn", 0, 10) is None
+
+def test_block_search_across_read_batches(db, monkeypatch):
+    monkeypatch.setattr(sequence_store, "BLOCK_READ_BATCH", 3)
+    with sequence_store.get_sequence_store(db).open("chrT") as handle:
+        assert handle.read(50, 900) == SEQUENCE[50:900]
+        assert "".join(handle.iter_chunks(5, 1000, chunk_size=97)) == SEQUENCE[5:1000]
+
+def test_shared_memory_handle_survives_pickling(db, monkeypatch):
+    monkeypatch.setattr(sequence_store, "SHARED_COPY_CHUNK_SIZE", 7)
+    with sequence_store.get_sequence_store(db).open("chrT") as handle:
+        shared = sequence_store.SharedChromosomeSequence.create(handle)
+    with shared:
+        with pickle.loads(pickle.dumps(shared)) as attached:
+            assert attached.length == len(SEQUENCE)
+            assert attached.read() == SEQUENCE
+            assert attached.read(3, 41, soft_mask=False) == SEQUENCE[3:41].upper()
@@ -0,0 +1,54 @@
+import time
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.config import get_settings
+from app.db.session import make_engine
+
+@pytest.fixture
+def url(tmp_path):
+    url = f"sqlite:///{tmp_path / 'profiles.db'}"
+    with make_engine(url, "default").begin() as connection:
+        connection.exec_driver_sql("CREATE TABLE features (id INTEGER PRIMARY KEY, name TEXT)")
+        connection.exec_driver_sql("INSERT INTO features (name) VALUES ('a'), ('b')")
+    return url
+
+def _pragma(connection, name):
+    return connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+def test_profiles_are_applied_on_connect(url):
+    settings = get_settings()
+    with make_engine(url, "bulk_load").connect() as connection:
+        assert _pragma(connection, "journal_mode") == "wal"
+        assert _pragma(connection, "synchronous") == 0
+        assert _pragma(connection, "temp_store") == 2
+        assert _pragma(connection, "cache_size") == -settings.SQLITE_CACHE_SIZE_KB
+        assert _pragma(connection, "busy_timeout") == settings.SQLITE_BUSY_TIMEOUT_MS
+    with make_engine(url, "default").connect() as connection:
+        assert _pragma(connection, "synchronous") == 1
+
+def test_read_only_engine_rejects_writes(url):
+    with make_engine(url, "read_only", read_only=True).connect() as connection:
+        assert _pragma(connection, "query_only") == 1
+        assert connection.exec_driver_sql("SELECT COUNT(*) FROM features").scalar() == 2
+        with pytest.raises(OperationalError):
+            connection.exec_driver_sql("INSERT INTO features (name) VALUES ('c')")
+
+def test_readers_are_not_blocked_by_an_open_write_transaction(url):
+    writer = make_engine(url, "bulk_load").connect()
+    reader = make_engine(url, "read_only", read_only=True)
+    try:
+        transaction = writer.begin()
+        writer.exec_driver_sql("INSERT INTO features (name) VALUES ('c')")
+        writer.exec_driver_sql("DELETE FROM features WHERE name = 'a'")
+        started = time.monotonic()
+        with reader.connect() as connection:
+            # The last committed state, without waiting for the writer's lock
+            assert connection.exec_driver_sql("SELECT name FROM features ORDER BY id").scalars().all() == ["a", "b"]
+        assert time.monotonic() - started < 1
+        transaction.commit()
+        with reader.connect() as connection:
+            assert connection.exec_driver_sql("SELECT name FROM features ORDER BY id").scalars().all() == ["b", "c"]
+    finally:
+        writer.close()
@@ -0,0 +1,25 @@
+from app.utils import twobit
+
+SEQUENCE = "NNNNacgtACGTacNNgtACGTTTGCAnnnnCGCGcgcgATAT"
+
+def test_pack_roundtrip_preserves_n_and_soft_mask():
+    packed = twobit.pack_sequence(SEQUENCE)
+    assert packed.length == len(SEQUENCE)
+    assert len(packed.data) == (len(SEQUENCE) + 3) // 4
+    assert twobit.unpack_sequence(packed) == SEQUENCE
+    assert twobit.unpack_sequence(packed, soft_mask=False) == SEQUENCE.upper()
+
+def test_unpack_region_at_unaligned_offsets():
+    packed = twobit.pack_sequence(SEQUENCE)
+    for start in range(0, 9):
+        for end in range(start, len(SEQUENCE) + 1, 5):
+            assert twobit.unpack_sequence(packed, start, end) == SEQUENCE[start:end]
+
+def test_blocks_merge_across_pack_chunks(monkeypatch):
+    monkeypatch.setattr(twobit, "PACK_CHUNK_SIZE", 8)
+    sequence = "ACGTAAnnnnnnAANNNNNNNNNNAAAA"
+    packed = twobit.pack_sequence(sequence)
+    assert twobit.unpack_sequence(packed) == sequence
+    # Runs crossing the 8-base chunk boundaries are stored as single blocks
+    assert twobit.blocks_from_bytes(packed.mask_blocks).tolist() == [[6, 12]]
+    assert twobit.blocks_from_bytes(packed.n_blocks).tolist() == [[6, 12], [14, 24]]
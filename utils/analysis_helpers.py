@@ -1,8 +1,12 @@
 import json
 from sqlalchemy.orm import Session
 from app.db.session import get_session_local
-from app.models.statistic import GenomeStatistic
+from app.models.statistic import GenomeStatistic, GenomeStatisticResult
+from app.models.chromosome import Chromosome
+from app.services.sequence_store import get_sequence_store
 from collections import Counter
+from itertools import islice
+from typing import Iterable
 import contextlib
 
 @contextlib.contextmanager
@@ -22,6 +26,20 @@ def get_db_session():
     finally:
         db.close()
 
+def get_chromosome_sequence(db: Session, chrom_id: int, soft_mask: bool = False):
+    """
+    Loads a chromosome sequence by id through the configured sequence store
+    (see app/services/sequence_store.py). Returned uppercase unless soft_mask is True.
+    """
+    name = db.query(Chromosome.name).filter(Chromosome.id == chrom_id).scalar()
+    if name is None:
+        return None
+    handle = get_sequence_store(db).open(name)
+    if handle is None:
+        return None
+    with handle:
+        return handle.read(soft_mask=soft_mask)
+
 def _json_serializable(obj):
     if isinstance(obj, Counter):
         return {str(k): v for k, v in obj.items()}
@@ -38,3 +56,36 @@ def upsert_statistic(db: Session, name: str, value: dict):
         new_stat = GenomeStatistic(stat_name=name, stat_value=json.loads(stat_value_json))
         db.add(new_stat)
         print(f"Creating new statistic: {name}")
+
+# Result rows are inserted in chunks of this size, so a generator of rows is
+# never materialized as a whole
+RESULT_CHUNK_SIZE = 10000
+
+RESULT_INSERT = (
+    "INSERT INTO genome_stat_results (stat_name, chromosome_id, start_pos, end_pos, feature_type, name, value) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+def write_statistic_results(db: Session, name: str, rows: Iterable[dict]) -> int:
+    """
+    Replaces the result rows of statistic `name` with `rows`: dicts with any of
+    chromosome_id, start_pos, end_pos, feature_type, name and value (a JSON-able
+    dict of further fields). Returns the number of rows written.
+    """
+    db.query(GenomeStatisticResult).filter(GenomeStatisticResult.stat_name == name).delete()
+    connection = db.connection()
+    rows = iter(rows)
+    written = 0
+    while True:
+        chunk = [
+            (name, row.get("chromosome_id"), row.get("start_pos"), row.get("end_pos"),
+             row.get("feature_type"), row.get("name"),
+             json.dumps(row["value"], default=_json_serializable) if row.get("value") is not None else None)
+            for row in islice(rows, RESULT_CHUNK_SIZE)
+        ]
+        if not chunk:
+            break
+        connection.exec_driver_sql(RESULT_INSERT, chunk)
+        written += len(chunk)
+    print(f"Stored {written} result rows for statistic: {name}")
+    return written
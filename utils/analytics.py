@@ -0,0 +1,115 @@
+"""
+    Aggregation engine for the statistics that are GROUP BYs over whole
+    feature tables.
+
+    Analyses pass plain SQL (COUNT/SUM/AVG, GROUP BY, joins) written against
+    the columns the feature tables and their snapshots share, and get the
+    result back as {column: NumPy array}. Two engines run it:
+
+    - "duckdb": an in-process DuckDB database with a view per table over the
+      Parquet snapshot (utils/feature_snapshots.py) and the chromosomes table
+      copied from SQLite, so aggregations run vectorized on every core.
+    - "sqlite": the same SQL on the session's own connection.
+
+    Settings.ANALYTICS_ENGINE selects the engine; DuckDB is used only when the
+    duckdb package is installed and a snapshot of the session's database
+    exists, and SQLite is used otherwise. Both produce identical results.
+    """
+import glob
+import os
+from abc import ABC, abstractmethod
+from typing import Dict
+
+import numpy as np
+import pyarrow as pa
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from utils.feature_snapshots import SNAPSHOT_TABLES, column_to_numpy, snapshot_directory
+
+try:
+    import duckdb
+except ImportError:  # DuckDB is optional
+    duckdb = None
+
+_DUCKDB_TYPES = {pa.int64(): "BIGINT", pa.string(): "VARCHAR"}
+
+
+class AnalyticsEngine(ABC):
+    """Runs aggregation queries; subclasses implement _execute()."""
+    name: str
+
+    @abstractmethod
+    def _execute(self, sql: str) -> pa.Table:
+        """Runs `sql` and returns its result as an Arrow table."""
+
+    def query(self, sql: str) -> Dict[str, np.ndarray]:
+        """Runs `sql` and returns its result columns as arrays (see feature_snapshots.column_to_numpy)."""
+        table = self._execute(sql)
+        return {name: column_to_numpy(table.column(name)) for name in table.column_names}
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class SQLiteAnalyticsEngine(AnalyticsEngine):
+    """Runs queries on the session's SQLite connection."""
+    name = "sqlite"
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _execute(self, sql: str) -> pa.Table:
+        result = self.db.connection().exec_driver_sql(sql)
+        names = list(result.keys())
+        rows = result.fetchall()
+        return pa.table({name: pa.array([row[i] for row in rows]) for i, name in enumerate(names)})
+
+
+class DuckDBAnalyticsEngine(AnalyticsEngine):
+    """Runs queries in DuckDB over the Parquet snapshot of the session's database."""
+    name = "duckdb"
+
+    def __init__(self, db: Session, directory: str):
+        self.connection = duckdb.connect()
+        chromosomes = db.connection().exec_driver_sql("SELECT id, name, length FROM chromosomes").fetchall()
+        self._chromosomes = pa.table({
+            "id": pa.array([row[0] for row in chromosomes], type=pa.int64()),
+            "name": pa.array([row[1] for row in chromosomes], type=pa.string()),
+            "length": pa.array([row[2] for row in chromosomes], type=pa.int64()),
+        })
+        self.connection.register("chromosomes", self._chromosomes)
+        for table, (_, _, types) in SNAPSHOT_TABLES.items():
+            files = os.path.join(directory, table, "*", "*.parquet")
+            if glob.glob(files):
+                self.connection.execute(
+                    f"CREATE VIEW {table} AS SELECT * FROM read_parquet('{files}', hive_partitioning = true)"
+                )
+            else:
+                # A table without rows has no partitions to read
+                columns = ", ".join(f"{name} {_DUCKDB_TYPES[t]}" for name, t in [("chromosome_id", pa.int64())] + list(types.items()))
+                self.connection.execute(f"CREATE TABLE {table} ({columns})")
+
+    def _execute(self, sql: str) -> pa.Table:
+        return self.connection.execute(sql).to_arrow_table()
+
+    def close(self):
+        self.connection.close()
+
+
+def get_analytics_engine(db: Session) -> AnalyticsEngine:
+    """
+    Returns the engine selected by Settings.ANALYTICS_ENGINE, falling back to
+    SQLite when DuckDB or a snapshot of the database is not available.
+    """
+    if get_settings().ANALYTICS_ENGINE == "duckdb" and duckdb is not None:
+        directory = snapshot_directory(db)
+        if directory is not None:
+            return DuckDBAnalyticsEngine(db, directory)
+    return SQLiteAnalyticsEngine(db)
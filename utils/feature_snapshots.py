@@ -0,0 +1,190 @@
+"""
+    Columnar snapshots of the feature tables for the analyses.
+
+    export_snapshots() writes genes, transcripts, exons, UTRs, CpG islands and
+    ncRNAs as Parquet files, one per table and chromosome
+    (<dir>/<table>/chromosome=<name>/part-0.parquet), streaming rows from
+    SQLite in batches so memory stays bounded. A manifest records which
+    database the snapshot was taken from and the load generation of each
+    table (table_loads, bumped by the loaders); the directory is swapped in
+    only once every table has been written.
+
+    load_features() hands analyses the requested columns as NumPy arrays:
+    integers as int64 with NULL read as MISSING, strings as object arrays.
+    It reads the snapshot when one exists for the session's database and its
+    tables are still at the recorded load generation (a table reloaded since
+    the export makes the snapshot stale), and otherwise runs the equivalent query, so
+    analyses also work on a database that was never exported (e.g. in tests).
+    """
+import json
+import os
+import shutil
+from itertools import groupby
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.table_load import TableLoad
+
+# Rows fetched from SQLite per batch
+SNAPSHOT_BATCH_SIZE = 100000
+
+# Value of NULL integers in loaded columns
+MISSING = -1
+
+MANIFEST = "manifest.json"
+
+_INT = pa.int64()
+_STR = pa.string()
+
+# Per table: the FROM clause (the table itself aliased f), the expression of
+# its chromosome id and the types of the columns taken from f
+SNAPSHOT_TABLES = {
+    "genes": ("genes f", "f.chromosome_id", {
+        "id": _INT, "gene_id": _STR, "gene_name": _STR, "start_pos": _INT, "end_pos": _INT, "strand": _STR,
+    }),
+    "transcripts": ("transcripts f JOIN genes g ON f.gene_id = g.id", "g.chromosome_id", {
+        "id": _INT, "gene_id": _INT, "start_pos": _INT, "end_pos": _INT, "strand": _STR, "spliced_length": _INT,
+    }),
+    "exons": ("exons f JOIN genes g ON f.gene_id = g.id", "g.chromosome_id", {
+        "id": _INT, "gene_id": _INT, "transcript_id": _INT, "start_pos": _INT, "end_pos": _INT, "exon_number": _INT,
+    }),
+    "utrs": ("utrs f JOIN genes g ON f.gene_id = g.id", "g.chromosome_id", {
+        "id": _INT, "gene_id": _INT, "transcript_id": _INT, "start_pos": _INT, "end_pos": _INT, "utr_type": _STR,
+    }),
+    "cpg_islands": ("cpg_islands f", "f.chromosome_id", {
+        "id": _INT, "start_pos": _INT, "end_pos": _INT, "length": _INT, "cpg_num": _INT, "gc_num": _INT,
+    }),
+    "non_coding_rnas": ("non_coding_rnas f", "f.chromosome_id", {
+        "id": _INT, "start_pos": _INT, "end_pos": _INT, "strand": _STR,
+        "rna_type": _STR, "rna_class": _STR, "rna_name": _STR,
+    }),
+}
+
+def _schema(table: str) -> pa.Schema:
+    _, _, types = SNAPSHOT_TABLES[table]
+    return pa.schema([("chromosome_id", _INT)] + list(types.items()))
+
+def _database_path(db: Session) -> str:
+    return os.path.realpath(db.get_bind().url.database)
+
+def _load_generations(db: Session, tables: Iterable[str]) -> Dict[str, int]:
+    """{table: load generation}, 0 for a table no loader has recorded."""
+    generations = dict(db.connection().exec_driver_sql(
+        f"SELECT table_name, generation FROM {TableLoad.__tablename__}").fetchall())
+    return {table: generations.get(table, 0) for table in tables}
+
+def _iter_rows(db: Session, table: str, chromosome_ids: Optional[Sequence[int]] = None) -> Iterator[tuple]:
+    """Streams the rows of a snapshot table (chromosome_id first), ordered by chromosome and id."""
+    source, chromosome_column, types = SNAPSHOT_TABLES[table]
+    query = f"SELECT {chromosome_column}, {', '.join('f.' + column for column in types)} FROM {source}"
+    parameters = ()
+    if chromosome_ids is not None:
+        query += f" WHERE {chromosome_column} IN ({', '.join('?' * len(chromosome_ids))})"
+        parameters = tuple(chromosome_ids)
+    query += f" ORDER BY {chromosome_column}, f.id"
+    cursor = db.connection().exec_driver_sql(query, parameters)
+    while True:
+        rows = cursor.fetchmany(SNAPSHOT_BATCH_SIZE)
+        if not rows:
+            break
+        yield from rows
+
+def export_snapshots(db: Session, directory: Optional[str] = None, tables: Iterable[str] = SNAPSHOT_TABLES) -> Dict[str, int]:
+    """
+    Writes the snapshot of every table to `directory` (Settings.FEATURE_SNAPSHOT_DIR
+    by default), replacing any previous one. Returns {table: rows written}.
+    """
+    directory = directory or get_settings().FEATURE_SNAPSHOT_DIR
+    chromosome_names = dict(db.connection().exec_driver_sql("SELECT id, name FROM chromosomes").fetchall())
+    staging = f"{directory}.tmp-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+
+    counts = {}
+    for table in tables:
+        schema = _schema(table)
+        counts[table] = 0
+        os.makedirs(os.path.join(staging, table))
+        for chromosome_id, rows in groupby(_iter_rows(db, table), key=lambda row: row[0]):
+            path = os.path.join(staging, table, f"chromosome={chromosome_names[chromosome_id]}")
+            os.makedirs(path)
+            with pq.ParquetWriter(os.path.join(path, "part-0.parquet"), schema) as writer:
+                while True:
+                    batch = [row for _, row in zip(range(SNAPSHOT_BATCH_SIZE), rows)]
+                    if not batch:
+                        break
+                    columns = list(zip(*batch))
+                    writer.write_batch(pa.record_batch(
+                        [pa.array(column, type=field.type) for column, field in zip(columns, schema)], schema=schema
+                    ))
+                    counts[table] += len(batch)
+        print(f"  Snapshot of {table}: {counts[table]} rows")
+
+    with open(os.path.join(staging, MANIFEST), "w") as f:
+        json.dump({
+            "database": _database_path(db),
+            "tables": counts,
+            "generations": _load_generations(db, counts),
+        }, f)
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(staging, directory)
+    return counts
+
+def snapshot_directory(db: Session, directory: Optional[str] = None,
+                       tables: Iterable[str] = SNAPSHOT_TABLES) -> Optional[str]:
+    """
+    The snapshot directory if it holds an up-to-date snapshot of `tables` of
+    the session's database, else None.
+    """
+    directory = directory or get_settings().FEATURE_SNAPSHOT_DIR
+    try:
+        with open(os.path.join(directory, MANIFEST)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("database") != _database_path(db):
+        return None
+    tables = list(tables)
+    if {table: manifest.get("generations", {}).get(table) for table in tables} != _load_generations(db, tables):
+        return None
+    return directory
+
+def column_to_numpy(column: pa.ChunkedArray) -> np.ndarray:
+    """Integers as int64 with NULL as MISSING, floats with NULL as NaN, anything else as an object array."""
+    if pa.types.is_integer(column.type):
+        return column.fill_null(MISSING).to_numpy().astype(np.int64, copy=False)
+    if pa.types.is_floating(column.type):
+        return column.cast(pa.float64()).fill_null(np.nan).to_numpy()
+    return np.array(column.to_pylist(), dtype=object)
+
+def load_features(db: Session, table: str, columns: List[str], chromosome_names: Optional[Sequence[str]] = None,
+                  directory: Optional[str] = None) -> Dict[str, np.ndarray]:
+    """
+    Returns {column: array} for the given columns of a snapshot table (any of
+    its query columns, including chromosome_id), optionally restricted to
+    some chromosomes.
+    """
+    directory = snapshot_directory(db, directory, (table,))
+    schema = _schema(table)
+    if directory is not None:
+        path = os.path.join(directory, table)
+        filters = [("chromosome", "in", list(chromosome_names))] if chromosome_names is not None else None
+        data = pq.read_table(path, columns=list(columns), filters=filters, partitioning="hive", schema=schema.append(
+            pa.field("chromosome", _STR)))
+        return {column: column_to_numpy(data.column(column)) for column in columns}
+
+    chromosome_ids = None
+    if chromosome_names is not None:
+        names = list(chromosome_names)
+        chromosome_ids = [row[0] for row in db.connection().exec_driver_sql(
+            f"SELECT id FROM chromosomes WHERE name IN ({', '.join('?' * len(names))})", tuple(names)).fetchall()]
+    positions = [schema.names.index(column) for column in columns]
+    rows = list(_iter_rows(db, table, chromosome_ids))
+    return {
+        column: column_to_numpy(pa.chunked_array([pa.array([row[i] for row in rows], type=schema.field(i).type)]))
+        for column, i in zip(columns, positions)
+    }